@@ -1,3 +1,5 @@
+from . import cli
+from . import controllers
 from . import wizard
 from . import models
 from . import report
@@ -16,12 +16,16 @@
     'live_test_url': 'https://www.youtube.com/watch?v=yA4NLwOLZms',
     'data': [
         'security/ir.model.access.csv',
+        'security/security.xml',
         'data/account_account_type.xml',
         'data/paperformat.xml',
+        'data/ir_cron.xml',
         'views/menu.xml',
         'views/ledger_menu.xml',
         'views/financial_report.xml',
         'views/settings.xml',
+        'views/general_ledger_templates.xml',
+        'views/account_report_job_views.xml',
         'wizard/account_report_common_view.xml',
         'wizard/partner_ledger.xml',
         'wizard/general_ledger.xml',
@@ -41,6 +45,11 @@
         'report/report_journal_audit.xml',
         'report/report_journal_entries.xml',
     ],
+    'assets': {
+        'web.assets_backend': [
+            'accounting_pdf_reports/static/src/js/report_job_service.js',
+        ],
+    },
     'pre_init_hook': '_pre_init_clean_m2m_models',
     'images': ['static/description/banner.gif'],
 }
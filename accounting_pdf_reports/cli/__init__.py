@@ -0,0 +1 @@
+from . import daily_balance
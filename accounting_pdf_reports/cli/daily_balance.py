@@ -0,0 +1,43 @@
+import argparse
+import sys
+from pathlib import Path
+
+import odoo
+from odoo.cli import Command
+from odoo.tools import config
+
+
+class DailyBalance(Command):
+    """Rebuild the daily balances of the posted journal items"""
+    name = 'daily_balance'
+
+    def run(self, cmdargs):
+        parser = argparse.ArgumentParser(
+            prog=f'{Path(sys.argv[0]).name} {self.name}',
+            description=self.__doc__,
+        )
+        parser.add_argument('-c', '--config', help='Odoo configuration file')
+        parser.add_argument('-d', '--database', help='Database to rebuild')
+        parser.add_argument('--enable', action='store_true',
+                            help='Also enable the daily balances for the reports')
+        args = parser.parse_args(cmdargs)
+
+        odoo_args = []
+        if args.config:
+            odoo_args += ['-c', args.config]
+        if args.database:
+            odoo_args += ['-d', args.database]
+        config.parse_config(odoo_args)
+        dbname = config['db_name']
+        if not dbname:
+            parser.error('a database is required, use -d or set db_name in the configuration file')
+
+        registry = odoo.modules.registry.Registry(dbname)
+        with registry.cursor() as cr:
+            env = odoo.api.Environment(cr, odoo.SUPERUSER_ID, {})
+            Daily = env['account.move.line.daily']
+            if args.enable:
+                env['ir.config_parameter'].set_param(Daily.PARAM, True)
+            Daily._rebuild()
+            cr.execute("SELECT COUNT(*) FROM account_move_line_daily")
+            print(f'{cr.fetchone()[0]} daily balances rebuilt')
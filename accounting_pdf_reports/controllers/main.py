@@ -0,0 +1,56 @@
+import json
+import math
+from urllib.parse import urlencode
+
+from odoo import http, _
+from odoo.exceptions import AccessError
+from odoo.http import request
+
+
+class GeneralLedgerController(http.Controller):
+
+    def _get_ledger_form(self, options):
+        """The options of the ledger are carried by its URL rather than by the
+        wizard, which is removed by the transient model vacuum"""
+        if isinstance(options, str):
+            try:
+                options = json.loads(options)
+            except ValueError:
+                raise request.not_found()
+        if not isinstance(options, dict):
+            raise request.not_found()
+        if not request.env.user.has_group('account.group_account_readonly'):
+            raise AccessError(_("You are not allowed to browse the general ledger."))
+        return request.env['account.report.general.ledger']._get_ledger_form(options)
+
+    @http.route('/accounting_pdf_reports/general_ledger', type='http', auth='user')
+    def general_ledger(self, options='{}', account_id=None, page=1, **kw):
+        """Paginated General Ledger: the account totals come from SQL and only
+        one page of move lines of the selected account is loaded"""
+        form = self._get_ledger_form(options)
+        report = request.env['report.accounting_pdf_reports.report_general_ledger']
+        company = request.env['res.company'].browse(form['used_context']['company_id'])
+        values = {
+            'ledger_url': '/accounting_pdf_reports/general_ledger?' + urlencode({'options': options}),
+            'form': form,
+            'accounts': report._get_ledger_accounts(form),
+            'company': company,
+            'currency': company.currency_id,
+            'ledger_page': False,
+        }
+        if account_id:
+            page = max(int(page), 1)
+            ledger_page = report._get_ledger_page(form, int(account_id), offset=(page - 1) * report.PAGE_SIZE)
+            values.update({
+                'ledger_page': ledger_page,
+                'page': page,
+                'page_count': max(math.ceil(ledger_page['total'] / ledger_page['limit']), 1),
+            })
+        return request.render('accounting_pdf_reports.general_ledger_browse', values)
+
+    @http.route('/accounting_pdf_reports/general_ledger/lines', type='json', auth='user')
+    def general_ledger_lines(self, options, account_id, offset=0, limit=None):
+        """JSON page of move lines, see _get_ledger_page"""
+        form = self._get_ledger_form(options)
+        report = request.env['report.accounting_pdf_reports.report_general_ledger']
+        return report._get_ledger_page(form, account_id, offset=offset, limit=limit)
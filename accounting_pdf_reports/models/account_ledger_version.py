@@ -0,0 +1,75 @@
+from psycopg2.extras import execute_values
+
+from odoo import api, fields, models
+
+
+class AccountLedgerVersion(models.Model):
+    _name = "account.ledger.version"
+    _description = "Ledger Version"
+    _order = "company_id, month"
+    _log_access = False
+
+    company_id = fields.Many2one('res.company', string='Company', required=True, ondelete='cascade')
+    month = fields.Date(string='Month', required=True, help="First day of the month")
+    version = fields.Integer(string='Version', required=True, default=0)
+
+    # The version of a month is the sum of its rows. Every change inserts new
+    # rows instead of updating a single row per month, so concurrent postings
+    # never wait on each other nor fail on a serialization error; the rows are
+    # merged back by the autovacuum.
+
+    def init(self):
+        self.env.cr.execute("""
+            CREATE INDEX IF NOT EXISTS account_ledger_version_company_month_idx
+            ON account_ledger_version (company_id, month)
+        """)
+
+    @api.model
+    def _bump(self, company_dates):
+        """ Increment the version of the months of the given (company_id,
+        date) pairs, with an insert-only statement that takes no row lock
+        """
+        keys = {
+            (company_id, date.replace(day=1))
+            for company_id, date in company_dates
+            if company_id and date
+        }
+        if not keys:
+            return
+        execute_values(self.env.cr._obj, """
+            INSERT INTO account_ledger_version (company_id, month, version)
+            VALUES %s
+        """, [(company_id, month, 1) for company_id, month in keys])
+        self.invalidate_model()
+
+    @api.model
+    def _get_version(self, company_ids, date_to=None):
+        """ Return the version of the ledger of the companies until date_to:
+        it increases whenever an entry of one of these companies dated before
+        date_to is posted or unposted
+        """
+        query = "SELECT COALESCE(SUM(version), 0) FROM account_ledger_version WHERE company_id IN %s"
+        params = [tuple(company_ids)]
+        if date_to:
+            query += " AND month <= %s"
+            params.append(date_to)
+        self.env.cr.execute(query, params)
+        return self.env.cr.fetchone()[0]
+
+    @api.autovacuum
+    def _gc_versions(self):
+        """ Merge the rows of every month into one, keeping their sum. The rows
+        inserted by transactions that are not committed yet are not visible to
+        the delete, so they are kept and still count once committed.
+        """
+        self.env.cr.execute("""
+            WITH merged AS (
+                DELETE FROM account_ledger_version
+                RETURNING company_id, month, version
+            )
+            INSERT INTO account_ledger_version (company_id, month, version)
+            SELECT company_id, month, SUM(version)
+            FROM merged
+            GROUP BY company_id, month
+        """)
+        self.invalidate_model()
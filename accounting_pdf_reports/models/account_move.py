@@ -0,0 +1,34 @@
+from odoo import models
+
+
+class AccountMove(models.Model):
+    _inherit = "account.move"
+
+    def _get_daily_keys(self):
+        return self.filtered(lambda move: move.state == 'posted').line_ids._get_daily_keys()
+
+    def _get_ledger_dates(self):
+        return {(move.company_id.id, move.date) for move in self}
+
+    def write(self, vals):
+        if 'state' not in vals:
+            return super().write(vals)
+        # posting, resetting to draft and cancelling move the daily balances
+        # and the version of the ledger
+        keys = self._get_daily_keys()
+        ledger_dates = self.filtered(
+            lambda move: move.state != vals['state'] and 'posted' in (move.state, vals['state'])
+        )._get_ledger_dates()
+        res = super().write(vals)
+        self.env['account.move.line.daily'].sudo()._refresh(keys | self._get_daily_keys())
+        self.env['account.ledger.version'].sudo()._bump(ledger_dates)
+        return res
+
+    def unlink(self):
+        keys = self._get_daily_keys()
+        ledger_dates = self.filtered(lambda move: move.state == 'posted')._get_ledger_dates()
+        res = super().unlink()
+        self.env['account.move.line.daily'].sudo()._refresh(keys)
+        self.env['account.ledger.version'].sudo()._bump(ledger_dates)
+        return res
+
@@ -5,6 +5,12 @@ from odoo import api, models, fields
 class AccountMoveLine(models.Model):
     _inherit = "account.move.line"
 
+    # fields of the items that move their daily balances once posted
+    DAILY_FIELDS = {
+        'account_id', 'partner_id', 'journal_id', 'company_id', 'date',
+        'debit', 'credit', 'balance', 'display_type',
+    }
+
     @api.model
     def _query_get(self, domain=None):
         self.check_access('read')
@@ -75,3 +81,52 @@ class AccountMoveLine(models.Model):
             where_string, where_params = query.where_clause
             tables, where_clause, where_clause_params = from_string, where_string, from_params + where_params
         return tables, where_clause, where_clause_params
+
+    @api.model
+    def _query_get_balance(self, domain=None):
+        """ Same as _query_get(), for the queries that only aggregate the
+        debit, credit and balance of the items by account. When the daily
+        balances are enabled and the filters of the context allow it, the
+        daily rows are returned instead of the journal items.
+        """
+        Daily = self.env['account.move.line.daily']
+        if domain or not Daily._can_answer(self._context):
+            return self._query_get(domain)
+        self.check_access('read')
+        return Daily._query_get(dict(self._context))
+
+    def _get_daily_keys(self):
+        if not self.env['account.move.line.daily']._is_enabled():
+            return set()
+        return {(line.account_id.id, line.date) for line in self if line.account_id and line.date}
+
+    def _get_posted_daily_keys(self):
+        if not self.env['account.move.line.daily']._is_enabled():
+            return set()
+        return self.filtered(lambda line: line.parent_state == 'posted')._get_daily_keys()
+
+    def _invalidate_report_balances(self):
+        # the balances of the financial reports are kept for the cursor, see
+        # _get_report_balances(), the draft items do not move the ledger version
+        self.env.cr.cache.pop('report_financial_balances', None)
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        lines = super().create(vals_list)
+        lines._invalidate_report_balances()
+        self.env['account.move.line.daily'].sudo()._refresh(lines._get_posted_daily_keys())
+        return lines
+
+    def write(self, vals):
+        if not self.DAILY_FIELDS & set(vals):
+            return super().write(vals)
+        self._invalidate_report_balances()
+        # reclassifying posted items moves the balances of both days
+        keys = self._get_posted_daily_keys()
+        res = super().write(vals)
+        self.env['account.move.line.daily'].sudo()._refresh(keys | self._get_posted_daily_keys())
+        return res
+
+    def unlink(self):
+        self._invalidate_report_balances()
+        return super().unlink()
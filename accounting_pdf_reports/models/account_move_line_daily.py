@@ -0,0 +1,182 @@
+from odoo import api, fields, models
+from odoo.osv import expression
+from odoo.tools import Query, SQL
+
+
+class AccountMoveLineDaily(models.Model):
+    _name = "account.move.line.daily"
+    _description = "Daily Journal Items Balance"
+    _order = "date desc, account_id"
+    _log_access = False
+
+    company_id = fields.Many2one('res.company', string='Company', required=True, readonly=True, index=True)
+    company_currency_id = fields.Many2one(related='company_id.currency_id', string='Company Currency')
+    account_id = fields.Many2one('account.account', string='Account', required=True, readonly=True,
+                                 index=True, ondelete='cascade')
+    journal_id = fields.Many2one('account.journal', string='Journal', required=True, readonly=True,
+                                 ondelete='cascade')
+    partner_id = fields.Many2one('res.partner', string='Partner', readonly=True, ondelete='cascade')
+    date = fields.Date(string='Date', required=True, readonly=True, index=True)
+    debit = fields.Monetary(currency_field='company_currency_id', readonly=True)
+    credit = fields.Monetary(currency_field='company_currency_id', readonly=True)
+    balance = fields.Monetary(currency_field='company_currency_id', readonly=True)
+    line_count = fields.Integer(string='Journal Items', readonly=True)
+
+    PARAM = 'accounting_pdf_reports.use_daily_balance'
+    # context keys of _query_get that cannot be answered from the daily rows
+    UNSUPPORTED_KEYS = (
+        'aged_balance', 'reconcile_date', 'account_tag_ids', 'analytic_tag_ids',
+        'analytic_account_ids', 'partner_categories',
+    )
+    # fields of the journal items the daily rows have too, the record rules of
+    # the items that only use them apply to the daily rows unchanged
+    RULE_FIELDS = ('company_id', 'account_id', 'journal_id', 'partner_id', 'date')
+
+    # only the posted items are kept: their amounts can no longer change, so
+    # the rows only move when an entry is posted, reset to draft or cancelled
+    DAILY_SELECT = """
+        SELECT l.company_id, l.account_id, l.journal_id, l.partner_id, l.date,
+               SUM(l.debit), SUM(l.credit), SUM(l.balance), COUNT(*)
+        FROM account_move_line l
+        WHERE l.parent_state = 'posted'
+          AND l.account_id IS NOT NULL
+          AND (l.display_type IS NULL OR l.display_type NOT IN ('line_section', 'line_note'))
+    """
+    DAILY_GROUP_BY = """
+        GROUP BY l.company_id, l.account_id, l.journal_id, l.partner_id, l.date
+    """
+    DAILY_INSERT = """
+        INSERT INTO account_move_line_daily (company_id, account_id, journal_id, partner_id, date,
+                                             debit, credit, balance, line_count)
+    """
+    DAILY_UPSERT = """
+        ON CONFLICT (account_id, date, journal_id, company_id, COALESCE(partner_id, 0))
+        DO UPDATE SET debit = EXCLUDED.debit,
+                      credit = EXCLUDED.credit,
+                      balance = EXCLUDED.balance,
+                      line_count = EXCLUDED.line_count
+    """
+
+    def init(self):
+        self.env.cr.execute("""
+            CREATE UNIQUE INDEX IF NOT EXISTS account_move_line_daily_key_uniq
+            ON account_move_line_daily (account_id, date, journal_id, company_id, COALESCE(partner_id, 0))
+        """)
+
+    @api.model
+    def _is_enabled(self):
+        return bool(self.env['ir.config_parameter'].sudo().get_param(self.PARAM))
+
+    @api.model
+    def _can_answer(self, context):
+        """ Whether the filters of a _query_get() context can be answered from
+        the daily rows, which only hold posted items
+        """
+        return (
+            self._is_enabled()
+            and context.get('state') == 'posted'
+            and not any(context.get(key) for key in self.UNSUPPORTED_KEYS)
+            and self._get_rule_domain() is not None
+        )
+
+    @api.model
+    def _get_rule_domain(self):
+        """ Return the domain of the read record rules of the journal items
+        for the current user, or None when one of them filters on a field
+        the daily rows do not have
+        """
+        if self.env.su:
+            return []
+        domain = self.env['ir.rule']._compute_domain('account.move.line', 'read') or []
+        for leaf in domain:
+            if expression.is_leaf(leaf) and isinstance(leaf[0], str) \
+                    and leaf[0].split('.')[0] not in self.RULE_FIELDS:
+                return None
+        return domain
+
+    @api.model
+    def _refresh(self, account_days):
+        """ Recompute the daily rows of the given (account_id, date) pairs from
+        the journal items, in two statements whatever the number of pairs. The
+        rows are upserted rather than deleted and inserted again, so that two
+        transactions refreshing the same new row conflict on it instead of
+        failing on the unique index.
+        """
+        account_days = {(account_id, date) for account_id, date in account_days if account_id and date}
+        if not account_days or not self._is_enabled():
+            return
+        self.env['account.move.line'].flush_model([
+            'company_id', 'account_id', 'journal_id', 'partner_id', 'date',
+            'parent_state', 'debit', 'credit', 'balance', 'display_type',
+        ])
+        self.env['account.move'].flush_model(['state'])
+        keys = tuple(account_days)
+        self.env.cr.execute("""
+            DELETE FROM account_move_line_daily daily
+            WHERE (daily.account_id, daily.date) IN %s
+              AND NOT EXISTS (
+                SELECT 1 FROM account_move_line l
+                WHERE l.parent_state = 'posted'
+                  AND l.account_id = daily.account_id
+                  AND l.date = daily.date
+                  AND l.journal_id = daily.journal_id
+                  AND l.company_id = daily.company_id
+                  AND l.partner_id IS NOT DISTINCT FROM daily.partner_id
+                  AND (l.display_type IS NULL OR l.display_type NOT IN ('line_section', 'line_note'))
+              )
+        """, [keys])
+        self.env.cr.execute(
+            self.DAILY_INSERT + self.DAILY_SELECT + " AND (l.account_id, l.date) IN %s "
+            + self.DAILY_GROUP_BY + self.DAILY_UPSERT, [keys])
+        self.invalidate_model()
+
+    @api.model
+    def _rebuild(self):
+        """ Rebuild the whole table from the journal items """
+        self.env['account.move.line'].flush_model()
+        self.env['account.move'].flush_model(['state'])
+        self.env.cr.execute("TRUNCATE account_move_line_daily")
+        self.env.cr.execute(self.DAILY_INSERT + self.DAILY_SELECT + self.DAILY_GROUP_BY)
+        self.invalidate_model()
+
+    @api.model
+    def _query_get(self, context):
+        """ Return the tables, where clause and params of the daily rows
+        matching the filters of a _query_get() context and the record rules
+        of the journal items. The table is aliased as account_move_line so
+        that queries that only aggregate the debit, credit and balance of the
+        lines by account run on it unchanged.
+        """
+        domain = []
+        if context.get('date_to'):
+            domain += [('date', '<=', context['date_to'])]
+        if context.get('date_from'):
+            if not context.get('strict_range'):
+                domain += ['|', ('date', '>=', context['date_from']), ('account_id.include_initial_balance', '=', True)]
+            elif context.get('initial_bal'):
+                domain += [('date', '<', context['date_from'])]
+            else:
+                domain += [('date', '>=', context['date_from'])]
+
+        if context.get('journal_ids'):
+            domain += [('journal_id', 'in', context['journal_ids'])]
+
+        if context.get('company_id'):
+            domain += [('company_id', '=', context['company_id'])]
+        elif context.get('allowed_company_ids'):
+            domain += [('company_id', 'in', self.env.companies.ids)]
+        else:
+            domain += [('company_id', '=', self.env.company.id)]
+
+        if context.get('account_ids'):
+            domain += [('account_id', 'in', context['account_ids'].ids)]
+
+        if context.get('partner_ids'):
+            domain += [('partner_id', 'in', context['partner_ids'].ids)]
+
+        domain = expression.AND([domain, self._get_rule_domain() or []])
+        query = Query(self.env, 'account_move_line', SQL.identifier(self._table))
+        query = expression.expression(domain, self.sudo(), alias='account_move_line', query=query).query
+        from_string, from_params = query.from_clause
+        where_string, where_params = query.where_clause
+        return from_string, where_string, from_params + where_params
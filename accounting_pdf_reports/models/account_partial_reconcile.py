@@ -0,0 +1,20 @@
+from odoo import api, models
+
+
+class AccountPartialReconcile(models.Model):
+    _inherit = "account.partial.reconcile"
+
+    def _get_ledger_dates(self):
+        return {(partial.company_id.id, partial.max_date) for partial in self}
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        partials = super().create(vals_list)
+        self.env['account.ledger.version'].sudo()._bump(partials._get_ledger_dates())
+        return partials
+
+    def unlink(self):
+        ledger_dates = self._get_ledger_dates()
+        res = super().unlink()
+        self.env['account.ledger.version'].sudo()._bump(ledger_dates)
+        return res
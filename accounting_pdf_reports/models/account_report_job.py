@@ -0,0 +1,226 @@
+import base64
+import logging
+from datetime import timedelta
+
+from psycopg2.errors import UniqueViolation
+
+from odoo import api, fields, models, _
+from odoo.exceptions import UserError
+
+_logger = logging.getLogger(__name__)
+
+
+class AccountReportJob(models.Model):
+    _name = "account.report.job"
+    _inherit = ['mail.thread']
+    _description = "Background Accounting Report"
+    _order = "id desc"
+
+    name = fields.Char(string='Report', required=True, readonly=True)
+    user_id = fields.Many2one('res.users', string='Requested By', required=True, readonly=True,
+                              default=lambda self: self.env.user, index=True)
+    company_id = fields.Many2one('res.company', string='Company', required=True, readonly=True,
+                                 default=lambda self: self.env.company, index=True)
+    report_format = fields.Selection([('pdf', 'PDF'), ('xlsx', 'Excel')], string='Format',
+                                     required=True, readonly=True, default='pdf')
+    res_model = fields.Char(string='Wizard Model', required=True, readonly=True)
+    report_name = fields.Char(string='Report Name', readonly=True)
+    res_ids = fields.Json(string='Documents', readonly=True)
+    data = fields.Json(string='Data', readonly=True)
+    report_context = fields.Json(string='Context', readonly=True)
+    state = fields.Selection([
+        ('queued', 'Queued'),
+        ('running', 'Running'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ], string='Status', required=True, readonly=True, default='queued', index=True, tracking=True)
+    progress = fields.Integer(string='Progress', readonly=True)
+    date_started = fields.Datetime(string='Started On', readonly=True)
+    date_done = fields.Datetime(string='Finished On', readonly=True)
+    attachment_id = fields.Many2one('ir.attachment', string='File', readonly=True, ondelete='set null')
+    error = fields.Text(string='Error', readonly=True)
+
+    # running jobs older than this were lost with their worker
+    TIMEOUT = timedelta(hours=2)
+    # progress of a job when it starts, and when the data of its report is
+    # computed and the file is being written; only every PROGRESS_STEP is stored
+    PROGRESS_START = 10
+    PROGRESS_DATA = 70
+    PROGRESS_STEP = 5
+    # an ir.cron never runs twice at the same time, the jobs of different
+    # companies run in parallel on these crons, up to max_cron_threads
+    RUNNER_CRONS = (
+        'accounting_pdf_reports.ir_cron_account_report_job',
+        'accounting_pdf_reports.ir_cron_account_report_job_2',
+        'accounting_pdf_reports.ir_cron_account_report_job_3',
+    )
+
+    def init(self):
+        # at most one running job per company, even when two runners pick a
+        # job of the same company at once
+        self.env.cr.execute("""
+            CREATE UNIQUE INDEX IF NOT EXISTS account_report_job_company_running_uniq
+            ON account_report_job (company_id) WHERE state = 'running'
+        """)
+
+    @api.model
+    def _trigger(self, at=None):
+        for xmlid in self.RUNNER_CRONS:
+            cron = self.env.ref(xmlid, raise_if_not_found=False)
+            if cron:
+                cron._trigger(at)
+
+    def action_download(self):
+        self.ensure_one()
+        if not self.attachment_id:
+            raise UserError(_("The report is not available yet."))
+        return {
+            'type': 'ir.actions.act_url',
+            'url': f'/web/content/{self.attachment_id.id}?download=true',
+            'target': 'new',
+        }
+
+    def _set_progress(self, progress, **values):
+        """ Write the progress of the job and commit it right away, so that
+        it is visible while the report is generated in another cursor
+        """
+        self.write(dict(values, progress=progress))
+        self.env.cr.commit()
+
+    @api.model
+    def _fail_lost_jobs(self):
+        lost = self.search([
+            ('state', '=', 'running'),
+            ('date_started', '<', fields.Datetime.now() - self.TIMEOUT),
+        ])
+        lost.write({'state': 'failed', 'error': _("The report was interrupted.")})
+
+    @api.model
+    def _get_next_job(self):
+        """ Lock and return the next queued job of a company that has no
+        running job, taking the companies in turn so that a large report of one
+        company does not hold back the others
+        """
+        self.flush_model()
+        self.env.cr.execute("""
+            SELECT job.id FROM account_report_job job
+            WHERE job.state = 'queued'
+            AND NOT EXISTS (SELECT 1 FROM account_report_job running
+                            WHERE running.company_id = job.company_id
+                            AND running.state = 'running')
+            ORDER BY (SELECT MAX(started.date_started) FROM account_report_job started
+                      WHERE started.company_id = job.company_id) ASC NULLS FIRST,
+                     job.id
+            LIMIT 1
+            FOR UPDATE SKIP LOCKED
+        """)
+        row = self.env.cr.fetchone()
+        return self.browse(row and row[0])
+
+    @api.model
+    def _cron_run_jobs(self):
+        """ Run the next queued job, then trigger the runners again while jobs
+        remain, so that every job gets a cron call of its own. Each runner cron
+        runs one job at a time and a company has one running job at most, so the
+        jobs of different companies run in parallel on the RUNNER_CRONS. Each
+        job runs within the time limit of the cron workers (limit_time_real_cron,
+        which defaults to limit_time_real): it must be raised for the reports
+        that are too long to be printed directly.
+        """
+        self._fail_lost_jobs()
+        self.env.cr.commit()
+        while True:
+            job = self._get_next_job()
+            if not job:
+                return
+            try:
+                job._set_progress(self.PROGRESS_START, state='running', date_started=fields.Datetime.now())
+                break
+            except UniqueViolation:
+                # another runner started a job of the same company meanwhile,
+                # the next snapshot sees it and skips the company
+                self.env.cr.rollback()
+        job._run()
+        if self.search_count([('state', '=', 'queued')], limit=1):
+            # after the triggers of the current call, which the cron removes
+            self._trigger(fields.Datetime.now() + timedelta(seconds=1))
+
+    @api.model
+    def _report_progress(self, done, total):
+        """ Report the progress of the main loop of a report generated for a
+        job, between PROGRESS_START and PROGRESS_DATA """
+        if total:
+            self._update_progress(
+                self.PROGRESS_START + (self.PROGRESS_DATA - self.PROGRESS_START) * done // total)
+
+    @api.model
+    def _update_progress(self, progress):
+        """ Store the progress of the job the report of the context is
+        generated for, if any. The report runs in a cursor that is only
+        committed at the end, so the progress is written with its own cursor.
+        """
+        job_id = self.env.context.get('report_job_id')
+        if not job_id:
+            return
+        reported = self.env.cr.cache.setdefault('account_report_job_progress', {})
+        if progress < reported.get(job_id, self.PROGRESS_START) + self.PROGRESS_STEP:
+            return
+        reported[job_id] = progress
+        with self.env.registry.cursor() as cr:
+            cr.execute("UPDATE account_report_job SET progress = %s WHERE id = %s AND progress < %s",
+                       [progress, job_id, progress])
+
+    def _run(self):
+        """ Generate the report in its own cursor, as the user who asked for
+        it, then store the file on the job and notify the user
+        """
+        self.ensure_one()
+        try:
+            with self.env.registry.cursor() as cr:
+                env = self.env(cr=cr, user=self.user_id, context=dict(
+                    self.report_context or {}, allowed_company_ids=[self.company_id.id],
+                    report_job_id=self.id))
+                content, extension = self.with_env(env)._generate()
+        except Exception as e:
+            _logger.exception("Background report %s failed", self.id)
+            self.env.cr.rollback()
+            self._set_progress(100, state='failed', error=str(e), date_done=fields.Datetime.now())
+            self._notify(_("The report %s could not be generated.", self.name), 'danger')
+            return
+        # start a new transaction, the progress was written by other cursors
+        self.env.cr.rollback()
+        attachment = self.env['ir.attachment'].create({
+            'name': f'{self.name.replace(" ", "_")}.{extension}',
+            'type': 'binary',
+            'datas': base64.b64encode(content),
+            'res_model': self._name,
+            'res_id': self.id,
+        })
+        self._set_progress(100, state='done', attachment_id=attachment.id, date_done=fields.Datetime.now())
+        self._notify(_("The report %s is ready.", self.name), 'success', attachment)
+
+    def _generate(self):
+        """ Return the content and extension of the file of the job, from
+        the data stored on the job when it was queued
+        """
+        if self.report_format == 'pdf':
+            content, _report_type = self.env['ir.actions.report']._render_qweb_pdf(
+                self.report_name, self.res_ids, data=self.data)
+            return content, 'pdf'
+        return self.env[self.res_model]._get_excel_content(self.data), 'xlsx'
+
+    def _notify(self, message, notification_type, attachment=None):
+        self.message_post(
+            body=message,
+            attachment_ids=attachment and attachment.ids or [],
+            partner_ids=self.user_id.partner_id.ids,
+            subtype_xmlid='mail.mt_note',
+        )
+        # the download button is added by the account_report_job service
+        self.env['bus.bus']._sendone(self.user_id.partner_id, 'account_report_job/done', {
+            'type': notification_type,
+            'title': _("Background Report"),
+            'message': message,
+            'url': attachment and f'/web/content/{attachment.id}?download=true' or False,
+        })
+        self.env.cr.commit()
@@ -0,0 +1,125 @@
+import json
+import logging
+import threading
+from collections import OrderedDict
+
+from odoo import models
+
+_logger = logging.getLogger(__name__)
+
+
+class ReportCache:
+    """ Least recently used PDFs bounded by their total size in bytes """
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.entries = OrderedDict()
+        self.lock = threading.RLock()
+
+    def get(self, key):
+        with self.lock:
+            content = self.entries.get(key)
+            if content is not None:
+                self.entries.move_to_end(key)
+            return content
+
+    def set(self, key, content):
+        with self.lock:
+            previous = self.entries.pop(key, None)
+            if previous is not None:
+                self.size -= len(previous)
+            self.entries[key] = content
+            self.size += len(content)
+            while self.size > self.max_bytes:
+                _key, evicted = self.entries.popitem(last=False)
+                self.size -= len(evicted)
+
+
+# {(dbname, report name, ...): pdf content}, shared by the environments of the
+# process, at most 64 MB of PDFs per worker
+_report_cache = ReportCache(64 * 1024 * 1024)
+
+
+class IrActionsReport(models.Model):
+    _inherit = 'ir.actions.report'
+
+    REPORT_CACHE_PREFIX = 'accounting_pdf_reports.'
+    REPORT_CACHE_MAX_SIZE = 4 * 1024 * 1024
+    # the aged balance is computed as of its start date
+    REPORT_CACHE_DATE_FIELD = {
+        'accounting_pdf_reports.report_agedpartnerbalance': 'date_from',
+    }
+
+    def _get_report_cache_stamp(self):
+        """ Return a stamp of the records the accounting reports read besides
+        the journal items: the financial report lines and their accounts,
+        the accounts and their types, and the currency rates of the aged
+        balance. Any creation, change or deletion gives a new stamp.
+        """
+        self.env['account.financial.report'].flush_model()
+        self.env['account.account'].flush_model()
+        self.env['account.account.type'].flush_model()
+        self.env['res.currency.rate'].flush_model()
+        self.env.cr.execute("""
+            SELECT (SELECT ROW(COUNT(*), MAX(write_date)) FROM account_financial_report),
+                   (SELECT ROW(COUNT(*), MAX(write_date)) FROM account_account),
+                   (SELECT ROW(COUNT(*), MAX(write_date)) FROM account_account_type),
+                   (SELECT ROW(COUNT(*), MAX(write_date)) FROM res_currency_rate)
+        """)
+        return tuple(str(value) for value in self.env.cr.fetchone())
+
+    def _get_report_cache_key(self, report, res_ids, data):
+        """ Return the key of the cached result of an accounting report for
+        the form of its wizard and the records it is printed for, or None when
+        it cannot be cached. The key holds the version of the ledger until the
+        end date of the report, so any entry posted or unposted in that range
+        makes a new key, and the stamp of the report configuration and of
+        the currency rates. The draft entries do not move the version, so only
+        the reports on posted entries are cached.
+        """
+        if not report.report_name.startswith(self.REPORT_CACHE_PREFIX) or not data or not data.get('form'):
+            return None
+        # the wizard itself is a new record on every print
+        form = {
+            field: value for field, value in data['form'].items()
+            if field not in ('id', 'display_name')
+        }
+        used_context = form.get('used_context') or data.get('used_context') or {}
+        if (used_context.get('state') or form.get('target_move')) != 'posted':
+            return None
+        company_id = used_context.get('company_id')
+        company_ids = [company_id] if company_id else self.env.companies.ids
+        date_field = self.REPORT_CACHE_DATE_FIELD.get(report.report_name, 'date_to')
+        version = self.env['account.ledger.version']._get_version(company_ids, form.get(date_field))
+        try:
+            params = json.dumps([
+                form, data.get('used_context'), data.get('model'), data.get('ids'), res_ids,
+            ], sort_keys=True, default=str)
+        except (TypeError, ValueError):
+            return None
+        return (
+            self.env.cr.dbname, report.report_name, self.env.uid, self.env.lang,
+            tuple(self.env.companies.ids), tuple(company_ids), version,
+            self._get_report_cache_stamp(), params,
+        )
+
+    def _render_qweb_pdf(self, report_ref, res_ids=None, data=None):
+        report = self._get_report(report_ref)
+        key = self._get_report_cache_key(report, res_ids, data)
+        if key is None or getattr(threading.current_thread(), 'testing', False):
+            return super()._render_qweb_pdf(report_ref, res_ids=res_ids, data=data)
+        pdf_content = _report_cache.get(key)
+        if pdf_content is not None:
+            _logger.info("The PDF report %s was served from the report cache", report.report_name)
+            return pdf_content, 'pdf'
+        pdf_content, report_type = super()._render_qweb_pdf(report_ref, res_ids=res_ids, data=data)
+        if len(pdf_content) <= self.REPORT_CACHE_MAX_SIZE:
+            _report_cache.set(key, pdf_content)
+        return pdf_content, report_type
+
+    def _run_wkhtmltopdf(self, bodies, *args, **kwargs):
+        # the data of the report is computed, only the conversion remains
+        Job = self.env['account.report.job']
+        Job._update_progress(Job.PROGRESS_DATA)
+        return super()._run_wkhtmltopdf(bodies, *args, **kwargs)
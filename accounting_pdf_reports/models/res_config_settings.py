@@ -0,0 +1,17 @@
+from odoo import fields, models
+
+
+class ResConfigSettings(models.TransientModel):
+    _inherit = 'res.config.settings'
+
+    use_daily_balance = fields.Boolean(
+        string='Daily Balances for Reports',
+        config_parameter='accounting_pdf_reports.use_daily_balance',
+        help="Keep the posted journal items summed by day, account, journal and partner, "
+             "and compute the trial balance and financial reports from these sums.")
+
+    def set_values(self):
+        enabled = self.env['account.move.line.daily']._is_enabled()
+        super().set_values()
+        if self.use_daily_balance and not enabled:
+            self.env['account.move.line.daily'].sudo()._rebuild()
@@ -51,173 +51,131 @@ class ReportAgedPartnerBalance(models.AbstractModel):
 
         if target_move == 'posted':
             move_state = ['posted']
-        arg_list = (tuple(move_state), tuple(account_type))
 
-        reconciliation_clause = '(l.reconciled IS FALSE)'
-        cr.execute('SELECT debit_move_id, credit_move_id FROM account_partial_reconcile where max_date > %s', (date_from,))
-        reconciled_after_date = []
-        for row in cr.fetchall():
-            reconciled_after_date += [row[0], row[1]]
-        if reconciled_after_date:
-            reconciliation_clause = '(l.reconciled IS FALSE OR l.id IN %s)'
-            arg_list += (tuple(reconciled_after_date),)
-        arg_list += (date_from, tuple(company_ids))
+        params = {
+            'move_state': tuple(move_state),
+            'account_type': tuple(account_type),
+            'date_from': date_from,
+            'company_ids': tuple(company_ids),
+            'date': date,
+            'rate_company_id': company.root_id.id,
+            'currency_id': user_currency.id,
+            'decimal_places': user_currency.decimal_places,
+            'start_4': periods['4']['start'],
+            'start_3': periods['3']['start'],
+            'start_2': periods['2']['start'],
+            'start_1': periods['1']['start'],
+        }
+        partner_clause = ''
+        if partner_ids:
+            partner_clause = 'AND (l.partner_id IN %(partner_ids)s OR l.partner_id IS NULL)'
+            params['partner_ids'] = tuple(partner_ids)
+
+        # One statement computes the open amount of every line as of
+        # date_from (its balance plus the partial reconciliations made until
+        # then), converts it to the user currency with the rate of `date`,
+        # buckets it on its due date and sums the buckets per partner.
+        # Period 6 is the not due amount, 4 to 0 are the age periods.
+        self.env['account.move.line'].flush_model()
+        self.env['account.partial.reconcile'].flush_model()
         query = '''
-            SELECT DISTINCT l.partner_id, UPPER(res_partner.name)
-            FROM account_move_line AS l left join res_partner on l.partner_id = res_partner.id, account_account, account_move am
-            WHERE (l.account_id = account_account.id)
-                AND (l.move_id = am.id)
-                AND (am.state IN %s)
-                AND (account_account.account_type IN %s)
-                AND ''' + reconciliation_clause + '''
-                AND (l.date <= %s)
-                AND l.company_id IN %s
-            ORDER BY UPPER(res_partner.name)'''
-        cr.execute(query, arg_list)
+            WITH currency_rate AS (
+                SELECT cur.id AS currency_id, COALESCE(
+                    (SELECT r.rate FROM res_currency_rate r
+                      WHERE r.currency_id = cur.id AND r.name <= %(date)s
+                        AND (r.company_id = %(rate_company_id)s OR r.company_id IS NULL)
+                      ORDER BY r.company_id, r.name DESC LIMIT 1),
+                    (SELECT r.rate FROM res_currency_rate r
+                      WHERE r.currency_id = cur.id
+                        AND (r.company_id = %(rate_company_id)s OR r.company_id IS NULL)
+                      ORDER BY r.company_id, r.name ASC LIMIT 1),
+                    1.0) AS rate
+                FROM res_currency cur
+            ),
+            open_lines AS (
+                SELECT l.partner_id,
+                       ROUND(((l.balance + COALESCE(part.amount, 0.0))
+                              * to_rate.rate / from_rate.rate)::numeric, %(decimal_places)s) AS amount,
+                       CASE
+                           WHEN COALESCE(l.date_maturity, l.date) >= %(date_from)s THEN 6
+                           WHEN COALESCE(l.date_maturity, l.date) >= %(start_4)s THEN 4
+                           WHEN COALESCE(l.date_maturity, l.date) >= %(start_3)s THEN 3
+                           WHEN COALESCE(l.date_maturity, l.date) >= %(start_2)s THEN 2
+                           WHEN COALESCE(l.date_maturity, l.date) >= %(start_1)s THEN 1
+                           ELSE 0
+                       END AS period
+                FROM account_move_line l
+                JOIN account_move am ON am.id = l.move_id
+                JOIN account_account acc ON acc.id = l.account_id
+                JOIN res_company comp ON comp.id = l.company_id
+                JOIN currency_rate from_rate ON from_rate.currency_id = comp.currency_id
+                JOIN currency_rate to_rate ON to_rate.currency_id = %(currency_id)s
+                LEFT JOIN LATERAL (
+                    SELECT SUM(CASE WHEN p.credit_move_id = l.id THEN p.amount ELSE -p.amount END) AS amount
+                    FROM account_partial_reconcile p
+                    WHERE (p.debit_move_id = l.id OR p.credit_move_id = l.id)
+                      AND p.max_date <= %(date_from)s
+                ) part ON TRUE
+                WHERE am.state IN %(move_state)s
+                  AND acc.account_type IN %(account_type)s
+                  AND l.date <= %(date_from)s
+                  AND l.company_id IN %(company_ids)s
+                  AND (l.reconciled IS FALSE OR EXISTS (
+                      SELECT 1 FROM account_partial_reconcile p
+                      WHERE (p.debit_move_id = l.id OR p.credit_move_id = l.id)
+                        AND p.max_date > %(date_from)s
+                  ))
+                  ''' + partner_clause + '''
+            )
+            SELECT ol.partner_id,
+                   COALESCE(SUM(ol.amount) FILTER (WHERE ol.period = 6), 0.0) AS direction,
+                   COALESCE(SUM(ol.amount) FILTER (WHERE ol.period = 4), 0.0) AS "4",
+                   COALESCE(SUM(ol.amount) FILTER (WHERE ol.period = 3), 0.0) AS "3",
+                   COALESCE(SUM(ol.amount) FILTER (WHERE ol.period = 2), 0.0) AS "2",
+                   COALESCE(SUM(ol.amount) FILTER (WHERE ol.period = 1), 0.0) AS "1",
+                   COALESCE(SUM(ol.amount) FILTER (WHERE ol.period = 0), 0.0) AS "0",
+                   COUNT(*) FILTER (WHERE ol.amount != 0) AS line_count
+            FROM open_lines ol
+            LEFT JOIN res_partner rp ON rp.id = ol.partner_id
+            GROUP BY ol.partner_id, rp.name
+            ORDER BY UPPER(rp.name)'''
+        cr.execute(query, params)
         partners = cr.dictfetchall()
         # put a total of 0
         for i in range(7):
             total.append(0)
 
-        # Build a string like (1,2,3) for easy use in SQL query
-        if not partner_ids:
-            partner_ids = [partner['partner_id'] for partner in partners if partner['partner_id']]
-        lines = dict((partner['partner_id'] or False, []) for partner in partners)
-        if not partner_ids:
+        if not partners:
             return [], [], {}
 
-        # This dictionary will store the not due amount of all partners
-        undue_amounts = {}
-        query = '''SELECT l.id
-                FROM account_move_line AS l, account_account, account_move am
-                WHERE (l.account_id = account_account.id) AND (l.move_id = am.id)
-                    AND (am.state IN %s)
-                    AND (account_account.account_type IN %s)
-                    AND (COALESCE(l.date_maturity,l.date) >= %s)\
-                    AND ((l.partner_id IN %s) OR (l.partner_id IS NULL))
-                AND (l.date <= %s)
-                AND l.company_id IN %s'''
-        cr.execute(query, (tuple(move_state), tuple(account_type), date_from,
-                           tuple(partner_ids), date_from, tuple(company_ids)))
-        aml_ids = cr.fetchall()
-        aml_ids = aml_ids and [x[0] for x in aml_ids] or []
-        for line in self.env['account.move.line'].browse(aml_ids):
-            partner_id = line.partner_id.id or False
-            if partner_id not in undue_amounts:
-                undue_amounts[partner_id] = 0.0
-            line_amount = line.company_id.currency_id._convert(line.balance,
-                                                               user_currency,
-                                                               company, date)
-            if user_currency.is_zero(line_amount):
-                continue
-            for partial_line in line.matched_debit_ids:
-                if partial_line.max_date <= date_from:
-                    line_currency = partial_line.company_id.currency_id
-                    line_amount += line_currency._convert(partial_line.amount,
-                                                          user_currency,
-                                                          company, date)
-            for partial_line in line.matched_credit_ids:
-                if partial_line.max_date <= date_from:
-                    line_currency = partial_line.company_id.currency_id
-                    line_amount -= line_currency._convert(partial_line.amount,
-                                                          user_currency,
-                                                          company, date)
-            if not self.env.user.company_id.currency_id.is_zero(line_amount):
-                undue_amounts[partner_id] += line_amount
-                lines[partner_id].append({
-                    'line': line,
-                    'amount': line_amount,
-                    'period': 6,
-                })
-
-        # Use one query per period and store results in history (a list variable)
-        # Each history will contain: history[1] = {'<partner_id>': <partner_debit-credit>}
-        history = []
-        for i in range(5):
-            args_list = (tuple(move_state), tuple(account_type), tuple(partner_ids),)
-            dates_query = '(COALESCE(l.date_maturity,l.date)'
-
-            if periods[str(i)]['start'] and periods[str(i)]['stop']:
-                dates_query += ' BETWEEN %s AND %s)'
-                args_list += (periods[str(i)]['start'], periods[str(i)]['stop'])
-            elif periods[str(i)]['start']:
-                dates_query += ' >= %s)'
-                args_list += (periods[str(i)]['start'],)
-            else:
-                dates_query += ' <= %s)'
-                args_list += (periods[str(i)]['stop'],)
-            args_list += (date_from, tuple(company_ids))
-
-            query = '''SELECT l.id
-                    FROM account_move_line AS l, account_account, account_move am
-                    WHERE (l.account_id = account_account.id) AND (l.move_id = am.id)
-                        AND (am.state IN %s)
-                        AND (account_account.account_type IN %s)
-                        AND ((l.partner_id IN %s) OR (l.partner_id IS NULL))
-                        AND ''' + dates_query + '''
-                    AND (l.date <= %s)
-                    AND l.company_id IN %s'''
-            cr.execute(query, args_list)
-            partners_amount = {}
-            aml_ids = cr.fetchall()
-            aml_ids = aml_ids and [x[0] for x in aml_ids] or []
-            for line in self.env['account.move.line'].browse(aml_ids):
-                partner_id = line.partner_id.id or False
-                if partner_id not in partners_amount:
-                    partners_amount[partner_id] = 0.0
-                line_currency_id = line.company_id.currency_id
-                line_amount = line_currency_id._convert(line.balance, user_currency, company, date)
-                if user_currency.is_zero(line_amount):
-                    continue
-                for partial_line in line.matched_debit_ids:
-                    if partial_line.max_date <= date_from:
-                        line_currency_id = partial_line.company_id.currency_id
-                        line_amount += line_currency_id._convert(
-                            partial_line.amount, user_currency, company, date)
-                for partial_line in line.matched_credit_ids:
-                    if partial_line.max_date <= date_from:
-                        line_currency_id = partial_line.company_id.currency_id
-                        line_amount -= line_currency_id._convert(
-                            partial_line.amount, user_currency, company, date)
-                if not self.env.user.company_id.currency_id.is_zero(line_amount):
-                    partners_amount[partner_id] += line_amount
-                    lines[partner_id].append({
-                        'line': line,
-                        'amount': line_amount,
-                        'period': i + 1,
-                        })
-            history.append(partners_amount)
-
-        for partner in partners:
-            if partner['partner_id'] is None:
-                partner['partner_id'] = False
-            at_least_one_amount = False
-            values = {}
-            undue_amt = 0.0
-            if partner['partner_id'] in undue_amounts:  # Making sure this partner actually was found by the query
-                undue_amt = undue_amounts[partner['partner_id']]
-
-            total[6] = total[6] + undue_amt
-            values['direction'] = undue_amt
-            if not float_is_zero(values['direction'], precision_rounding=self.env.user.company_id.currency_id.rounding):
-                at_least_one_amount = True
-
+        # lines only keeps the number of non zero open lines of every partner
+        lines = {}
+        rounding = user_currency.rounding
+        browsed_partners = {
+            browsed_partner.id: browsed_partner
+            for browsed_partner in self.env['res.partner'].browse(
+                [partner['partner_id'] for partner in partners if partner['partner_id']])
+        }
+        Job = self.env['account.report.job']
+        for index, partner in enumerate(partners):
+            Job._report_progress(index, len(partners))
+            partner_id = partner['partner_id'] or False
+            lines[partner_id] = partner['line_count']
+            values = {'direction': float(partner['direction'])}
+            at_least_one_amount = not float_is_zero(values['direction'], precision_rounding=rounding)
+            total[6] = total[6] + values['direction']
             for i in range(5):
-                during = False
-                if partner['partner_id'] in history[i]:
-                    during = [history[i][partner['partner_id']]]
+                values[str(i)] = float(partner[str(i)])
                 # Adding counter
-                total[(i)] = total[(i)] + (during and during[0] or 0)
-                values[str(i)] = during and during[0] or 0.0
-                if not float_is_zero(values[str(i)],
-                                     precision_rounding=self.env.user.company_id.currency_id.rounding):
+                total[(i)] = total[(i)] + values[str(i)]
+                if not float_is_zero(values[str(i)], precision_rounding=rounding):
                     at_least_one_amount = True
             values['total'] = sum([values['direction']] + [values[str(i)] for i in range(5)])
             ## Add for total
-            total[(i + 1)] += values['total']
-            values['partner_id'] = partner['partner_id']
-            if partner['partner_id']:
-                browsed_partner = self.env['res.partner'].browse(partner['partner_id'])
+            total[5] += values['total']
+            values['partner_id'] = partner_id
+            if partner_id:
+                browsed_partner = browsed_partners[partner_id]
                 values['name'] = browsed_partner.name and len(
                     browsed_partner.name) >= 45 and browsed_partner.name[
                                                     0:40] + '...' or browsed_partner.name
@@ -226,7 +184,7 @@ class ReportAgedPartnerBalance(models.AbstractModel):
                 values['name'] = _('Unknown Partner')
                 values['trust'] = False
 
-            if at_least_one_amount or (self._context.get('include_nullified_amount') and lines[partner['partner_id']]):
+            if at_least_one_amount or (self._context.get('include_nullified_amount') and lines[partner_id]):
                 res.append(values)
 
         return res, total, lines
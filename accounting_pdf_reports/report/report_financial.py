@@ -1,4 +1,6 @@
+import json
 import time
+from collections import defaultdict
 from odoo import api, models, _
 from odoo.exceptions import UserError
 
@@ -34,7 +36,7 @@ class ReportFinancial(models.AbstractModel):
         for account in accounts:
             res[account.id] = dict.fromkeys(mapping, 0.0)
         if accounts:
-            tables, where_clause, where_params = self.env['account.move.line']._query_get()
+            tables, where_clause, where_params = self.env['account.move.line']._query_get_balance()
             tables = tables.replace('"', '') if tables else "account_move_line"
             wheres = [""]
             if where_clause.strip():
@@ -51,53 +53,194 @@ class ReportFinancial(models.AbstractModel):
                 res[row['id']] = row
         return res
 
+    def _compute_account_balance_periods(self, accounts, periods):
+        """ compute the balance of the provided accounts for every period with
+        a single query, each period being a filtered aggregate of the lines.
+        As in _query_get(), the accounts that include their initial balance
+        get their closing balance at the end of each period, the others only
+        the movements of the period.
+
+        :param periods: list of {'date_from', 'date_to'} dictionaries
+        Returns {account id: [balance of every period]}
+        """
+        res = {account.id: [0.0] * len(periods) for account in accounts}
+        if accounts and periods:
+            # the dates are filtered by the periods, not by the context
+            tables, where_clause, where_params = self.env['account.move.line'].with_context(
+                date_from=False, date_to=False)._query_get_balance()
+            tables = tables.replace('"', '') if tables else "account_move_line"
+            wheres = [""]
+            if where_clause.strip():
+                wheres.append(where_clause.strip())
+            filters = " AND ".join(wheres)
+            initial_ids = tuple(accounts.filtered('include_initial_balance').ids) or (0,)
+            period_filter = "account_move_line.date <= %s" \
+                            " AND (account_move_line.date >= %s OR account_move_line.account_id IN %s)"
+            columns = ', '.join(
+                "COALESCE(SUM(debit - credit) FILTER (WHERE " + period_filter + "), 0)"
+                for period in periods
+            )
+            request = "SELECT account_id, " + columns + \
+                       " FROM " + tables + \
+                       " WHERE account_id IN %s" \
+                       " AND " + period_filter + " " \
+                            + filters + \
+                       " GROUP BY account_id"
+            params = tuple(
+                param for period in periods for param in (period['date_to'], period['date_from'], initial_ids)
+            ) + (
+                tuple(accounts._ids),
+                max(period['date_to'] for period in periods),
+                min(period['date_from'] for period in periods),
+                initial_ids,
+            ) + tuple(where_params)
+            self.env.cr.execute(request, params)
+            for row in self.env.cr.fetchall():
+                res[row[0]] = list(row[1:])
+        return res
+
+    def _get_report_nodes(self, reports):
+        """ Return every report node reachable from reports, through their
+        children and the reports they take their value from
+        """
+        nodes = self.env['account.financial.report']
+        todo = reports
+        while todo:
+            nodes |= todo
+            todo = (todo.children_ids | todo.account_report_id) - nodes
+        return nodes
+
+    def _get_report_accounts(self, nodes):
+        """ Return {report id: accounts} for the 'accounts' and 'account_type'
+        nodes, with a single search for all the account types of the tree
+        """
+        Account = self.env['account.account']
+        type_nodes = nodes.filtered(lambda report: report.type == 'account_type')
+        accounts_by_type = defaultdict(lambda: Account)
+        if type_nodes:
+            for account in Account.search([('account_type', 'in', type_nodes.account_type_ids.mapped('type'))]):
+                accounts_by_type[account.account_type] |= account
+        report_accounts = {}
+        for report in nodes:
+            if report.type == 'accounts':
+                report_accounts[report.id] = report.account_ids
+            elif report.type == 'account_type':
+                report_accounts[report.id] = Account.union(
+                    *(accounts_by_type[account_type] for account_type in report.account_type_ids.mapped('type')))
+        return report_accounts
+
     def _compute_report_balance(self, reports):
         '''returns a dictionary with key=the ID of a record and value=the credit, debit and balance amount
-           computed for this record. If the record is of type :
-               'accounts' : it's the sum of the linked accounts
-               'account_type' : it's the sum of leaf accoutns with such an account_type
-               'account_report' : it's the amount of the related report
-               'sum' : it's the sum of the children of this record (aka a 'view' record)'''
-        res = {}
+           computed for this record. If the record is of type :
+               'accounts' : it's the sum of the linked accounts
+               'account_type' : it's the sum of leaf accoutns with such an account_type
+               'account_report' : it's the amount of the related report
+               'sum' : it's the sum of the children of this record (aka a 'view' record)
+
+           The balances of all the accounts used by the report tree are read
+           with one query, then every node is rolled up from them once.'''
         fields = ['credit', 'debit', 'balance']
-        for report in reports:
-            if report.id in res:
-                continue
-            res[report.id] = dict((fn, 0.0) for fn in fields)
-            if report.type == 'accounts':
-                # it's the sum of the linked accounts
-                res[report.id]['account'] = self._compute_account_balance(report.account_ids)
-                for value in res[report.id]['account'].values():
-                    for field in fields:
-                        res[report.id][field] += value.get(field)
-            elif report.type == 'account_type':
-                # it's the sum the leaf accounts with such an account type
-                accounts = self.env['account.account'].search(
-                    [('account_type', 'in', report.account_type_ids.mapped('type'))])
+        nodes = self._get_report_nodes(reports)
+        report_accounts = self._get_report_accounts(nodes)
+        account_balances = self._compute_account_balance(
+            self.env['account.account'].union(*report_accounts.values()))
+
+        res = {}
 
-                res[report.id]['account'] = self._compute_account_balance(accounts)
-                for value in res[report.id]['account'].values():
+        def _compute_node(report):
+            if report.id in res:
+                return res[report.id]
+            # registered before the roll-up so that a report referring to one
+            # of its ancestors does not recurse forever
+            res[report.id] = values = dict((fn, 0.0) for fn in fields)
+            if report.type in ('accounts', 'account_type'):
+                values['account'] = {
+                    account.id: dict(account_balances[account.id])
+                    for account in report_accounts[report.id]
+                }
+                for value in values['account'].values():
                     for field in fields:
-                        res[report.id][field] += value.get(field)
+                        values[field] += value.get(field)
             elif report.type == 'account_report' and report.account_report_id:
                 # it's the amount of the linked report
-                res2 = self._compute_report_balance(report.account_report_id)
-                for key, value in res2.items():
-                    for field in fields:
-                        res[report.id][field] += value[field]
+                linked = _compute_node(report.account_report_id)
+                for field in fields:
+                    values[field] += linked[field]
             elif report.type == 'sum':
                 # it's the sum of the children of this account.report
-                res2 = self._compute_report_balance(report.children_ids)
-                for key, value in res2.items():
+                for child in report.children_ids:
+                    child_values = _compute_node(child)
                     for field in fields:
-                        res[report.id][field] += value[field]
+                        values[field] += child_values[field]
+            return values
+
+        for report in reports:
+            _compute_node(report)
         return res
 
-    def get_account_lines(self, data):
-        lines = []
-        account_report = self.env['account.financial.report'].search(
-            [('id', '=', data['account_report_id'][0])])
-        child_reports = account_report._get_children_by_order()
+    def _compute_report_balance_periods(self, reports, periods):
+        """ Same as _compute_report_balance, for the balance of every period:
+        returns {report id: {'balance': [balance of every period],
+        'account': {account id: [balance of every period]}}}, from one query
+        on the accounts of the whole tree rolled up in a single pass.
+        """
+        nodes = self._get_report_nodes(reports)
+        report_accounts = self._get_report_accounts(nodes)
+        account_balances = self._compute_account_balance_periods(
+            self.env['account.account'].union(*report_accounts.values()), periods)
+
+        res = {}
+
+        def _add(values, balances):
+            for index, balance in enumerate(balances):
+                values['balance'][index] += balance
+
+        def _compute_node(report):
+            if report.id in res:
+                return res[report.id]
+            res[report.id] = values = {'balance': [0.0] * len(periods)}
+            if report.type in ('accounts', 'account_type'):
+                values['account'] = {
+                    account.id: list(account_balances[account.id])
+                    for account in report_accounts[report.id]
+                }
+                for balances in values['account'].values():
+                    _add(values, balances)
+            elif report.type == 'account_report' and report.account_report_id:
+                _add(values, _compute_node(report.account_report_id)['balance'])
+            elif report.type == 'sum':
+                for child in report.children_ids:
+                    _add(values, _compute_node(child)['balance'])
+            return values
+
+        for report in reports:
+            _compute_node(report)
+        return res
+
+    def _get_report_balances(self, data, account_report):
+        """ Return the balances of the whole report tree for the form, with
+        the comparison balances merged in when enabled.
+
+        The result is kept in the cursor cache for the request, so the
+        left and right sides of a T-format balance sheet reuse the
+        balances computed for the full report instead of computing them
+        again. The key holds the ledger version, so entries posted or
+        unposted later in the same cursor are not missed; the changes of
+        the journal items clear the cache.
+        """
+        used_context = data.get('used_context') or {}
+        company_ids = [used_context['company_id']] if used_context.get('company_id') else self.env.companies.ids
+        version = self.env['account.ledger.version']._get_version(company_ids)
+        key = (account_report.id, version, json.dumps([
+            data.get('used_context'),
+            data['enable_filter'] and data.get('comparison_context'),
+        ], sort_keys=True, default=str))
+        cache = self.env.cr.cache.setdefault('report_financial_balances', {})
+        if key in cache:
+            return cache[key]
+
+        child_reports = account_report.with_context(
+            account_financial_report_horizontal_side=False)._get_children_by_order()
         res = self.with_context(data.get('used_context'))._compute_report_balance(child_reports)
         if data['enable_filter']:
             comparison_res = self.with_context(
@@ -109,7 +252,18 @@ class ReportFinancial(models.AbstractModel):
                 if report_acc:
                     for account_id, val in comparison_res[report_id].get('account').items():
                         report_acc[account_id]['comp_bal'] = val['balance']
-        
+        cache[key] = res
+        return res
+
+    def get_account_lines(self, data):
+        lines = []
+        account_report = self.env['account.financial.report'].search(
+            [('id', '=', data['account_report_id'][0])])
+        res = self._get_report_balances(data, account_report)
+        # in T-format the side in context restricts the reports with
+        # _filter_by_side, their balances come from the computed tree
+        child_reports = account_report._get_children_by_order()
+
         for report in child_reports:
             balance_value = res[report.id]['balance'] * float(report.sign)
             vals = {
@@ -133,12 +287,12 @@ class ReportFinancial(models.AbstractModel):
                 continue
             if res[report.id].get('account'):
                 sub_lines = []
-                for account_id, value in res[report.id]['account'].items():
+                accounts = self.env['account.account'].browse(list(res[report.id]['account']))
+                for account, value in zip(accounts, res[report.id]['account'].values()):
                     #if there are accounts to display, we add them to the lines with a level equals to their level in
                     #the COA + 1 (to avoid having them with a too low level that would conflicts with the level of data
                     #financial reports for Assets, liabilities...)
                     flag = False
-                    account = self.env['account.account'].browse(account_id)
                     account_balance = value['balance'] * float(report.sign) or 0.0
                     vals = {
                         'name': account.code + ' ' + account.name,
@@ -165,6 +319,45 @@ class ReportFinancial(models.AbstractModel):
                 lines += sorted(sub_lines, key=lambda sub_line: sub_line['name'])
         return lines
 
+    def _iter_account_lines_periods(self, data):
+        """ Yield the lines of the report with the balance of every period of
+        data['periods'] in 'balances', in the order they are printed.
+        """
+        account_report = self.env['account.financial.report'].browse(data['account_report_id'][0])
+        periods = data['periods']
+        child_reports = account_report._get_children_by_order()
+        res = self.with_context(data.get('used_context'))._compute_report_balance_periods(
+            child_reports, periods)
+        currency = self.env.company.currency_id
+
+        for report in child_reports:
+            sign = float(report.sign)
+            yield {
+                'name': report.name,
+                'balances': [balance * sign for balance in res[report.id]['balance']],
+                'type': 'report',
+                'level': bool(report.style_overwrite) and report.style_overwrite or report.level,
+                'account_type': report.type or False,
+            }
+            if report.display_detail == 'no_detail' or not res[report.id].get('account'):
+                continue
+            sub_lines = []
+            accounts = self.env['account.account'].browse(list(res[report.id]['account']))
+            for account, balances in zip(accounts, res[report.id]['account'].values()):
+                if all(currency.is_zero(balance) for balance in balances):
+                    continue
+                sub_lines.append({
+                    'name': account.code + ' ' + account.name,
+                    'balances': [balance * sign for balance in balances],
+                    'type': 'account',
+                    'level': report.display_detail == 'detail_with_hierarchy' and 4,
+                    'account_type': account.account_type,
+                })
+            yield from sorted(sub_lines, key=lambda sub_line: sub_line['name'])
+
+    def get_account_lines_periods(self, data):
+        return list(self._iter_account_lines_periods(data))
+
     def get_account_lines_with_side(self, data, side=None):
         """Get account lines filtered by side (left/right) for T-format"""
         return self.with_context(
@@ -186,7 +379,10 @@ class ReportFinancial(models.AbstractModel):
 
         model = self.env.context.get('active_model')
         docs = self.env[model].browse(self.env.context.get('active_id'))
-        report_lines = self.get_account_lines(data.get('form'))
+        if data['form'].get('multi_period'):
+            report_lines = self.get_account_lines_periods(data['form'])
+        else:
+            report_lines = self.get_account_lines(data.get('form'))
         
         # Add support for T-format (horizontal) balance sheet
         data['form']['get_left_lines'] = self.get_left_lines
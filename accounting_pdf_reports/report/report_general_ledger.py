@@ -1,12 +1,170 @@
 import time
 from odoo import api, models, _
-from odoo.exceptions import UserError
+from odoo.exceptions import AccessError, UserError
 
 
 class ReportGeneralLedger(models.AbstractModel):
     _name = 'report.accounting_pdf_reports.report_general_ledger'
     _description = 'General Ledger Report'
 
+    STREAM_CHUNK_SIZE = 2000
+    PAGE_SIZE = 500
+    # totals of an account without any line, see _get_account_totals
+    EMPTY_TOTALS = {'line_count': 0, 'debit': 0.0, 'credit': 0.0, 'balance': 0.0, 'initial_balance': False}
+
+    def _get_query_filters(self, analytic_account_ids, partner_ids, initial_bal=False):
+        """ Return the where clause and params of _query_get() for the
+        current context, with the table aliases used by the ledger queries
+        """
+        context = dict(self.env.context)
+        if initial_bal:
+            context['date_from'] = self.env.context.get('date_from')
+            context['date_to'] = False
+            context['initial_bal'] = True
+        if analytic_account_ids:
+            context['analytic_account_ids'] = analytic_account_ids
+        if partner_ids:
+            context['partner_ids'] = partner_ids
+        tables, where_clause, where_params = self.env['account.move.line'].with_context(context)._query_get()
+        wheres = [""]
+        if where_clause.strip():
+            wheres.append(where_clause.strip())
+        filters = " AND ".join(wheres)
+        filters = filters.replace('account_move_line__move_id', 'm').replace('account_move_line', 'l')
+        return filters, tuple(where_params)
+
+    def _get_initial_balances(self, accounts, analytic_account_ids, partner_ids):
+        """ Return the 'Initial Balance' line of every account that has moves
+        before the start date, indexed by account id
+        """
+        filters, where_params = self._get_query_filters(analytic_account_ids, partner_ids, initial_bal=True)
+        sql = ("""SELECT 0 AS lid, l.account_id AS account_id, '' AS ldate,
+            '' AS lcode, 0.0 AS amount_currency,
+            '' AS analytic_account_id, '' AS lref,
+            'Initial Balance' AS lname, COALESCE(SUM(l.debit),0.0) AS debit,
+            COALESCE(SUM(l.credit),0.0) AS credit,
+            COALESCE(SUM(l.debit),0) - COALESCE(SUM(l.credit), 0) as balance,
+            '' AS lpartner_id,\
+            '' AS move_name, '' AS move_id, '' AS currency_code,\
+            NULL AS currency_id,\
+            '' AS invoice_id, '' AS invoice_type, '' AS invoice_number,\
+            '' AS partner_name\
+            FROM account_move_line l\
+            LEFT JOIN account_move m ON (l.move_id=m.id)\
+            LEFT JOIN res_currency c ON (l.currency_id=c.id)\
+            LEFT JOIN res_partner p ON (l.partner_id=p.id)\
+            JOIN account_journal j ON (l.journal_id=j.id)\
+            WHERE l.account_id IN %s""" + filters + ' GROUP BY l.account_id')
+        self.env.cr.execute(sql, (tuple(accounts.ids),) + where_params)
+        return {row.pop('account_id'): row for row in self.env.cr.dictfetchall()}
+
+    def _get_move_lines_query(self, accounts, analytic_account_ids, partner_ids, sortby, by_account=False):
+        """ Return the query and params of the move lines of the ledger with
+        their running balance, excluding the initial balance.
+
+        :param by_account: order the lines account by account, in the order
+            of the given recordset, so that they can be streamed
+        """
+        sql_sort = 'l.date, l.move_id, l.id'
+        if sortby == 'sort_journal_partner':
+            sql_sort = 'j.code, p.name, l.move_id, l.id'
+        filters, where_params = self._get_query_filters(analytic_account_ids, partner_ids)
+        order_by = sql_sort
+        order_params = ()
+        if by_account:
+            order_by = 'array_position(%s::int[], l.account_id), ' + sql_sort
+            order_params = (list(accounts.ids),)
+
+        # The running balance of every account is computed by the window in
+        # the same order as the lines are printed
+        sql = ('''SELECT l.id AS lid, l.account_id AS account_id,
+            l.date AS ldate, j.code AS lcode, l.currency_id,
+            l.amount_currency, '' AS analytic_account_id,
+            l.ref AS lref, l.name AS lname, COALESCE(l.debit,0) AS debit,
+            COALESCE(l.credit,0) AS credit,
+            SUM(COALESCE(l.debit,0) - COALESCE(l.credit,0)) OVER (
+                PARTITION BY l.account_id ORDER BY ''' + sql_sort + '''
+                ROWS BETWEEN UNBOUNDED PRECEDING AND CURRENT ROW) AS balance,\
+            m.name AS move_name, c.symbol AS currency_code,
+            p.name AS partner_name\
+            FROM account_move_line l\
+            JOIN account_move m ON (l.move_id=m.id)\
+            LEFT JOIN res_currency c ON (l.currency_id=c.id)\
+            LEFT JOIN res_partner p ON (l.partner_id=p.id)\
+            JOIN account_journal j ON (l.journal_id=j.id)\
+            JOIN account_account acc ON (l.account_id = acc.id) \
+            WHERE l.account_id IN %s ''' + filters + ''' ORDER BY ''' + order_by)
+        params = (tuple(accounts.ids),) + where_params + order_params
+        return sql, params
+
+    def _get_account_totals(self, accounts, analytic_account_ids, partner_ids, init_balance):
+        """ Compute the number of lines, debit, credit and ending balance of
+        every account in SQL, without fetching the lines.
+
+        Returns a dictionary indexed by account id of {
+                'line_count': number of move lines (initial balance excluded),
+                'debit', 'credit', 'balance': totals including the initial balance,
+                'initial_balance': the 'Initial Balance' line or False,
+        }
+        """
+        filters, where_params = self._get_query_filters(analytic_account_ids, partner_ids)
+        sql = ('''SELECT l.account_id AS account_id, COUNT(*) AS line_count,
+            COALESCE(SUM(l.debit),0) AS debit, COALESCE(SUM(l.credit),0) AS credit
+            FROM account_move_line l\
+            JOIN account_move m ON (l.move_id=m.id)\
+            JOIN account_journal j ON (l.journal_id=j.id)\
+            WHERE l.account_id IN %s ''' + filters + ''' GROUP BY l.account_id''')
+        self.env.cr.execute(sql, (tuple(accounts.ids),) + where_params)
+        totals = {
+            row['account_id']: dict(row, balance=row['debit'] - row['credit'], initial_balance=False)
+            for row in self.env.cr.dictfetchall()
+        }
+        if init_balance:
+            for account_id, line in self._get_initial_balances(accounts, analytic_account_ids, partner_ids).items():
+                res = totals.setdefault(account_id, {
+                    'account_id': account_id, 'line_count': 0, 'debit': 0.0, 'credit': 0.0, 'balance': 0.0,
+                })
+                res['debit'] += line['debit']
+                res['credit'] += line['credit']
+                res['balance'] += line['balance']
+                res['initial_balance'] = line
+        return totals
+
+    def _iter_account_move_lines(self, accounts, analytic_account_ids, partner_ids, init_balance, sortby):
+        """ Yield the move lines of the ledger account by account, in the order
+        of the given recordset, with their running balance.
+
+        The lines are read through a server-side named cursor in chunks of
+        STREAM_CHUNK_SIZE rows, in the transaction of the current cursor, so
+        the memory used does not depend on the size of the ledger.
+        """
+        initial_balances = {}
+        if init_balance:
+            initial_balances = self._get_initial_balances(accounts, analytic_account_ids, partner_ids)
+        sql, params = self._get_move_lines_query(
+            accounts, analytic_account_ids, partner_ids, sortby, by_account=True)
+        self.env['account.move.line'].flush_model()
+        self.env['account.move'].flush_model(['name', 'state'])
+        cursor = self.env.cr._cnx.cursor('report_general_ledger_stream')
+        try:
+            cursor.itersize = self.STREAM_CHUNK_SIZE
+            cursor.execute(sql, params)
+            columns = None
+            while True:
+                rows = cursor.fetchmany(self.STREAM_CHUNK_SIZE)
+                if not rows:
+                    break
+                if columns is None:
+                    columns = [column.name for column in cursor.description]
+                for values in rows:
+                    row = dict(zip(columns, values))
+                    initial_line = initial_balances.get(row['account_id'])
+                    if initial_line:
+                        row['balance'] += initial_line['balance']
+                    yield row
+        finally:
+            cursor.close()
+
     def _get_account_move_entry(self, accounts, analytic_account_ids,
                                 partner_ids, init_balance,
                                 sortby, display_account):
@@ -29,95 +187,32 @@ class ReportGeneralLedger(models.AbstractModel):
         }
         """
         cr = self.env.cr
-        MoveLine = self.env['account.move.line']
         move_lines = {x: [] for x in accounts.ids}
 
-        # Prepare initial sql query and Get the initial move lines
+        # Get the initial move lines
         if init_balance:
-            context = dict(self.env.context)
-            context['date_from'] = self.env.context.get('date_from')
-            context['date_to'] = False
-            context['initial_bal'] = True
-            if analytic_account_ids:
-                context['analytic_account_ids'] = analytic_account_ids
-            if partner_ids:
-                context['partner_ids'] = partner_ids
-            init_tables, init_where_clause, init_where_params = MoveLine.with_context(context)._query_get()
-            init_wheres = [""]
-            if init_where_clause.strip():
-                init_wheres.append(init_where_clause.strip())
-            init_filters = " AND ".join(init_wheres)
-            filters = init_filters.replace('account_move_line__move_id', 'm').replace('account_move_line', 'l')
-            sql = ("""SELECT 0 AS lid, l.account_id AS account_id, '' AS ldate,
-                '' AS lcode, 0.0 AS amount_currency, 
-                '' AS analytic_account_id, '' AS lref, 
-                'Initial Balance' AS lname, COALESCE(SUM(l.debit),0.0) AS debit, 
-                COALESCE(SUM(l.credit),0.0) AS credit, 
-                COALESCE(SUM(l.debit),0) - COALESCE(SUM(l.credit), 0) as balance, 
-                '' AS lpartner_id,\
-                '' AS move_name, '' AS move_id, '' AS currency_code,\
-                NULL AS currency_id,\
-                '' AS invoice_id, '' AS invoice_type, '' AS invoice_number,\
-                '' AS partner_name\
-                FROM account_move_line l\
-                LEFT JOIN account_move m ON (l.move_id=m.id)\
-                LEFT JOIN res_currency c ON (l.currency_id=c.id)\
-                LEFT JOIN res_partner p ON (l.partner_id=p.id)\
-                JOIN account_journal j ON (l.journal_id=j.id)\
-                WHERE l.account_id IN %s""" + filters + ' GROUP BY l.account_id')
-            params = (tuple(accounts.ids),) + tuple(init_where_params)
-            cr.execute(sql, params)
-            for row in cr.dictfetchall():
-                move_lines[row.pop('account_id')].append(row)
-
-        sql_sort = 'l.date, l.move_id'
-        if sortby == 'sort_journal_partner':
-            sql_sort = 'j.code, p.name, l.move_id'
+            for account_id, row in self._get_initial_balances(accounts, analytic_account_ids, partner_ids).items():
+                move_lines[account_id].append(row)
 
-        # Prepare sql query base on selected parameters from wizard
-        context = dict(self.env.context)
-        if analytic_account_ids:
-            context['analytic_account_ids'] = analytic_account_ids
-        if partner_ids:
-            context['partner_ids'] = partner_ids
-        tables, where_clause, where_params = MoveLine.with_context(context)._query_get()
-        wheres = [""]
-        if where_clause.strip():
-            wheres.append(where_clause.strip())
-        filters = " AND ".join(wheres)
-        filters = filters.replace('account_move_line__move_id', 'm').replace('account_move_line', 'l')
-
-        # Get move lines base on sql query and Calculate the total balance of move lines
-        sql = ('''SELECT l.id AS lid, l.account_id AS account_id, 
-            l.date AS ldate, j.code AS lcode, l.currency_id, 
-            l.amount_currency, '' AS analytic_account_id,
-            l.ref AS lref, l.name AS lname, COALESCE(l.debit,0) AS debit, 
-            COALESCE(l.credit,0) AS credit, 
-            COALESCE(SUM(l.debit),0) - COALESCE(SUM(l.credit), 0) AS balance,\
-            m.name AS move_name, c.symbol AS currency_code, 
-            p.name AS partner_name\
-            FROM account_move_line l\
-            JOIN account_move m ON (l.move_id=m.id)\
-            LEFT JOIN res_currency c ON (l.currency_id=c.id)\
-            LEFT JOIN res_partner p ON (l.partner_id=p.id)\
-            JOIN account_journal j ON (l.journal_id=j.id)\
-            JOIN account_account acc ON (l.account_id = acc.id) \
-            WHERE l.account_id IN %s ''' + filters + ''' GROUP BY l.id, 
-            l.account_id, l.date, j.code, l.currency_id, l.amount_currency, 
-            l.ref, l.name, m.name, c.symbol, p.name ORDER BY ''' + sql_sort)
-        params = (tuple(accounts.ids),) + tuple(where_params)
+        # Get move lines base on sql query and add the initial balance to
+        # their running balance
+        sql, params = self._get_move_lines_query(accounts, analytic_account_ids, partner_ids, sortby)
         cr.execute(sql, params)
 
+        initial_balances = {
+            account_id: lines[0]['balance'] if lines else 0.0
+            for account_id, lines in move_lines.items()
+        }
         for row in cr.dictfetchall():
-            balance = 0
-            for line in move_lines.get(row['account_id']):
-                balance += line['debit'] - line['credit']
-            row['balance'] += balance
-            move_lines[row.pop('account_id')].append(row)
+            account_id = row.pop('account_id')
+            row['balance'] += initial_balances[account_id]
+            move_lines[account_id].append(row)
 
         # Calculate the debit, credit and balance for Accounts
         account_res = []
-        for account in accounts:
+        Job = self.env['account.report.job']
+        for index, account in enumerate(accounts):
+            Job._report_progress(index, len(accounts))
             currency = account.currency_id and account.currency_id or self.env.company.currency_id
             res = dict((fn, 0.0) for fn in ['credit', 'debit', 'balance'])
             res['code'] = account.code
@@ -182,3 +277,99 @@ class ReportGeneralLedger(models.AbstractModel):
             'partner_ids': partner_ids,
             'analytic_account_ids': analytic_account_ids,
         }
+
+    def _get_ledger_params(self, form):
+        """ Return the accounts, analytic accounts and partners selected in
+        the wizard form, in the shape expected by the ledger queries
+        """
+        analytic_account_ids = False
+        if form.get('analytic_account_ids'):
+            analytic_account_ids = self.env['account.analytic.account'].browse(form['analytic_account_ids'])
+        partner_ids = False
+        if form.get('partner_ids'):
+            partner_ids = self.env['res.partner'].browse(form['partner_ids'])
+        domain = []
+        if form.get('account_ids'):
+            domain.append(('id', 'in', form['account_ids']))
+        accounts = self.env['account.account'].search(domain)
+        return accounts, analytic_account_ids, partner_ids
+
+    def _filter_ledger_accounts(self, accounts, totals, display_account):
+        """ Return the accounts shown for the display_account option, from the
+        totals of _get_account_totals """
+        if display_account == 'movement':
+            return accounts.filtered(lambda account: account.id in totals)
+        if display_account == 'not_zero':
+            return accounts.filtered(lambda account: account.id in totals and not (
+                account.currency_id or self.env.company.currency_id).is_zero(totals[account.id]['balance']))
+        return accounts
+
+    @api.model
+    def _check_ledger_access(self):
+        """ The paginated ledger reads the journal items in SQL, restrict it to
+        the users that can read the accounting """
+        if not self.env.user.has_group('account.group_account_readonly'):
+            raise AccessError(_("You are not allowed to browse the general ledger."))
+        self.env['account.move.line'].check_access('read')
+
+    @api.model
+    def _get_ledger_accounts(self, form):
+        """ Return the accounts of the ledger with their totals computed in
+        SQL, without any move line, filtered on the display_account option
+        """
+        self._check_ledger_access()
+        report = self.with_context(form.get('used_context', {}))
+        accounts, analytic_account_ids, partner_ids = report._get_ledger_params(form)
+        totals = report._get_account_totals(
+            accounts, analytic_account_ids, partner_ids, form.get('initial_balance'))
+        account_res = []
+        for account in report._filter_ledger_accounts(accounts, totals, form.get('display_account', 'movement')):
+            res = totals.get(account.id, self.EMPTY_TOTALS)
+            account_res.append({
+                'id': account.id,
+                'code': account.code,
+                'name': account.name,
+                'line_count': res['line_count'],
+                'debit': res['debit'],
+                'credit': res['credit'],
+                'balance': res['balance'],
+            })
+        return account_res
+
+    @api.model
+    def _get_ledger_page(self, form, account_id, offset=0, limit=None):
+        """ Return one page of the move lines of an account of the ledger.
+
+        The running balance is computed by the window over the whole account
+        before LIMIT/OFFSET apply, so every page shows the right balance
+        without reading the previous ones.
+        """
+        self._check_ledger_access()
+        report = self.with_context(form.get('used_context', {}))
+        limit = limit or self.PAGE_SIZE
+        accounts, analytic_account_ids, partner_ids = report._get_ledger_params(form)
+        account = accounts.filtered(lambda acc: acc.id == account_id)
+        if not account:
+            raise UserError(_("This account is not part of the general ledger."))
+        totals = report._get_account_totals(
+            account, analytic_account_ids, partner_ids, form.get('initial_balance')
+        ).get(account.id, self.EMPTY_TOTALS)
+        sql, params = report._get_move_lines_query(
+            account, analytic_account_ids, partner_ids, form.get('sortby', 'sort_date'))
+        self.env.cr.execute(sql + ' LIMIT %s OFFSET %s', params + (limit, offset))
+        lines = self.env.cr.dictfetchall()
+        initial_line = totals['initial_balance']
+        if initial_line:
+            for line in lines:
+                line['balance'] += initial_line['balance']
+        return {
+            'account': {'id': account.id, 'code': account.code, 'name': account.name},
+            'initial_balance': initial_line if not offset else False,
+            'lines': lines,
+            'total': totals['line_count'],
+            'offset': offset,
+            'limit': limit,
+            'debit': totals['debit'],
+            'credit': totals['credit'],
+            'balance': totals['balance'],
+        }
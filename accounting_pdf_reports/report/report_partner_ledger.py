@@ -7,72 +7,84 @@ class ReportPartnerLedger(models.AbstractModel):
     _name = 'report.accounting_pdf_reports.report_partnerledger'
     _description = 'Partner Ledger Report'
 
-    def _lines(self, data, partner):
-        full_account = []
+    FETCH_SIZE = 2000
+
+    def _get_partner_ledger(self, data, partner_ids=None):
+        """ Fetch the ledger of all the partners with one ordered query and
+        group it by partner in a single pass over the cursor.
+
+        The running balance of every partner (progress) is computed by a
+        window function. When partner_ids is None, every partner having a
+        line in the report is included.
+
+        Returns a dictionary indexed by partner id of {
+                'lines': list of move lines,
+                'debit': sum of debit,
+                'credit': sum of credit,
+                'debit - credit': balance,
+        }
+        """
         currency = self.env['res.currency']
         query_get_data = self.env['account.move.line'].with_context(data['form'].get('used_context', {}))._query_get()
         reconcile_clause = "" if data['form']['reconciled'] else ' AND "account_move_line".full_reconcile_id IS NULL '
-        params = [partner.id, tuple(data['computed']['move_state']), tuple(data['computed']['account_ids'])] + query_get_data[2]
+        ledger = {}
+        if partner_ids is None:
+            partner_clause = '"account_move_line".partner_id IS NOT NULL'
+            params = []
+        else:
+            ledger = {partner_id: {'lines': [], 'debit': 0.0, 'credit': 0.0, 'debit - credit': 0.0}
+                      for partner_id in partner_ids}
+            if not partner_ids:
+                return ledger
+            partner_clause = '"account_move_line".partner_id IN %s'
+            params = [tuple(partner_ids)]
+        if not data['computed']['account_ids']:
+            return ledger
+        params += [tuple(data['computed']['move_state']), tuple(data['computed']['account_ids'])] + query_get_data[2]
         query = """
-            SELECT "account_move_line".id, "account_move_line".date, j.code, acc.name->>'en_US' as a_name, "account_move_line".ref, m.name as move_name, "account_move_line".name, "account_move_line".debit, "account_move_line".credit, "account_move_line".amount_currency,"account_move_line".currency_id, c.symbol AS currency_code
+            SELECT "account_move_line".partner_id, "account_move_line".id, "account_move_line".date, j.code, acc.name->>'en_US' as a_name, "account_move_line".ref, m.name as move_name, "account_move_line".name, "account_move_line".debit, "account_move_line".credit, "account_move_line".amount_currency,"account_move_line".currency_id, c.symbol AS currency_code,
+                SUM("account_move_line".debit - "account_move_line".credit) OVER (
+                    PARTITION BY "account_move_line".partner_id
+                    ORDER BY "account_move_line".date, "account_move_line".id
+                    ROWS BETWEEN UNBOUNDED PRECEDING AND CURRENT ROW) AS progress
             FROM """ + query_get_data[0] + """
             LEFT JOIN account_journal j ON ("account_move_line".journal_id = j.id)
             LEFT JOIN account_account acc ON ("account_move_line".account_id = acc.id)
             LEFT JOIN res_currency c ON ("account_move_line".currency_id=c.id)
             LEFT JOIN account_move m ON (m.id="account_move_line".move_id)
-            WHERE "account_move_line".partner_id = %s
+            WHERE """ + partner_clause + """
                 AND m.state IN %s
                 AND "account_move_line".account_id IN %s AND """ + query_get_data[1] + reconcile_clause + """
-                ORDER BY "account_move_line".date"""
+                ORDER BY "account_move_line".partner_id, "account_move_line".date, "account_move_line".id"""
         self.env.cr.execute(query, tuple(params))
-        res = self.env.cr.dictfetchall()
-        sum = 0.0
-        lang_code = self.env.context.get('lang') or 'en_US'
-        lang = self.env['res.lang']
-        lang_id = lang._lang_get(lang_code)
-        date_format = lang_id.date_format
-        for r in res:
-            r['date'] = r['date']
-            r['displayed_name'] = '-'.join(
-                r[field_name] for field_name in ('move_name', 'ref', 'name')
-                if r[field_name] not in (None, '', '/')
-            )
-            sum += r['debit'] - r['credit']
-            r['progress'] = sum
-            r['currency_id'] = currency.browse(r.get('currency_id'))
-            full_account.append(r)
-        return full_account
+        partner_id = partner_res = None
+        while True:
+            rows = self.env.cr.dictfetchmany(self.FETCH_SIZE)
+            if not rows:
+                break
+            for r in rows:
+                if r['partner_id'] != partner_id:
+                    partner_id = r['partner_id']
+                    partner_res = ledger.setdefault(
+                        partner_id, {'lines': [], 'debit': 0.0, 'credit': 0.0, 'debit - credit': 0.0})
+                r['displayed_name'] = '-'.join(
+                    r[field_name] for field_name in ('move_name', 'ref', 'name')
+                    if r[field_name] not in (None, '', '/')
+                )
+                r['currency_id'] = currency.browse(r.get('currency_id'))
+                partner_res['lines'].append(r)
+                partner_res['debit'] += r['debit']
+                partner_res['credit'] += r['credit']
+                partner_res['debit - credit'] = r['progress']
+        return ledger
 
-    def _sum_partner(self, data, partner, field):
-        if field not in ['debit', 'credit', 'debit - credit']:
-            return
-        result = 0.0
-        query_get_data = self.env['account.move.line'].with_context(data['form'].get('used_context', {}))._query_get()
-        reconcile_clause = "" if data['form']['reconciled'] else ' AND "account_move_line".full_reconcile_id IS NULL '
-
-        params = [partner.id, tuple(data['computed']['move_state']), tuple(data['computed']['account_ids'])] + query_get_data[2]
-        query = """SELECT sum(""" + field + """)
-                FROM """ + query_get_data[0] + """, account_move AS m
-                WHERE "account_move_line".partner_id = %s
-                    AND m.id = "account_move_line".move_id
-                    AND m.state IN %s
-                    AND account_id IN %s
-                    AND """ + query_get_data[1] + reconcile_clause
-        self.env.cr.execute(query, tuple(params))
-
-        contemp = self.env.cr.fetchone()
-        if contemp is not None:
-            result = contemp[0] or 0.0
-        return result
+    def _lines(self, data, partner):
+        return self._get_partner_ledger(data, [partner.id])[partner.id]['lines']
 
-    @api.model
-    def _get_report_values(self, docids, data=None):
-        if not data.get('form'):
-            raise UserError(_("Form content is missing, this report cannot be printed."))
+    def _compute_ledger_params(self, data):
+        """ Store the move states and accounts selected in the form in
+        data['computed'] """
         data['computed'] = {}
-
-        obj_partner = self.env['res.partner']
-        query_get_data = self.env['account.move.line'].with_context(data['form'].get('used_context', {}))._query_get()
         data['computed']['move_state'] = ['draft', 'posted']
         if data['form'].get('target_move', 'all') == 'posted':
             data['computed']['move_state'] = ['posted']
@@ -90,25 +102,20 @@ class ReportPartnerLedger(models.AbstractModel):
             WHERE a.account_type IN %s
             AND NOT a.deprecated""", (tuple(data['computed']['ACCOUNT_TYPE']),))
         data['computed']['account_ids'] = [a for (a,) in self.env.cr.fetchall()]
-        params = [tuple(data['computed']['move_state']), tuple(data['computed']['account_ids'])] + query_get_data[2]
-        reconcile_clause = "" if data['form']['reconciled'] else ' AND "account_move_line".full_reconcile_id IS NULL '
-        query = """
-            SELECT DISTINCT "account_move_line".partner_id
-            FROM """ + query_get_data[0] + """, account_account AS account, account_move AS am
-            WHERE "account_move_line".partner_id IS NOT NULL
-                AND "account_move_line".account_id = account.id
-                AND am.id = "account_move_line".move_id
-                AND am.state IN %s
-                AND "account_move_line".account_id IN %s
-                AND NOT account.deprecated
-                AND """ + query_get_data[1] + reconcile_clause
-        self.env.cr.execute(query, tuple(params))
+        return data
+
+    @api.model
+    def _get_report_values(self, docids, data=None):
+        if not data.get('form'):
+            raise UserError(_("Form content is missing, this report cannot be printed."))
+        self._compute_ledger_params(data)
         if data['form']['partner_ids']:
             partner_ids = data['form']['partner_ids']
+            partner_ledger = self._get_partner_ledger(data, partner_ids)
         else:
-            partner_ids = [res['partner_id'] for res in
-                           self.env.cr.dictfetchall()]
-        partners = obj_partner.browse(partner_ids)
+            partner_ledger = self._get_partner_ledger(data)
+            partner_ids = list(partner_ledger)
+        partners = self.env['res.partner'].browse(partner_ids)
         partners = sorted(partners, key=lambda x: (x.ref or '', x.name or ''))
 
         return {
@@ -117,6 +124,5 @@ class ReportPartnerLedger(models.AbstractModel):
             'data': data,
             'docs': partners,
             'time': time,
-            'lines': self._lines,
-            'sum_partner': self._sum_partner,
+            'partner_ledger': partner_ledger,
         }
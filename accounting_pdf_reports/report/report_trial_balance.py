@@ -22,7 +22,7 @@ class ReportTrialBalance(models.AbstractModel):
 
         account_result = {}
         # Prepare sql query base on selected parameters from wizard
-        tables, where_clause, where_params = self.env['account.move.line']._query_get()
+        tables, where_clause, where_params = self.env['account.move.line']._query_get_balance()
         tables = tables.replace('"','')
         if not tables:
             tables = 'account_move_line'
@@ -40,7 +40,9 @@ class ReportTrialBalance(models.AbstractModel):
             account_result[row.pop('id')] = row
 
         account_res = []
-        for account in accounts:
+        Job = self.env['account.report.job']
+        for index, account in enumerate(accounts):
+            Job._report_progress(index, len(accounts))
             res = dict((fn, 0.0) for fn in ['credit', 'debit', 'balance'])
             currency = account.currency_id and account.currency_id or self.env.company.currency_id
             res['code'] = account.code
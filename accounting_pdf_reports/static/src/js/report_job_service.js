@@ -0,0 +1,34 @@
+import { _t } from "@web/core/l10n/translation";
+import { registry } from "@web/core/registry";
+
+/**
+ * Shows the notifications of the background accounting reports, with a
+ * button that downloads the generated file.
+ */
+export const reportJobService = {
+    dependencies: ["action", "bus_service", "notification"],
+    start(env, { action, bus_service, notification }) {
+        bus_service.subscribe("account_report_job/done", ({ message, title, type, url }) => {
+            const closeNotification = notification.add(message, {
+                title,
+                type,
+                sticky: Boolean(url),
+                buttons: url
+                    ? [
+                          {
+                              name: _t("Download"),
+                              primary: true,
+                              onClick: () => {
+                                  action.doAction({ type: "ir.actions.act_url", url, target: "new" });
+                                  closeNotification();
+                              },
+                          },
+                      ]
+                    : [],
+            });
+        });
+        bus_service.start();
+    },
+};
+
+registry.category("services").add("account_report_job", reportJobService);
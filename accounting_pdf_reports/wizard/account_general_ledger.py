@@ -1,7 +1,9 @@
 from odoo import fields, models, api, _
-from odoo.exceptions import UserError
-import base64
-from io import BytesIO
+from odoo.exceptions import AccessError, UserError
+from odoo.tools import json_default
+import json
+import tempfile
+from urllib.parse import urlencode
 try:
     from odoo.tools.misc import xlsxwriter
 except ImportError:
@@ -28,6 +30,9 @@ class AccountReportGeneralLedger(models.TransientModel):
         'account_id', 'journal_id', string='Journals', required=True
     )
 
+    LEDGER_FIELDS = ['date_from', 'date_to', 'journal_ids', 'target_move', 'display_account', 'company_id',
+                     'initial_balance', 'sortby', 'analytic_account_ids', 'account_ids', 'partner_ids']
+
     def _get_report_data(self, data):
         data = self.pre_print_report(data)
         data['form'].update(self.read(['initial_balance', 'sortby'])[0])
@@ -40,38 +45,66 @@ class AccountReportGeneralLedger(models.TransientModel):
         records, data = self._get_report_data(data)
         return self.env.ref('accounting_pdf_reports.action_report_general_ledger').with_context(landscape=True).report_action(records, data=data)
 
-    def action_export_excel(self):
-        """Export General Ledger to Excel"""
+    def _get_ledger_data(self):
+        """Read the wizard into the data dictionary used by the Excel export
+        and the paginated ledger"""
         data = {}
         data['ids'] = self.env.context.get('active_ids', [])
         data['model'] = self.env.context.get('active_model', 'ir.ui.menu')
-        data['form'] = self.read(['date_from', 'date_to', 'journal_ids', 'target_move', 'display_account', 
-                                  'initial_balance', 'sortby', 'analytic_account_ids', 'account_ids', 'partner_ids'])[0]
+        data['form'] = self.read(self.LEDGER_FIELDS)[0]
+        data['form']['used_context'] = self._build_ledger_context(data)
+        return data
+
+    @api.model
+    def _build_ledger_context(self, data):
+        """Return the used_context of the ledger form, on a company the user
+        is allowed to report on"""
         used_context = self._build_contexts(data)
-        data['form']['used_context'] = dict(used_context, lang=self.env.context.get('lang') or 'en_US')
-        
-        # Generate Excel
-        output = BytesIO()
-        workbook = xlsxwriter.Workbook(output, {'in_memory': True})
-        self._generate_excel_report(workbook, data)
-        workbook.close()
-        output.seek(0)
-        
-        # Create attachment
-        file_name = 'General_Ledger_Report.xlsx'
-        attachment = self.env['ir.attachment'].create({
-            'name': file_name,
-            'type': 'binary',
-            'datas': base64.b64encode(output.read()),
-            'mimetype': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
-        })
-        
+        if used_context['company_id'] not in self.env.companies.ids:
+            raise AccessError(_("You are not allowed to report on this company."))
+        return dict(used_context, lang=self.env.context.get('lang') or 'en_US')
+
+    @api.model
+    def _get_ledger_form(self, options):
+        """Build the form of the paginated ledger from the options of its URL,
+        which outlive the wizard"""
+        data = {'form': {field: options.get(field) for field in self.LEDGER_FIELDS}}
+        data['form']['used_context'] = self._build_ledger_context(data)
+        return data['form']
+
+    def action_browse_ledger(self):
+        """Open the paginated General Ledger, which loads the move lines of
+        one account page by page instead of rendering the whole ledger"""
+        self.ensure_one()
+        if self.initial_balance and not self.date_from:
+            raise UserError(_("You must define a Start Date"))
+        form = self._get_ledger_data()['form']
+        options = json.dumps({field: form[field] for field in self.LEDGER_FIELDS}, default=json_default)
         return {
             'type': 'ir.actions.act_url',
-            'url': f'/web/content/{attachment.id}?download=true',
+            'url': '/accounting_pdf_reports/general_ledger?' + urlencode({'options': options}),
             'target': 'new',
         }
 
+    def action_export_excel(self):
+        """Export General Ledger to Excel"""
+        data = self._get_excel_data()
+        return self._action_download_excel('General_Ledger_Report.xlsx', self._get_excel_content(data))
+
+    def _get_excel_data(self):
+        return self._get_ledger_data()
+
+    @api.model
+    def _get_excel_content(self, data):
+        # Rows are flushed to a temporary file as they are written, so the
+        # workbook is never held in memory whatever the size of the ledger
+        with tempfile.TemporaryFile() as output:
+            workbook = xlsxwriter.Workbook(output, {'constant_memory': True})
+            self._generate_excel_report(workbook, data)
+            workbook.close()
+            output.seek(0)
+            return output.read()
+
     def _generate_excel_report(self, workbook, data):
         """Generate Excel content for General Ledger"""
         sheet = workbook.add_worksheet('General Ledger')
@@ -129,41 +162,53 @@ class AccountReportGeneralLedger(models.TransientModel):
             sheet.write(row, col, header, header_format)
         row += 1
         
-        # Get report data
-        report_obj = self.env['report.accounting_pdf_reports.report_general_ledger']
-        accounts = self.env['account.account'].search([])
-        if data['form'].get('account_ids'):
-            accounts = self.env['account.account'].browse(data['form']['account_ids'])
-        
-        analytic_account_ids = data['form'].get('analytic_account_ids', [])
-        partner_ids = data['form'].get('partner_ids', [])
-        
-        accounts_res = report_obj._get_account_move_entry(
-            accounts, analytic_account_ids, partner_ids,
-            data['form'].get('initial_balance', False),
-            data['form'].get('sortby', 'sort_date'),
-            data['form'].get('display_account', 'all')
-        )
-        
+        # Get the account totals from SQL, then stream the move lines
+        # account by account so that they are never all loaded at once
+        report_obj = self.env['report.accounting_pdf_reports.report_general_ledger'].with_context(
+            data['form']['used_context'])
+        accounts, analytic_account_ids, partner_ids = report_obj._get_ledger_params(data['form'])
+        init_balance = data['form'].get('initial_balance', False)
+        totals = report_obj._get_account_totals(accounts, analytic_account_ids, partner_ids, init_balance)
+        accounts = report_obj._filter_ledger_accounts(
+            accounts, totals, data['form'].get('display_account', 'movement'))
+        if not accounts:
+            raise UserError(_("There are no journal items to export for the selected filters."))
+        lines = report_obj._iter_account_move_lines(
+            accounts, analytic_account_ids, partner_ids, init_balance,
+            data['form'].get('sortby', 'sort_date'))
+        line = next(lines, None)
+        Job = self.env['account.report.job']
+        line_total = sum(account_totals['line_count'] for account_totals in totals.values())
+        line_done = 0
+
         # Write account data
-        for account in accounts_res:
-            if account.get('move_lines'):
-                # Write account header
-                account_name = f"{account.get('code', '')} {account.get('name', '')}"
-                sheet.merge_range(row, 0, row, 4, account_name, account_format)
-                sheet.write(row, 5, account.get('debit', 0.0), number_format)
-                sheet.write(row, 6, account.get('credit', 0.0), number_format)
-                sheet.write(row, 7, account.get('balance', 0.0), number_format)
+        for account in accounts:
+            account_totals = totals.get(account.id, report_obj.EMPTY_TOTALS)
+            # Write account header
+            account_name = f"{account.code or ''} {account.name or ''}"
+            sheet.merge_range(row, 0, row, 4, account_name, account_format)
+            sheet.write(row, 5, account_totals['debit'], number_format)
+            sheet.write(row, 6, account_totals['credit'], number_format)
+            sheet.write(row, 7, account_totals['balance'], number_format)
+            row += 1
+
+            # Write move lines
+            if account_totals['initial_balance']:
+                self._write_excel_line(sheet, row, account_totals['initial_balance'], content_format, number_format)
                 row += 1
-                
-                # Write move lines
-                for line in account.get('move_lines', []):
-                    sheet.write(row, 0, line.get('ldate', ''), content_format)
-                    sheet.write(row, 1, line.get('lcode', ''), content_format)
-                    sheet.write(row, 2, line.get('partner_name', ''), content_format)
-                    sheet.write(row, 3, line.get('lref', ''), content_format)
-                    sheet.write(row, 4, line.get('move_name', ''), content_format)
-                    sheet.write(row, 5, line.get('debit', 0.0), number_format)
-                    sheet.write(row, 6, line.get('credit', 0.0), number_format)
-                    sheet.write(row, 7, line.get('balance', 0.0), number_format)
-                    row += 1
+            while line and line['account_id'] == account.id:
+                self._write_excel_line(sheet, row, line, content_format, number_format)
+                row += 1
+                line_done += 1
+                Job._report_progress(line_done, line_total)
+                line = next(lines, None)
+
+    def _write_excel_line(self, sheet, row, line, content_format, number_format):
+        sheet.write(row, 0, str(line.get('ldate') or ''), content_format)
+        sheet.write(row, 1, line.get('lcode', ''), content_format)
+        sheet.write(row, 2, line.get('partner_name', ''), content_format)
+        sheet.write(row, 3, line.get('lref', ''), content_format)
+        sheet.write(row, 4, line.get('move_name', ''), content_format)
+        sheet.write(row, 5, line.get('debit', 0.0), number_format)
+        sheet.write(row, 6, line.get('credit', 0.0), number_format)
+        sheet.write(row, 7, line.get('balance', 0.0), number_format)
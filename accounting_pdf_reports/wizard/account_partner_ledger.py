@@ -1,5 +1,4 @@
 from odoo import fields, models, api, _
-import base64
 from io import BytesIO
 try:
     from odoo.tools.misc import xlsxwriter
@@ -31,6 +30,10 @@ class AccountPartnerLedger(models.TransientModel):
 
     def action_export_excel(self):
         """Export Partner Ledger to Excel"""
+        data = self._get_excel_data()
+        return self._action_download_excel('Partner_Ledger_Report.xlsx', self._get_excel_content(data))
+
+    def _get_excel_data(self):
         data = {}
         data['ids'] = self.env.context.get('active_ids', [])
         data['model'] = self.env.context.get('active_model', 'ir.ui.menu')
@@ -40,28 +43,15 @@ class AccountPartnerLedger(models.TransientModel):
         # Build context for filtering
         used_context = self._build_contexts(data)
         data['form']['used_context'] = dict(used_context, lang=self.env.context.get('lang') or 'en_US')
-        
-        # Generate Excel
+        return data
+
+    @api.model
+    def _get_excel_content(self, data):
         output = BytesIO()
         workbook = xlsxwriter.Workbook(output, {'in_memory': True})
         self._generate_partner_ledger_excel(workbook, data)
         workbook.close()
-        output.seek(0)
-        
-        # Create attachment
-        file_name = 'Partner_Ledger_Report.xlsx'
-        attachment = self.env['ir.attachment'].create({
-            'name': file_name,
-            'type': 'binary',
-            'datas': base64.b64encode(output.read()),
-            'mimetype': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
-        })
-        
-        return {
-            'type': 'ir.actions.act_url',
-            'url': f'/web/content/{attachment.id}?download=true',
-            'target': 'new',
-        }
+        return output.getvalue()
 
     def _generate_partner_ledger_excel(self, workbook, data):
         """Generate Excel content for Partner Ledger"""
@@ -90,71 +80,30 @@ class AccountPartnerLedger(models.TransientModel):
             sheet.write(row, col, header, header_format)
         row += 1
         
-        # Get partners with transactions (same logic as print report)
-        query_get_data = self.env['account.move.line'].with_context(data['form'].get('used_context', {}))._query_get()
-        
-        # Determine account types based on result_selection
-        result_selection = data['form'].get('result_selection', 'customer')
-        if result_selection == 'customer':
-            account_types = ['asset_receivable']
-        elif result_selection == 'supplier':
-            account_types = ['liability_payable']
-        else:
-            account_types = ['asset_receivable', 'liability_payable']
-        
-        # Get account IDs for the selected types
-        self.env.cr.execute("""
-            SELECT a.id
-            FROM account_account a
-            WHERE a.account_type IN %s
-            AND NOT a.deprecated""", (tuple(account_types),))
-        account_ids = [a for (a,) in self.env.cr.fetchall()]
-        
-        move_state = ['posted'] if data['form'].get('target_move', 'all') == 'posted' else ['draft', 'posted']
-        reconcile_clause = "" if data['form']['reconciled'] else ' AND "account_move_line".full_reconcile_id IS NULL '
-        params = [tuple(move_state), tuple(account_ids)] + query_get_data[2]
-        
-        query = """
-            SELECT DISTINCT "account_move_line".partner_id
-            FROM """ + query_get_data[0] + """, account_account AS account, account_move AS am
-            WHERE "account_move_line".partner_id IS NOT NULL
-                AND "account_move_line".account_id = account.id
-                AND am.id = "account_move_line".move_id
-                AND am.state IN %s
-                AND "account_move_line".account_id IN %s
-                AND NOT account.deprecated
-                AND """ + query_get_data[1] + reconcile_clause
-        
-        self.env.cr.execute(query, tuple(params))
-        
+        # Get the ledger of all partners with one query (same logic as print report)
+        report_model = self.env['report.accounting_pdf_reports.report_partnerledger']
+        report_model._compute_ledger_params(data)
         if data['form'].get('partner_ids'):
-            partner_ids = data['form']['partner_ids']
+            partner_ledger = report_model._get_partner_ledger(data, data['form']['partner_ids'])
         else:
-            partner_ids = [res['partner_id'] for res in self.env.cr.dictfetchall()]
-        
-        partners = self.env['res.partner'].browse(partner_ids).sorted(key=lambda x: (x.ref or '', x.name or ''))
-        
-        # Prepare data structure similar to print report
-        data['computed'] = {
-            'move_state': move_state,
-            'account_ids': account_ids,
-            'ACCOUNT_TYPE': account_types
-        }
-        
+            partner_ledger = report_model._get_partner_ledger(data)
+
+        partners = self.env['res.partner'].browse(list(partner_ledger)).sorted(key=lambda x: (x.ref or '', x.name or ''))
+
         for partner in partners:
             partner_name = (partner.ref or '') + ' - ' + (partner.name or '')
             sheet.write(row, 0, partner_name, partner_format)
             sheet.merge_range(row, 1, row, 6, '', partner_format)
             row += 1
             
-            lines = self._get_partner_lines(data, partner)
+            partner_res = partner_ledger[partner.id]
+            lines = partner_res['lines']
             
             if not lines:
                 sheet.write(row, 0, 'No transactions', content_format)
                 sheet.merge_range(row, 1, row, 6, '', content_format)
                 row += 1
             else:
-                balance = 0.0
                 for line in lines:
                     sheet.write(row, 0, line.get('date', ''), content_format)
                     sheet.write(row, 1, line.get('code', ''), content_format)
@@ -162,19 +111,14 @@ class AccountPartnerLedger(models.TransientModel):
                     sheet.write(row, 3, line.get('displayed_name', ''), content_format)
                     sheet.write(row, 4, line.get('debit', 0.0), number_format)
                     sheet.write(row, 5, line.get('credit', 0.0), number_format)
-                    balance += line.get('debit', 0.0) - line.get('credit', 0.0)
-                    sheet.write(row, 6, balance, number_format)
+                    sheet.write(row, 6, line['progress'], number_format)
                     row += 1
                 
-                total_debit = sum(l.get('debit', 0.0) for l in lines)
-                total_credit = sum(l.get('credit', 0.0) for l in lines)
-                total_balance = total_debit - total_credit
-                
                 sheet.write(row, 0, 'Total ' + partner.name, partner_format)
                 sheet.merge_range(row, 1, row, 3, '', partner_format)
-                sheet.write(row, 4, total_debit, number_format)
-                sheet.write(row, 5, total_credit, number_format)
-                sheet.write(row, 6, total_balance, number_format)
+                sheet.write(row, 4, partner_res['debit'], number_format)
+                sheet.write(row, 5, partner_res['credit'], number_format)
+                sheet.write(row, 6, partner_res['debit - credit'], number_format)
                 row += 1
             
             row += 1
@@ -184,35 +128,3 @@ class AccountPartnerLedger(models.TransientModel):
         sheet.set_column('C:C', 20)
         sheet.set_column('D:D', 15)
         sheet.set_column('E:G', 15)
-    
-    def _get_partner_lines(self, data, partner):
-        """Get transaction lines for a specific partner (similar to print report's _lines method)"""
-        query_get_data = self.env['account.move.line'].with_context(data['form'].get('used_context', {}))._query_get()
-        reconcile_clause = "" if data['form']['reconciled'] else ' AND "account_move_line".full_reconcile_id IS NULL '
-        params = [partner.id, tuple(data['computed']['move_state']), tuple(data['computed']['account_ids'])] + query_get_data[2]
-        
-        query = """
-            SELECT "account_move_line".id, "account_move_line".date, j.code, acc.name->>'en_US' as a_name, 
-                   "account_move_line".ref, m.name as move_name, "account_move_line".name, 
-                   "account_move_line".debit, "account_move_line".credit
-            FROM """ + query_get_data[0] + """
-            LEFT JOIN account_journal j ON ("account_move_line".journal_id = j.id)
-            LEFT JOIN account_account acc ON ("account_move_line".account_id = acc.id)
-            LEFT JOIN account_move m ON (m.id="account_move_line".move_id)
-            WHERE "account_move_line".partner_id = %s
-                AND m.state IN %s
-                AND "account_move_line".account_id IN %s 
-                AND """ + query_get_data[1] + reconcile_clause + """
-            ORDER BY "account_move_line".date"""
-        
-        self.env.cr.execute(query, tuple(params))
-        res = self.env.cr.dictfetchall()
-        
-        # Format the results
-        for r in res:
-            r['displayed_name'] = '-'.join(
-                str(r[field_name]) for field_name in ('move_name', 'ref', 'name')
-                if r[field_name] not in (None, '', '/')
-            )
-        
-        return res
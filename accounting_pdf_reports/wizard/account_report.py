@@ -1,6 +1,10 @@
-from odoo import api, fields, models
-import base64
+from odoo import api, fields, models, _
+from odoo.exceptions import UserError
+from odoo.tools import date_utils
+from odoo.tools.misc import format_date
+import tempfile
 from io import BytesIO
+from dateutil.relativedelta import relativedelta
 try:
     from odoo.tools.misc import xlsxwriter
 except ImportError:
@@ -37,6 +41,14 @@ class AccountingReport(models.TransientModel):
                                        " use it while doing a comparison.")
     enable_report_T = fields.Boolean(string='Enable Balance Sheet Standar (T)',
                                      help="Display balance sheet in horizontal T-format with Assets on left and Liabilities on right")
+    multi_period = fields.Boolean(string='Multi-Period Columns',
+                                  help="Display one balance column per month or quarter between the start "
+                                       "and end dates, computed together in a single query.")
+    period_type = fields.Selection([('month', 'Monthly'), ('quarter', 'Quarterly')],
+                                   string='Periods', required=True, default='month')
+    include_ytd = fields.Boolean(string='Year to Date Column', default=True,
+                                 help="Add a column with the balance from the start of the fiscal year "
+                                      "to the end date.")
 
     def _build_comparison_context(self, data):
         result = {}
@@ -48,6 +60,37 @@ class AccountingReport(models.TransientModel):
             result['strict_range'] = True
         return result
 
+    def _get_periods(self):
+        """ Return the columns of the multi-period report as a list of
+        {'name', 'date_from', 'date_to'}: one per month or quarter of the
+        report dates, then the fiscal year to date when enabled.
+        """
+        self.ensure_one()
+        if not self.date_from or not self.date_to:
+            raise UserError(_('Start and end dates are required to display multiple periods.'))
+        periods = []
+        period_start = self.date_from
+        while period_start <= self.date_to:
+            period_stop = min(date_utils.end_of(period_start, self.period_type), self.date_to)
+            if self.period_type == 'quarter':
+                name = 'Q%s %s' % ((period_start.month - 1) // 3 + 1, period_start.year)
+            else:
+                name = format_date(self.env, period_start, date_format='MMM yyyy')
+            periods.append({
+                'name': name,
+                'date_from': fields.Date.to_string(period_start),
+                'date_to': fields.Date.to_string(period_stop),
+            })
+            period_start = period_stop + relativedelta(days=1)
+        if self.include_ytd:
+            fiscal_year = self.company_id.compute_fiscalyear_dates(self.date_to)
+            periods.append({
+                'name': _('YTD'),
+                'date_from': fields.Date.to_string(fiscal_year['date_from']),
+                'date_to': fields.Date.to_string(self.date_to),
+            })
+        return periods
+
     def check_report(self):
         res = super(AccountingReport, self).check_report()
         data = {}
@@ -60,11 +103,13 @@ class AccountingReport(models.TransientModel):
         return res
 
     def _print_report(self, data):
-        data['form'].update(self.read(['date_from_cmp', 'debit_credit', 'date_to_cmp', 'filter_cmp', 'account_report_id', 'enable_filter', 'label_filter', 'target_move', 'enable_report_T'])[0])
+        data['form'].update(self.read(['date_from_cmp', 'debit_credit', 'date_to_cmp', 'filter_cmp', 'account_report_id', 'enable_filter', 'label_filter', 'target_move', 'enable_report_T', 'multi_period'])[0])
+        if self.multi_period:
+            data['form']['periods'] = self._get_periods()
         
-        # Dynamically set paperformat for T-format Balance Sheet
+        # Dynamically set paperformat for T-format Balance Sheet and multi-period columns
         report_action = self.env.ref('accounting_pdf_reports.action_report_financial')
-        if self.enable_report_T and self.account_report_id.name in ['Balance Sheet', 'Neraca']:
+        if self.multi_period or (self.enable_report_T and self.account_report_id.name in ['Balance Sheet', 'Neraca']):
             paperformat = self.env.ref('accounting_pdf_reports.paperformat_euro_landscape', raise_if_not_found=False)
             if paperformat:
                 # Temporarily update the report action's paperformat
@@ -77,6 +122,12 @@ class AccountingReport(models.TransientModel):
 
     def action_export_excel(self):
         """Export Financial Report to Excel"""
+        report_name = self.account_report_id.name or 'Financial_Report'
+        file_name = f'{report_name.replace(" ", "_")}.xlsx'
+        data = self._get_excel_data()
+        return self._action_download_excel(file_name, self._get_excel_content(data))
+
+    def _get_excel_data(self):
         data = {}
         data['ids'] = self.env.context.get('active_ids', [])
         data['model'] = self.env.context.get('active_model', 'ir.ui.menu')
@@ -103,32 +154,32 @@ class AccountingReport(models.TransientModel):
             comparison_context = self._build_comparison_context(data)
             data['comparison_context'] = comparison_context
         
-        # Generate Excel
+        if self.multi_period:
+            data['periods'] = self._get_periods()
+        return data
+
+    @api.model
+    def _get_excel_content(self, data):
+        if data.get('periods'):
+            # Rows are flushed to a temporary file as they are written, so
+            # the workbook is never held in memory whatever the number of
+            # columns and accounts
+            with tempfile.TemporaryFile() as output:
+                workbook = xlsxwriter.Workbook(output, {'constant_memory': True})
+                self._generate_multi_period_excel(workbook, data)
+                workbook.close()
+                output.seek(0)
+                return output.read()
         output = BytesIO()
         workbook = xlsxwriter.Workbook(output, {'in_memory': True})
         self._generate_financial_excel(workbook, data)
         workbook.close()
-        output.seek(0)
-        
-        # Create attachment
-        report_name = self.account_report_id.name or 'Financial_Report'
-        file_name = f'{report_name.replace(" ", "_")}.xlsx'
-        attachment = self.env['ir.attachment'].create({
-            'name': file_name,
-            'type': 'binary',
-            'datas': base64.b64encode(output.read()),
-            'mimetype': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
-        })
-        
-        return {
-            'type': 'ir.actions.act_url',
-            'url': f'/web/content/{attachment.id}?download=true',
-            'target': 'new',
-        }
+        return output.getvalue()
 
     def _generate_financial_excel(self, workbook, data):
         """Generate Excel content for Financial Report (Balance Sheet / P&L)"""
-        sheet = workbook.add_worksheet(self.account_report_id.name[:31])  # Excel sheet name limit
+        account_report = self.env['account.financial.report'].browse(data['account_report_id'])
+        sheet = workbook.add_worksheet(account_report.name[:31])  # Excel sheet name limit
         
         # Formats
         title_format = workbook.add_format({
@@ -144,7 +195,7 @@ class AccountingReport(models.TransientModel):
         number_format = workbook.add_format({'border': 1, 'num_format': '#,##0.00', 'align': 'right'})
         
         # Title
-        sheet.merge_range('A1:C1', self.account_report_id.name.upper(), title_format)
+        sheet.merge_range('A1:C1', account_report.name.upper(), title_format)
         row = 2
         
         # Info
@@ -234,3 +285,47 @@ class AccountingReport(models.TransientModel):
         else:
             sheet.set_column('B:B', 18)
             sheet.set_column('C:C', 10)  # % column
+
+    def _generate_multi_period_excel(self, workbook, data):
+        """Generate the multi-period Financial Report, one balance column per
+        period, writing every line as soon as the report yields it"""
+        account_report = self.env['account.financial.report'].browse(data['account_report_id'])
+        sheet = workbook.add_worksheet(account_report.name[:31])  # Excel sheet name limit
+        periods = data['periods']
+
+        title_format = workbook.add_format({
+            'bold': True, 'font_size': 14, 'align': 'center'
+        })
+        header_format = workbook.add_format({
+            'bold': True, 'bg_color': '#FFC300', 'border': 1, 'align': 'center'
+        })
+        account_format = workbook.add_format({
+            'bold': True, 'border': 1
+        })
+        content_format = workbook.add_format({'border': 1})
+        number_format = workbook.add_format({'border': 1, 'num_format': '#,##0.00', 'align': 'right'})
+
+        # with constant_memory the rows must be written in order
+        sheet.set_column(0, 0, 50)
+        sheet.set_column(1, len(periods), 16)
+        sheet.merge_range(0, 0, 0, len(periods), account_report.name.upper(), title_format)
+        sheet.write(2, 0, f"Date From: {data['form']['date_from'] or ''}")
+        sheet.write(2, 2, f"Date To: {data['form']['date_to'] or ''}")
+        row = 4
+        sheet.write(row, 0, 'Name', header_format)
+        for col, period in enumerate(periods, start=1):
+            sheet.write(row, col, period['name'], header_format)
+        row += 1
+
+        report_model = self.env['report.accounting_pdf_reports.report_financial']
+        for line in report_model._iter_account_lines_periods(data):
+            level = line.get('level', 0)
+            # the level may be a style string or a boolean
+            if isinstance(level, str):
+                level = 0
+            elif isinstance(level, bool):
+                level = int(level)
+            sheet.write(row, 0, '  ' * level + line.get('name', ''), account_format if level == 0 else content_format)
+            for col, balance in enumerate(line['balances'], start=1):
+                sheet.write(row, col, balance, number_format)
+            row += 1
@@ -1,4 +1,9 @@
+import base64
+import json
+
 from odoo import api, fields, models, _
+from odoo.exceptions import UserError
+from odoo.tools import date_utils
 from odoo.tools.misc import get_lang
 
 
@@ -20,6 +25,12 @@ class AccountCommonReport(models.TransientModel):
                                     ('all', 'All Entries'),
                                     ], string='Target Moves', required=True, default='posted')
 
+    can_export_excel = fields.Boolean(compute='_compute_can_export_excel')
+
+    def _compute_can_export_excel(self):
+        for wizard in self:
+            wizard.can_export_excel = hasattr(wizard, 'action_export_excel')
+
     @api.onchange('company_id')
     def _onchange_company_id(self):
         if self.company_id:
@@ -57,3 +68,68 @@ class AccountCommonReport(models.TransientModel):
         used_context = self._build_contexts(data)
         data['form']['used_context'] = dict(used_context, lang=get_lang(self.env).code)
         return self.with_context(discard_logo_check=True)._print_report(data)
+
+    def _action_download_excel(self, file_name, content):
+        """ Return the action downloading the given Excel content, the
+        content itself comes from the _get_excel_content of the wizard
+        """
+        attachment = self.env['ir.attachment'].create({
+            'name': file_name,
+            'type': 'binary',
+            'datas': base64.b64encode(content),
+            'mimetype': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+        })
+        return {
+            'type': 'ir.actions.act_url',
+            'url': f'/web/content/{attachment.id}?download=true',
+            'target': 'new',
+        }
+
+    def _enqueue_report_job(self, report_format):
+        """ Queue the report of the wizard to be generated in background, the
+        PDF report is prepared now as it would be printed and only rendered
+        by the job
+        """
+        self.ensure_one()
+        # the values go through JSON like the actions sent to the client
+        to_json = lambda value: json.loads(json.dumps(value, default=date_utils.json_default))
+        values = {
+            'name': self._description,
+            'report_format': report_format,
+            'res_model': self._name,
+            'company_id': self.company_id.id,
+            'report_context': to_json(self.env.context),
+        }
+        if report_format == 'pdf':
+            action = self.check_report()
+            if action.get('type') != 'ir.actions.report':
+                return action
+            values.update({
+                'name': action.get('name') or self._description,
+                'report_name': action['report_name'],
+                'res_ids': action['context'].get('active_ids') or [],
+                'data': to_json(action['data']),
+                'report_context': to_json(action['context']),
+            })
+        elif not self.can_export_excel:
+            raise UserError(_("This report cannot be exported to Excel."))
+        else:
+            # the job writes the workbook from these data alone, the wizard
+            # may be vacuumed by then
+            values['data'] = to_json(self._get_excel_data())
+        self.env['account.report.job'].create(values)._trigger()
+        return {
+            'type': 'ir.actions.client',
+            'tag': 'display_notification',
+            'params': {
+                'type': 'info',
+                'message': _("The report is being generated, you will be notified when it is ready."),
+                'next': {'type': 'ir.actions.act_window_close'},
+            },
+        }
+
+    def action_generate_background(self):
+        return self._enqueue_report_job('pdf')
+
+    def action_generate_background_excel(self):
+        return self._enqueue_report_job('xlsx')
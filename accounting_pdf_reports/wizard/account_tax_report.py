@@ -1,6 +1,5 @@
 from odoo import models, api, fields
 from datetime import date
-import base64
 from io import BytesIO
 try:
     from odoo.tools.misc import xlsxwriter
@@ -27,30 +26,21 @@ class AccountTaxReport(models.TransientModel):
 
     def action_export_excel(self):
         """Export Tax Report to Excel"""
+        data = self._get_excel_data()
+        return self._action_download_excel('Tax_Report.xlsx', self._get_excel_content(data))
+
+    def _get_excel_data(self):
         data = {}
         data['form'] = self.read(['date_from', 'date_to', 'target_move'])[0]
-        
-        # Generate Excel
+        return data
+
+    @api.model
+    def _get_excel_content(self, data):
         output = BytesIO()
         workbook = xlsxwriter.Workbook(output, {'in_memory': True})
         self._generate_tax_excel(workbook, data)
         workbook.close()
-        output.seek(0)
-        
-        # Create attachment
-        file_name = 'Tax_Report.xlsx'
-        attachment = self.env['ir.attachment'].create({
-            'name': file_name,
-            'type': 'binary',
-            'datas': base64.b64encode(output.read()),
-            'mimetype': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
-        })
-        
-        return {
-            'type': 'ir.actions.act_url',
-            'url': f'/web/content/{attachment.id}?download=true',
-            'target': 'new',
-        }
+        return output.getvalue()
 
     def _generate_tax_excel(self, workbook, data):
         """Generate Excel content for Tax Report"""
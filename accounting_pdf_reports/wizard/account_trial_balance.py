@@ -1,5 +1,4 @@
 from odoo import fields, models, api
-import base64
 from io import BytesIO
 try:
     from odoo.tools.misc import xlsxwriter
@@ -33,32 +32,23 @@ class AccountBalanceReport(models.TransientModel):
 
     def action_export_excel(self):
         """Export Trial Balance to Excel"""
+        data = self._get_excel_data()
+        return self._action_download_excel('Trial_Balance_Report.xlsx', self._get_excel_content(data))
+
+    def _get_excel_data(self):
         data = {}
         data['ids'] = self.env.context.get('active_ids', [])
         data['model'] = self.env.context.get('active_model', 'ir.ui.menu')
         data['form'] = self.read(['date_from', 'date_to', 'journal_ids', 'target_move', 'display_account'])[0]
-        
-        # Generate Excel
+        return data
+
+    @api.model
+    def _get_excel_content(self, data):
         output = BytesIO()
         workbook = xlsxwriter.Workbook(output, {'in_memory': True})
         self._generate_trial_balance_excel(workbook, data)
         workbook.close()
-        output.seek(0)
-        
-        # Create attachment
-        file_name = 'Trial_Balance_Report.xlsx'
-        attachment = self.env['ir.attachment'].create({
-            'name': file_name,
-            'type': 'binary',
-            'datas': base64.b64encode(output.read()),
-            'mimetype': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
-        })
-        
-        return {
-            'type': 'ir.actions.act_url',
-            'url': f'/web/content/{attachment.id}?download=true',
-            'target': 'new',
-        }
+        return output.getvalue()
 
     def _generate_trial_balance_excel(self, workbook, data):
         """Generate Excel content for Trial Balance"""
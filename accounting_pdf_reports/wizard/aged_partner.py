@@ -2,7 +2,6 @@ import time
 from dateutil.relativedelta import relativedelta
 from odoo import api, fields, models, _
 from odoo.exceptions import UserError
-import base64
 from io import BytesIO
 try:
     from odoo.tools.misc import xlsxwriter
@@ -48,34 +47,25 @@ class AccountAgedTrialBalance(models.TransientModel):
 
     def action_export_excel(self):
         """Export Aged Partner Balance to Excel"""
+        data = self._get_excel_data()
+        return self._action_download_excel('Aged_Partner_Balance_Report.xlsx', self._get_excel_content(data))
+
+    def _get_excel_data(self):
         data = {}
         data['ids'] = self.env.context.get('active_ids', [])
         data['model'] = self.env.context.get('active_model', 'ir.ui.menu')
         data['form'] = self.read(['date_from', 'journal_ids', 'target_move', 
                                    'result_selection', 'period_length'])[0]
         data = self._get_report_data(data)
-        
-        # Generate Excel
+        return data
+
+    @api.model
+    def _get_excel_content(self, data):
         output = BytesIO()
         workbook = xlsxwriter.Workbook(output, {'in_memory': True})
         self._generate_aged_partner_excel(workbook, data)
         workbook.close()
-        output.seek(0)
-        
-        # Create attachment
-        file_name = 'Aged_Partner_Balance_Report.xlsx'
-        attachment = self.env['ir.attachment'].create({
-            'name': file_name,
-            'type': 'binary',
-            'datas': base64.b64encode(output.read()),
-            'mimetype': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
-        })
-        
-        return {
-            'type': 'ir.actions.act_url',
-            'url': f'/web/content/{attachment.id}?download=true',
-            'target': 'new',
-        }
+        return output.getvalue()
 
     def _generate_aged_partner_excel(self, workbook, data):
         """Generate Excel content for Aged Partner Balance"""
@@ -0,0 +1,10 @@
+from odoo import http
+from odoo.http import request
+
+
+class AttendancePunchController(http.Controller):
+
+    @http.route('/km_hr_attendance/punches', type='json', auth='user', methods=['POST'])
+    def ingest_punches(self, punches, batch_size=1000):
+        """Bulk endpoint for biometric terminals, see hr.attendance.ingest_punches"""
+        return request.env['hr.attendance'].ingest_punches(punches, batch_size=batch_size)
@@ -1,20 +1,85 @@
-from odoo import api, fields, models
+from collections import defaultdict
 from datetime import datetime, time, timedelta
 
+from odoo import api, fields, models
+from odoo.tools.misc import babel_locale_parse, get_lang, split_every
+
+# Indonesian day and month names, also kept for the default en_US language
+DAYS_ID = ('Senin', 'Selasa', 'Rabu', 'Kamis', 'Jumat', 'Sabtu', 'Minggu')
+MONTHS_ID = ('Januari', 'Februari', 'Maret', 'April', 'Mei', 'Juni',
+             'Juli', 'Agustus', 'September', 'Oktober', 'November', 'Desember')
+
+_DATE_NAMES_CACHE = {}
+
+# Longest side, in pixels, kept for check-in/check-out photos
+PHOTO_MAX_SIZE = 1024
+
+# Device punches closer than this to the previous one are treated as duplicates
+PUNCH_DUPLICATE_WINDOW = timedelta(minutes=1)
+# Two punches further apart than this are never paired into one attendance
+PUNCH_MAX_SHIFT = timedelta(hours=16)
+
+
+def _get_date_names(lang_code):
+    """Return (day names, month names) for a res.lang code, Monday first."""
+    if not lang_code or lang_code == 'en_US' or lang_code.startswith('id'):
+        return DAYS_ID, MONTHS_ID
+    if lang_code not in _DATE_NAMES_CACHE:
+        locale = babel_locale_parse(lang_code)
+        days = locale.days['format']['wide']
+        months = locale.months['format']['wide']
+        _DATE_NAMES_CACHE[lang_code] = (
+            tuple(days[i] for i in range(7)),
+            tuple(months[i] for i in range(1, 13)),
+        )
+    return _DATE_NAMES_CACHE[lang_code]
+
 
 class HrAttendance(models.Model):
     _inherit = 'hr.attendance'
 
+    # Photos are downscaled and re-encoded on upload; list views and reports
+    # only load the 128px thumbnails, the full photo is fetched on zoom.
     checkin_photo = fields.Image(
         string='Check-in Photo',
+        max_width=PHOTO_MAX_SIZE,
+        max_height=PHOTO_MAX_SIZE,
         help='Photo taken during check-in'
     )
 
     checkout_photo = fields.Image(
         string='Check-out Photo',
+        max_width=PHOTO_MAX_SIZE,
+        max_height=PHOTO_MAX_SIZE,
         help='Photo taken during check-out'
     )
 
+    checkin_photo_128 = fields.Image(
+        string='Check-in Photo 128',
+        related='checkin_photo',
+        max_width=128,
+        max_height=128,
+        store=True,
+    )
+
+    checkout_photo_128 = fields.Image(
+        string='Check-out Photo 128',
+        related='checkout_photo',
+        max_width=128,
+        max_height=128,
+        store=True,
+    )
+
+    in_device = fields.Char(
+        string='Check-in Device',
+        help='Terminal that recorded the check-in punch'
+    )
+
+    out_device = fields.Char(
+        string='Check-out Device',
+        help='Terminal that recorded the check-out punch'
+    )
+
     is_late = fields.Boolean(
         string='Is Late',
         compute='_compute_is_late',
@@ -41,121 +106,270 @@ class HrAttendance(models.Model):
         help='Check out time only'
     )
 
+    def _get_schedule_periods(self, calendar, work_date, periods_cache):
+        """Return the sorted (hour_from, hour_to) periods of a calendar for a date.
+        Results are cached per (calendar, date) in periods_cache."""
+        key = (calendar.id, work_date)
+        if key not in periods_cache:
+            weekday = str(work_date.weekday())
+            periods_cache[key] = sorted(
+                (att.hour_from, att.hour_to)
+                for att in calendar.attendance_ids
+                if att.dayofweek == weekday
+                and not att.display_type
+                and att.hour_from is not None
+                and att.hour_to is not None
+                and att.hour_from < att.hour_to
+                and (not att.date_from or att.date_from <= work_date)
+                and (not att.date_to or att.date_to >= work_date)
+            )
+        return periods_cache[key]
+
     @api.depends('check_in', 'check_out', 'employee_id')
     def _compute_is_late(self):
         """Check if employee is late based on working schedule (>1 minute = late)
         Handles multiple attendance periods per day (Morning, Break, Afternoon)
-        Converts check_in to working schedule timezone before comparison"""
+        Converts check_in to working schedule timezone before comparison
+
+        Records are grouped by (calendar, local work date) so the schedule
+        periods and the timezone are resolved once per group."""
         from pytz import timezone, utc
-        
+
+        late_threshold = timedelta(minutes=1)
+        timezones = {}
+        periods_cache = {}
+        groups = defaultdict(list)
+
         for record in self:
             record.is_late = False
             if not record.check_in or not record.employee_id:
                 continue
-            
-            try:
-                # Get calendar and timezone
-                calendar = record.employee_id.resource_calendar_id or record.employee_id.company_id.resource_calendar_id
-                if not calendar:
-                    continue
-                
-                tz_name = calendar.tz or 'UTC'
-                tz = timezone(tz_name)
-                
-                # Convert check_in from UTC to working schedule timezone
-                check_in_utc = utc.localize(record.check_in.replace(tzinfo=None))
-                check_in_tz = check_in_utc.astimezone(tz)
-                
-                # Get work date and time in the working schedule timezone
-                work_date = check_in_tz.date()
+            calendar = record.employee_id.resource_calendar_id or record.employee_id.company_id.resource_calendar_id
+            if not calendar:
+                continue
+            tz_name = calendar.tz or 'UTC'
+            if tz_name not in timezones:
+                timezones[tz_name] = timezone(tz_name)
+            tz = timezones[tz_name]
+
+            # Convert check_in from UTC to working schedule timezone
+            check_in_tz = utc.localize(record.check_in.replace(tzinfo=None)).astimezone(tz)
+            groups[(calendar, check_in_tz.date(), tz)].append((record, check_in_tz))
+
+        for (calendar, work_date, tz), items in groups.items():
+            periods = self._get_schedule_periods(calendar, work_date, periods_cache)
+            if not periods:
+                continue
+            for record, check_in_tz in items:
                 check_in_time_decimal = check_in_tz.hour + check_in_tz.minute / 60.0
-                
-                # Get all scheduled periods for this weekday (0=Monday)
-                weekday = str(work_date.weekday())
-                lines = calendar.attendance_ids.filtered(
-                    lambda att: att.dayofweek == weekday
-                    and not att.display_type
-                    and att.hour_from is not None
-                    and att.hour_to is not None
-                    and att.hour_from < att.hour_to
-                    and (not att.date_from or att.date_from <= work_date)
-                    and (not att.date_to or att.date_to >= work_date)
-                ).sorted('hour_from')
-                
-                if not lines:
-                    continue
-                
-                # Find which period the check-in falls into
-                relevant_period = None
-                for line in lines:
-                    # Check if check-in is within or after this period's start
-                    if check_in_time_decimal >= line.hour_from:
-                        # This could be the relevant period
-                        relevant_period = line
-                        # If check-in is before the period ends, use this period
-                        if check_in_time_decimal <= line.hour_to:
+
+                # Find which period the check-in falls into, defaulting to the first one
+                hour_from = periods[0][0]
+                for period_from, period_to in periods:
+                    if check_in_time_decimal >= period_from:
+                        hour_from = period_from
+                        if check_in_time_decimal <= period_to:
                             break
-                
-                # If no relevant period found, use the first period
-                if not relevant_period:
-                    relevant_period = lines[0]
-                
-                # Get scheduled start time for the relevant period
-                hour_from = relevant_period.hour_from
+
                 hours = int(hour_from)
                 minutes = int((hour_from - hours) * 60)
-                
-                # Create scheduled start time in the working schedule timezone
                 scheduled_start_tz = tz.localize(datetime.combine(work_date, time(hours, minutes, 0)))
-                
-                # Check if late (more than 1 minute after scheduled start)
-                late_threshold = timedelta(minutes=1)
-                if check_in_tz > (scheduled_start_tz + late_threshold):
-                    record.is_late = True
-            except Exception:
-                record.is_late = False
+
+                # Late when more than 1 minute after scheduled start
+                record.is_late = check_in_tz > scheduled_start_tz + late_threshold
+
+    @api.model
+    def _recompute_is_late_batch(self, domain=None, batch_size=1000):
+        """Recompute the stored is_late flag in chunks, committing after each one.
+        Intended to be called from a scheduled action after bulk imports or
+        working schedule changes."""
+        attendance_ids = self.search(domain or [], order='id').ids
+        for offset in range(0, len(attendance_ids), batch_size):
+            batch = self.browse(attendance_ids[offset:offset + batch_size])
+            self.env.add_to_compute(self._fields['is_late'], batch)
+            batch.flush_recordset(['is_late'])
+            self.env.cr.commit()
+            self.env.invalidate_all()
+        return len(attendance_ids)
+
+    @api.model
+    def _reprocess_photos_batch(self, batch_size=200):
+        """Re-encode photos stored before the size limit was introduced, in
+        chunks with a commit per chunk, which also refreshes the thumbnails."""
+        attendance_ids = self.search(['|', ('checkin_photo', '!=', False), ('checkout_photo', '!=', False)], order='id').ids
+        for offset in range(0, len(attendance_ids), batch_size):
+            for attendance in self.browse(attendance_ids[offset:offset + batch_size]):
+                attendance.write({
+                    'checkin_photo': attendance.checkin_photo,
+                    'checkout_photo': attendance.checkout_photo,
+                })
+            self.env.cr.commit()
+            self.env.invalidate_all()
+        return len(attendance_ids)
+
+    @api.model
+    def _prepare_punch_vals(self, employee_id, check_in_punch, check_out_punch=None):
+        check_in, dummy, punch_in = check_in_punch
+        vals = {
+            'employee_id': employee_id,
+            'check_in': check_in,
+            'in_device': punch_in.get('device') or False,
+        }
+        if check_out_punch:
+            check_out, dummy, punch_out = check_out_punch
+            vals.update({
+                'check_out': check_out,
+                'out_device': punch_out.get('device') or False,
+            })
+        return vals
+
+    @api.model
+    def ingest_punches(self, punches, batch_size=1000):
+        """Turn raw device punches into attendances in bulk.
+
+        :param punches: list of dicts with keys ``badge`` (employee badge ID),
+            ``timestamp`` (UTC, Odoo datetime string) and optional ``device``
+        :return: dict with the number of ``created`` attendances, ``closed``
+            open attendances, dropped ``duplicates`` and the ``rejected``
+            punches with their index in the input and a reason code
+
+        Punches are deduplicated and paired per employee in memory against the
+        employee's existing attendances, then created with one ``create`` per
+        batch so stored computes run once per batch.
+        """
+        result = {'created': 0, 'closed': 0, 'duplicates': 0, 'rejected': []}
+
+        def reject(index, punch, reason):
+            punch = punch if isinstance(punch, dict) else {}
+            result['rejected'].append({
+                'index': index,
+                'badge': punch.get('badge'),
+                'timestamp': punch.get('timestamp'),
+                'reason': reason,
+            })
+
+        parsed = []
+        for index, punch in enumerate(punches):
+            if not isinstance(punch, dict) or not punch.get('badge') or not punch.get('timestamp'):
+                reject(index, punch, 'missing_value')
+                continue
+            try:
+                timestamp = fields.Datetime.to_datetime(punch['timestamp'])
+            except (ValueError, TypeError, KeyError):
+                reject(index, punch, 'invalid_timestamp')
+                continue
+            parsed.append((str(punch['badge']), timestamp, index, punch))
+
+        employees = self.env['hr.employee'].search([('barcode', 'in', list({badge for badge, *dummy in parsed}))])
+        employee_by_badge = {employee.barcode: employee.id for employee in employees}
+        punches_by_employee = defaultdict(list)
+        for badge, timestamp, index, punch in parsed:
+            if badge not in employee_by_badge:
+                reject(index, punch, 'unknown_badge')
                 continue
+            punches_by_employee[employee_by_badge[badge]].append((timestamp, index, punch))
+        if not punches_by_employee:
+            return result
+
+        first_punch = min(timestamp for items in punches_by_employee.values() for timestamp, *dummy in items)
+        existing_by_employee = defaultdict(list)
+        for attendance in self.search([
+            ('employee_id', 'in', list(punches_by_employee)),
+            '|', ('check_out', '=', False), ('check_out', '>=', first_punch),
+        ], order='check_in'):
+            existing_by_employee[attendance.employee_id.id].append(attendance)
+
+        vals_list = []
+        for employee_id, items in punches_by_employee.items():
+            items.sort(key=lambda item: (item[0], item[1]))
+            unique = []
+            for item in items:
+                if unique and item[0] - unique[-1][0] <= PUNCH_DUPLICATE_WINDOW:
+                    result['duplicates'] += 1
+                    continue
+                unique.append(item)
+
+            existing = existing_by_employee[employee_id]
+            closed = [attendance for attendance in existing if attendance.check_out]
+            open_attendance = next((attendance for attendance in existing if not attendance.check_out), None)
+            pending = None
+            for item in unique:
+                timestamp, index, punch = item
+                if open_attendance and timestamp > open_attendance.check_in:
+                    if timestamp - open_attendance.check_in > PUNCH_MAX_SHIFT:
+                        reject(index, punch, 'open_attendance')
+                        continue
+                    open_attendance.write({'check_out': timestamp, 'out_device': punch.get('device') or False})
+                    result['closed'] += 1
+                    closed.append(open_attendance)
+                    open_attendance = None
+                    continue
+                if any(attendance.check_in <= timestamp <= attendance.check_out for attendance in closed):
+                    reject(index, punch, 'overlaps_existing')
+                    continue
+                if pending is None:
+                    pending = item
+                    continue
+                if timestamp - pending[0] > PUNCH_MAX_SHIFT:
+                    reject(pending[1], pending[2], 'unpaired')
+                    pending = item
+                    continue
+                if any(pending[0] < attendance.check_in < timestamp for attendance in existing):
+                    reject(pending[1], pending[2], 'overlaps_existing')
+                    pending = item
+                    continue
+                vals_list.append(self._prepare_punch_vals(employee_id, pending, item))
+                pending = None
+
+            if pending:
+                # A trailing check-in stays open unless a later attendance exists
+                if open_attendance or any(attendance.check_in > pending[0] for attendance in existing):
+                    reject(pending[1], pending[2], 'unpaired')
+                else:
+                    vals_list.append(self._prepare_punch_vals(employee_id, pending))
+
+        for batch in split_every(batch_size, vals_list, list):
+            self.create(batch)
+            result['created'] += len(batch)
+        result['rejected'].sort(key=lambda rejected: rejected['index'])
+        return result
+
+    def _get_display_tz(self, timezones):
+        """Return the working schedule timezone of the record's employee,
+        cached per calendar in timezones."""
+        from pytz import timezone
+
+        calendar = self.employee_id.resource_calendar_id or self.employee_id.company_id.resource_calendar_id
+        if calendar.id not in timezones:
+            timezones[calendar.id] = timezone(calendar.tz if calendar and calendar.tz else 'UTC')
+        return timezones[calendar.id]
 
     @api.depends('check_in', 'check_out', 'employee_id')
+    @api.depends_context('lang')
     def _compute_formatted_fields(self):
         """Compute formatted date and time fields for payslip display
         Adjusts times based on working schedule timezone"""
-        from pytz import timezone, utc
-        
-        # Indonesian day and month names
-        days_id = ['Senin', 'Selasa', 'Rabu', 'Kamis', 'Jumat', 'Sabtu', 'Minggu']
-        months_id = ['Januari', 'Februari', 'Maret', 'April', 'Mei', 'Juni',
-                    'Juli', 'Agustus', 'September', 'Oktober', 'November', 'Desember']
-        
+        from pytz import utc
+
+        days, months = _get_date_names(get_lang(self.env).code)
+        timezones = {}
+
         for record in self:
+            record.check_in_date_formatted = ''
+            record.check_in_time_only = ''
+            record.check_out_time_only = ''
+            if not record.check_in and not record.check_out:
+                continue
+            tz = record._get_display_tz(timezones)
+
             if record.check_in:
-                calendar = record.employee_id.resource_calendar_id or record.employee_id.company_id.resource_calendar_id
-                tz_name = calendar.tz if calendar else 'UTC'
-                tz = timezone(tz_name)
-                
-                check_in_utc = utc.localize(record.check_in.replace(tzinfo=None))
-                check_in_tz = check_in_utc.astimezone(tz)
-                
-                day_name = days_id[check_in_tz.weekday()]
-                day_num = check_in_tz.day
-                month_name = months_id[check_in_tz.month - 1]
-                year = check_in_tz.year
-                record.check_in_date_formatted = f"{day_name}, {day_num} {month_name} {year}"
-                
+                check_in_tz = utc.localize(record.check_in.replace(tzinfo=None)).astimezone(tz)
+                record.check_in_date_formatted = "%s, %d %s %d" % (
+                    days[check_in_tz.weekday()], check_in_tz.day, months[check_in_tz.month - 1], check_in_tz.year,
+                )
                 # Format time in working schedule timezone: HH:MM
                 record.check_in_time_only = check_in_tz.strftime('%H:%M')
-            else:
-                record.check_in_date_formatted = ''
-                record.check_in_time_only = ''
-            
+
             if record.check_out:
-                calendar = record.employee_id.resource_calendar_id or record.employee_id.company_id.resource_calendar_id
-                tz_name = calendar.tz if calendar else 'UTC'
-                tz = timezone(tz_name)
-                
-                check_out_utc = utc.localize(record.check_out.replace(tzinfo=None))
-                check_out_tz = check_out_utc.astimezone(tz)
-                
+                check_out_tz = utc.localize(record.check_out.replace(tzinfo=None)).astimezone(tz)
                 record.check_out_time_only = check_out_tz.strftime('%H:%M')
-            else:
-                record.check_out_time_only = ''
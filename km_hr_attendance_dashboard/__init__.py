@@ -1 +1,5 @@
 from . import models
+
+
+def _rebuild_daily_attendance(env):
+    env["km.hr.attendance.daily"]._rebuild_all()
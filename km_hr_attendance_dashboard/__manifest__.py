@@ -7,8 +7,12 @@
 	'license': 'LGPL-3',
 	'depends': [
 		'km_hr_attendance',
+		'hr_holidays',
+		'bus',
 	],
 	'data': [
+		'security/ir.model.access.csv',
+		'data/ir_cron.xml',
 		'views/attendance_dashboard_views.xml',
 	],
 	'assets': {
@@ -16,10 +20,13 @@
 			'km_hr_attendance_dashboard/static/src/css/attendance_dashboard.css',
 			'km_hr_attendance_dashboard/static/src/js/attendance_dashboard.js',
 			'km_hr_attendance_dashboard/static/src/js/employee_attendance_history.js',
+			'km_hr_attendance_dashboard/static/src/js/attendance_lateness.js',
 			'km_hr_attendance_dashboard/static/src/xml/attendance_dashboard.xml',
 			'km_hr_attendance_dashboard/static/src/xml/employee_attendance_history.xml',
+			'km_hr_attendance_dashboard/static/src/xml/attendance_lateness.xml',
 		],
 	},
+	'post_init_hook': '_rebuild_daily_attendance',
 	'installable': True,
 	'auto_install': False,
 }
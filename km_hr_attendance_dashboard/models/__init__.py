@@ -1 +1,7 @@
 from . import attendance_dashboard
+from . import attendance_analytics
+from . import attendance_daily
+from . import attendance_monthly
+from . import hr_attendance
+from . import hr_leave
+from . import hr_employee
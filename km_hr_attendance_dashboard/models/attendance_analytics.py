@@ -0,0 +1,102 @@
+from odoo import api, fields, models
+
+
+class KmHrAttendanceAnalytics(models.AbstractModel):
+    _name = "km.hr.attendance.analytics"
+    _description = "KM Attendance Analytics"
+
+    PERCENTILES = (0.5, 0.9)
+
+    def _get_lateness_query(self, department_filter=False):
+        """Lateness minutes of every attended, scheduled day against the start of
+        the employee's first scheduled period, bucketed by department, ISO week
+        and working schedule with median/p90 aggregates. The work day and its
+        schedule are taken from the local time of the first check in."""
+        return """
+            WITH lateness AS (
+                SELECT d.department_id,
+                       cal.id AS calendar_id,
+                       date_trunc('week', loc.check_in)::date AS week,
+                       GREATEST(
+                           0.0,
+                           EXTRACT(EPOCH FROM (
+                               loc.check_in
+                               - (loc.check_in::date + make_interval(secs => MIN(rca.hour_from) * 3600))
+                           )) / 60.0
+                       ) AS minutes_late
+                  FROM km_hr_attendance_daily d
+                  JOIN hr_employee e ON e.id = d.employee_id
+                  JOIN resource_resource r ON r.id = e.resource_id
+                  JOIN res_company c ON c.id = e.company_id
+                  JOIN resource_calendar cal ON cal.id = COALESCE(e.resource_calendar_id, c.resource_calendar_id)
+                  CROSS JOIN LATERAL (
+                      SELECT (d.first_check_in AT TIME ZONE 'UTC') AT TIME ZONE COALESCE(r.tz, 'UTC') AS check_in
+                  ) loc
+                  JOIN resource_calendar_attendance rca
+                    ON rca.calendar_id = cal.id
+                   AND rca.dayofweek = (EXTRACT(ISODOW FROM loc.check_in)::int - 1)::varchar
+                   AND rca.display_type IS NULL
+                   AND rca.hour_from < rca.hour_to
+                   AND (rca.date_from IS NULL OR rca.date_from <= loc.check_in::date)
+                   AND (rca.date_to IS NULL OR rca.date_to >= loc.check_in::date)
+                 WHERE d.first_check_in IS NOT NULL
+                   AND d.date BETWEEN %(date_from)s AND %(date_to)s
+                   AND e.company_id IN %(company_ids)s
+                   {department_clause}
+              GROUP BY d.id, d.department_id, cal.id, loc.check_in
+            )
+            SELECT department_id,
+                   week,
+                   calendar_id,
+                   COUNT(*) AS days,
+                   COUNT(*) FILTER (WHERE minutes_late > %(grace)s) AS late_days,
+                   AVG(minutes_late) AS avg_minutes,
+                   percentile_cont(%(p50)s) WITHIN GROUP (ORDER BY minutes_late) AS median_minutes,
+                   percentile_cont(%(p90)s) WITHIN GROUP (ORDER BY minutes_late) AS p90_minutes
+              FROM lateness
+          GROUP BY department_id, week, calendar_id
+          ORDER BY week, department_id, calendar_id
+        """.format(
+            department_clause="AND d.department_id IN %(department_ids)s" if department_filter else "",
+        )
+
+    @api.model
+    def get_lateness_statistics(self, date_from, date_to, department_ids=None):
+        """Return weekly lateness distributions per department and working schedule.
+
+        Each row holds the number of attended days, the late days (beyond the
+        dashboard grace period) and the average, median and p90 minutes late.
+        Only the employees of the companies the user works in are counted.
+        """
+        Daily = self.env["km.hr.attendance.daily"]
+        Daily.check_access("read")
+        date_from = fields.Date.from_string(date_from)
+        date_to = fields.Date.from_string(date_to)
+        Daily.flush_model()
+        self.env.cr.execute(self._get_lateness_query(department_filter=bool(department_ids)), {
+            "date_from": date_from,
+            "date_to": date_to,
+            "company_ids": tuple(self.env.companies.ids),
+            "department_ids": tuple(department_ids or ()),
+            "grace": self.env["km.hr.attendance.dashboard"].GRACE_MINUTES,
+            "p50": self.PERCENTILES[0],
+            "p90": self.PERCENTILES[1],
+        })
+        rows = self.env.cr.dictfetchall()
+
+        departments = self.env["hr.department"].browse({row["department_id"] for row in rows if row["department_id"]})
+        calendars = self.env["resource.calendar"].browse({row["calendar_id"] for row in rows})
+        department_names = {department.id: department.display_name for department in departments}
+        calendar_names = {calendar.id: calendar.display_name for calendar in calendars}
+        return [{
+            "department_id": row["department_id"] or False,
+            "department_name": department_names.get(row["department_id"], ""),
+            "calendar_id": row["calendar_id"],
+            "calendar_name": calendar_names.get(row["calendar_id"], ""),
+            "week": fields.Date.to_string(row["week"]),
+            "days": row["days"],
+            "late_days": row["late_days"],
+            "avg_minutes": round(row["avg_minutes"] or 0.0, 1),
+            "median_minutes": round(row["median_minutes"] or 0.0, 1),
+            "p90_minutes": round(row["p90_minutes"] or 0.0, 1),
+        } for row in rows]
@@ -0,0 +1,282 @@
+from collections import defaultdict
+from datetime import datetime, time, timedelta
+
+from odoo import api, fields, models
+
+
+class KmHrAttendanceDaily(models.Model):
+    _name = "km.hr.attendance.daily"
+    _description = "KM Daily Attendance Status"
+    _order = "date desc, employee_id"
+
+    employee_id = fields.Many2one(
+        "hr.employee", string="Employee", required=True, index=True, ondelete="cascade",
+    )
+    department_id = fields.Many2one(
+        "hr.department", string="Department", related="employee_id.department_id", store=True,
+    )
+    date = fields.Date(string="Date", required=True, index=True)
+    status = fields.Selection(
+        [
+            ("on_time", "On Time"),
+            ("late", "Late"),
+            ("early", "Early Leave"),
+            ("no_clock_out", "No Clock Out"),
+            ("absent", "Absent"),
+            ("time_off", "Time Off"),
+            ("day_off", "Day Off"),
+        ],
+        string="Status",
+        required=True,
+        index=True,
+    )
+    is_late = fields.Boolean(string="Late")
+    is_early = fields.Boolean(string="Early Leave")
+    is_workday = fields.Boolean(string="Scheduled Work Day")
+    is_leave = fields.Boolean(string="On Leave")
+    is_holiday = fields.Boolean(string="Public Holiday")
+    attendance_id = fields.Many2one(
+        "hr.attendance", string="First Attendance", ondelete="set null",
+    )
+    attendance_count = fields.Integer(string="Attendances")
+    first_check_in = fields.Datetime(string="First Check In")
+    last_check_out = fields.Datetime(string="Last Check Out")
+    worked_hours = fields.Float(string="Worked Hours")
+
+    _sql_constraints = [
+        ("employee_date_uniq", "unique(employee_id, date)",
+         "Only one daily attendance status per employee and day is allowed."),
+    ]
+
+    BUS_NOTIFICATION = "km_attendance_dashboard/update"
+    BUS_MAX_DELTAS = 100
+    STAT_COUNTERS = ("on_time", "late", "early", "no_clock_out", "absent")
+
+    def _get_stat_counters(self):
+        """Return this row's contribution to the dashboard stats counters."""
+        counters = dict.fromkeys(self.STAT_COUNTERS, 0)
+        if not self:
+            return counters
+        if self.status in ("on_time", "no_clock_out", "absent"):
+            counters[self.status] = 1
+        counters["late"] = 1 if self.is_late else 0
+        counters["early"] = 1 if self.is_early else 0
+        return counters
+
+    def _notify_dashboard(self, changes):
+        """Publish the counter deltas and updated rows of a refresh on the bus.
+
+        changes is a list of (employee, date, counters before, row after) where
+        the row is empty when it was dropped. Large refreshes (cron, rebuilds)
+        only ask clients to reload their stats.
+        """
+        if not changes or self.env.context.get("km_attendance_skip_notify"):
+            return
+        group = self.env.ref("hr_attendance.group_hr_attendance_officer", raise_if_not_found=False)
+        if not group:
+            return
+        dates = [work_date for _employee, work_date, _before, _row in changes]
+        if len(changes) > self.BUS_MAX_DELTAS:
+            message = {
+                "refresh": True,
+                "date_from": fields.Date.to_string(min(dates)),
+                "date_to": fields.Date.to_string(max(dates)),
+            }
+        else:
+            dashboard = self.env["km.hr.attendance.dashboard"]
+            deltas = []
+            for employee, work_date, before, row in changes:
+                after = row._get_stat_counters()
+                counters = {key: after[key] - before[key] for key in self.STAT_COUNTERS if after[key] != before[key]}
+                deltas.append({
+                    "employee_id": employee.id,
+                    "employee_name": employee.name,
+                    "date": fields.Date.to_string(work_date),
+                    "status": row.status or False,
+                    "counters": counters,
+                    "id": row.id or before["id"],
+                    "row": dashboard._prepare_daily_row(row) if row.attendance_id else False,
+                })
+            message = {"deltas": deltas}
+        self.env["bus.bus"]._sendone(group, self.BUS_NOTIFICATION, message)
+
+    def _get_day_values(self, employee, work_date, attendances, leave_days, day_off_dates):
+        """Build the fact row values for one employee/day, or None when the day
+        is neither scheduled nor attended, or is scheduled but not over yet."""
+        dashboard = self.env["km.hr.attendance.dashboard"]
+        bounds = dashboard._get_calendar_bounds(employee, work_date)
+        is_leave = work_date in leave_days
+        is_holiday = work_date in day_off_dates
+        if not attendances and not bounds and not is_leave:
+            return None
+
+        values = {
+            "employee_id": employee.id,
+            "date": work_date,
+            "is_late": False,
+            "is_early": False,
+            "is_workday": bool(bounds),
+            "is_leave": is_leave,
+            "is_holiday": is_holiday,
+            "attendance_id": False,
+            "attendance_count": len(attendances),
+            "first_check_in": False,
+            "last_check_out": False,
+            "worked_hours": 0.0,
+        }
+        if not attendances:
+            if is_leave:
+                values["status"] = "time_off"
+            elif is_holiday or not bounds:
+                values["status"] = "day_off"
+            elif bounds["end"] > fields.Datetime.now():
+                # the scheduled day is not over yet, nothing to record
+                return None
+            else:
+                values["status"] = "absent"
+            return values
+
+        attendances = attendances.sorted("check_in")
+        first = attendances[0]
+        open_attendance = any(not att.check_out for att in attendances)
+        last_check_out = max(attendances.filtered("check_out").mapped("check_out"), default=False)
+        grace = timedelta(minutes=dashboard.GRACE_MINUTES)
+        is_late = bool(bounds and first.check_in > bounds["start"] + grace)
+        is_early = bool(
+            bounds and not open_attendance and last_check_out
+            and last_check_out < bounds["end"] - grace
+        )
+        if open_attendance:
+            status = "no_clock_out"
+        elif is_late:
+            status = "late"
+        elif is_early:
+            status = "early"
+        else:
+            status = "on_time"
+
+        values.update({
+            "status": status,
+            "is_late": is_late,
+            "is_early": is_early,
+            "attendance_id": first.id,
+            "first_check_in": first.check_in,
+            "last_check_out": False if open_attendance else last_check_out,
+            "worked_hours": sum(attendances.mapped("worked_hours")),
+        })
+        return values
+
+    @api.model
+    def _refresh_days(self, employee_days):
+        """Recompute the fact rows for an iterable of (employee_id, date) pairs.
+
+        Attendances, leaves and public holidays are loaded once for the covered
+        range, then rows are updated, created or dropped as needed.
+        """
+        days_by_employee = defaultdict(set)
+        for employee_id, work_date in employee_days:
+            if employee_id and work_date:
+                days_by_employee[employee_id].add(work_date)
+        if not days_by_employee:
+            return
+
+        all_days = set().union(*days_by_employee.values())
+        date_from, date_to = min(all_days), max(all_days)
+        employee_ids = list(days_by_employee)
+        employees = self.env["hr.employee"].with_context(active_test=False).browse(employee_ids)
+        dashboard = self.env["km.hr.attendance.dashboard"]
+
+        # the days are local to the employees, widen the UTC range by a day
+        # on both sides to cover any timezone
+        attendances = self.env["hr.attendance"].search([
+            ("employee_id", "in", employee_ids),
+            ("check_in", ">=", datetime.combine(date_from - timedelta(days=1), time.min)),
+            ("check_in", "<=", datetime.combine(date_to + timedelta(days=1), time.max)),
+        ])
+        attendances_by_day = defaultdict(lambda: self.env["hr.attendance"])
+        for att in attendances:
+            work_date = dashboard._get_local_date(att.employee_id, att.check_in)
+            attendances_by_day[(att.employee_id.id, work_date)] |= att
+
+        leave_days_map = dashboard._get_leave_days_map(employee_ids, date_from, date_to)
+        day_off_dates = dashboard._get_day_off_dates(date_from, date_to)
+
+        existing = {
+            (row.employee_id.id, row.date): row
+            for row in self.search([
+                ("employee_id", "in", employee_ids),
+                ("date", ">=", date_from),
+                ("date", "<=", date_to),
+            ])
+        }
+
+        to_create = []
+        to_unlink = self.browse()
+        changes = []
+        for employee in employees:
+            for work_date in days_by_employee[employee.id]:
+                values = self._get_day_values(
+                    employee,
+                    work_date,
+                    attendances_by_day[(employee.id, work_date)],
+                    leave_days_map.get(employee.id, set()),
+                    day_off_dates,
+                )
+                row = existing.get((employee.id, work_date), self.browse())
+                before = dict(row._get_stat_counters(), id=row.id)
+                if values is None:
+                    if row:
+                        to_unlink |= row
+                        changes.append((employee, work_date, before, self.browse()))
+                elif row:
+                    row.write(values)
+                    changes.append((employee, work_date, before, row))
+                else:
+                    to_create.append(values)
+                    changes.append((employee, work_date, before, None))
+        if to_unlink:
+            to_unlink.unlink()
+        if to_create:
+            created = iter(self.create(to_create))
+            changes = [
+                (employee, work_date, before, next(created) if row is None else row)
+                for employee, work_date, before, row in changes
+            ]
+        self.env["km.hr.attendance.monthly"]._invalidate(
+            (employee.id, work_date) for employee, work_date, _before, _row in changes
+        )
+        self._notify_dashboard(changes)
+
+    @api.model
+    def _refresh_range(self, date_from, date_to, employee_ids=None):
+        if employee_ids is None:
+            employee_ids = self.env["hr.employee"].search([("active", "=", True)]).ids
+        dashboard = self.env["km.hr.attendance.dashboard"]
+        self._refresh_days(
+            (employee_id, day)
+            for day in dashboard._daterange(date_from, date_to)
+            for employee_id in employee_ids
+        )
+
+    @api.model
+    def _cron_refresh_daily(self, lookback_days=1):
+        """Close the previous days and refresh today, so that employees without
+        any attendance activity are recorded as absent once their scheduled
+        day is over."""
+        today = fields.Date.context_today(self)
+        self._refresh_range(today - timedelta(days=lookback_days), today)
+
+    @api.model
+    def _rebuild_all(self):
+        """Rebuild the whole table month by month from the first attendance."""
+        first = self.env["hr.attendance"].search([], order="check_in asc", limit=1)
+        if not first:
+            return
+        today = fields.Date.context_today(self)
+        month_start = (first.check_in.date() - timedelta(days=1)).replace(day=1)
+        while month_start <= today:
+            next_month = (month_start + timedelta(days=32)).replace(day=1)
+            self.with_context(km_attendance_skip_notify=True)._refresh_range(
+                month_start, min(next_month - timedelta(days=1), today),
+            )
+            month_start = next_month
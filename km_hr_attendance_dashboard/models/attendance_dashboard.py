@@ -1,8 +1,10 @@
 from datetime import datetime, time, timedelta
 
 import pytz
+from dateutil.relativedelta import relativedelta
 
 from odoo import api, fields, models
+from odoo.osv import expression
 
 
 class KmHrAttendanceDashboard(models.AbstractModel):
@@ -10,11 +12,25 @@ class KmHrAttendanceDashboard(models.AbstractModel):
     _description = "KM Attendance Dashboard"
 
     GRACE_MINUTES = 5
+    PAGE_LIMIT = 80
+    SORT_FIELDS = {
+        "employee": "employee_id",
+        "date": "date",
+        "check_in": "first_check_in",
+        "check_out": "last_check_out",
+        "worked_hours": "worked_hours",
+        "status": "status",
+    }
 
     def _get_employee_timezone(self, employee):
         tz_name = employee.tz or employee.user_id.tz or self.env.user.tz or "UTC"
         return pytz.timezone(tz_name)
 
+    def _get_local_date(self, employee, value):
+        """Return the work date of a UTC datetime in the employee's timezone."""
+        tz = self._get_employee_timezone(employee)
+        return pytz.UTC.localize(value).astimezone(tz).date()
+
     def _get_calendar_bounds(self, employee, work_date):
         calendar = employee.resource_calendar_id or employee.company_id.resource_calendar_id
         if not calendar:
@@ -48,49 +64,13 @@ class KmHrAttendanceDashboard(models.AbstractModel):
             "calendar": calendar,
         }
 
-    def _classify_attendance(self, attendance, bounds):
-        check_in = attendance.check_in
-        check_out = attendance.check_out
-        grace = timedelta(minutes=self.GRACE_MINUTES)
-
-        result = {
-            "on_time": False,
-            "late": False,
-            "early": False,
-            "no_clock_in": False,
-            "no_clock_out": False,
-        }
-
-        if not check_in:
-            result["no_clock_in"] = True
-            return result
-
-        if not check_out:
-            result["no_clock_out"] = True
-
-        if not bounds:
-            return result
-
-        start = bounds["start"]
-        end = bounds["end"]
-
-        if check_in > start + grace:
-            result["late"] = True
-        if check_out and check_out < end - grace:
-            result["early"] = True
-
-        if not result["late"] and not result["early"] and check_out:
-            result["on_time"] = True
-
-        return result
-
     def _daterange(self, date_from, date_to):
         current = date_from
         while current <= date_to:
             yield current
             current += timedelta(days=1)
 
-    def _count_day_offs(self, date_from, date_to):
+    def _get_day_off_dates(self, date_from, date_to):
         leaves = self.env["resource.calendar.leaves"].search([
             ("date_from", "<=", datetime.combine(date_to, time.max)),
             ("date_to", ">=", datetime.combine(date_from, time.min)),
@@ -101,35 +81,30 @@ class KmHrAttendanceDashboard(models.AbstractModel):
         for leave in leaves:
             start = fields.Datetime.to_datetime(leave.date_from).date()
             end = fields.Datetime.to_datetime(leave.date_to).date()
-            for day in self._daterange(max(start, date_from), min(end, date_to)):
-                days.add(day)
-        return len(days)
-
-    def _employees_on_time_off(self, date_from, date_to, employee_ids=None):
-        domain = [
-            ("state", "=", "validate"),
-            ("request_date_from", "<=", date_to),
-            ("request_date_to", ">=", date_from),
-        ]
-        if employee_ids is not None:
-            domain.append(("employee_id", "in", employee_ids))
-        leaves = self.env["hr.leave"].search(domain)
-        return set(leaves.mapped("employee_id").ids)
+            days.update(self._daterange(max(start, date_from), min(end, date_to)))
+        return days
 
-    def _employee_leave_days(self, employee, date_from, date_to):
+    def _count_day_offs(self, date_from, date_to):
+        return len(self._get_day_off_dates(date_from, date_to))
+
+    def _get_leave_days_map(self, employee_ids, date_from, date_to):
+        """Return {employee_id: set(dates)} of validated leave days in the range,
+        loaded with a single search for the whole employee set."""
+        leave_days = {employee_id: set() for employee_id in employee_ids}
+        if not employee_ids:
+            return leave_days
         leaves = self.env["hr.leave"].search([
             ("state", "=", "validate"),
-            ("employee_id", "=", employee.id),
+            ("employee_id", "in", list(employee_ids)),
             ("request_date_from", "<=", date_to),
             ("request_date_to", ">=", date_from),
         ])
-        days = set()
         for leave in leaves:
             start = max(leave.request_date_from, date_from)
             end = min(leave.request_date_to, date_to)
-            for day in self._daterange(start, end):
-                days.add(day)
-        return days
+            days = leave_days.setdefault(leave.employee_id.id, set())
+            days.update(self._daterange(start, end))
+        return leave_days
 
     def _get_employees(self, search=None):
         domain = [("active", "=", True)]
@@ -142,30 +117,8 @@ class KmHrAttendanceDashboard(models.AbstractModel):
     def get_employees(self, search=None):
         return self._get_employees(search=search)
 
-    @api.model
-    def get_attendance_dashboard_data(self, date_from, date_to, search=None):
-        date_from = fields.Date.from_string(date_from)
-        date_to = fields.Date.from_string(date_to)
-        today = fields.Date.today()
-
-        employees = self.env["hr.employee"].search([( "active", "=", True)])
-        if search:
-            employees = employees.filtered(lambda e: search.lower() in (e.name or "").lower())
-        employee_ids = employees.ids
-
-        start_dt = datetime.combine(date_from, time.min)
-        end_dt = datetime.combine(date_to, time.max)
-
-        attendance_domain = [
-            ("employee_id", "in", employee_ids),
-            ("check_in", "<=", end_dt),
-            "|",
-            ("check_out", ">=", start_dt),
-            ("check_out", "=", False),
-        ]
-        attendances = self.env["hr.attendance"].search(attendance_domain, order="check_in desc")
-
-        stats = {
+    def _get_empty_stats(self):
+        return {
             "on_time": 0,
             "late": 0,
             "early": 0,
@@ -176,151 +129,143 @@ class KmHrAttendanceDashboard(models.AbstractModel):
             "time_off": 0,
         }
 
-        rows = []
-        for att in attendances:
-            work_date = fields.Datetime.to_datetime(att.check_in).date() if att.check_in else fields.Date.today()
-            bounds = self._get_calendar_bounds(att.employee_id, work_date)
-            flags = self._classify_attendance(att, bounds)
-
-            stats["on_time"] += 1 if flags["on_time"] else 0
-            stats["late"] += 1 if flags["late"] else 0
-            stats["early"] += 1 if flags["early"] else 0
-            stats["no_clock_in"] += 1 if flags["no_clock_in"] else 0
-            stats["no_clock_out"] += 1 if flags["no_clock_out"] else 0
-            rows.append({
-                "id": att.id,
-                "employee_id": att.employee_id.id,
-                "employee_name": att.employee_id.name,
-                "employee_image": f"/web/image/hr.employee/{att.employee_id.id}/image_128",
-                "check_in_date": fields.Date.to_string(work_date) if att.check_in else None,
-                "check_in": fields.Datetime.to_string(att.check_in) if att.check_in else None,
-                "check_out": fields.Datetime.to_string(att.check_out) if att.check_out else None,
-                "worked_hours": att.worked_hours,
-                "status": "on_time" if flags["on_time"] else "late" if flags["late"] else "early" if flags["early"] else "no_clock_out" if flags["no_clock_out"] else "",
-            })
+    def _get_daily_stats(self, domain):
+        stats = self._get_empty_stats()
+        Daily = self.env["km.hr.attendance.daily"]
+        groups = Daily._read_group(domain, ["status", "is_late", "is_early"], ["__count"])
+        for status, is_late, is_early, count in groups:
+            if status in ("on_time", "no_clock_out", "absent"):
+                stats[status] += count
+            stats["late"] += count if is_late else 0
+            stats["early"] += count if is_early else 0
+        [(time_off,)] = Daily._read_group(
+            domain + [("is_leave", "=", True)], [], ["employee_id:count_distinct"],
+        )
+        stats["time_off"] = time_off
+        return stats
 
-        stats["day_off"] = self._count_day_offs(date_from, date_to)
+    def _prepare_daily_row(self, row):
+        return {
+            "id": row.id,
+            "attendance_id": row.attendance_id.id,
+            "employee_id": row.employee_id.id,
+            "employee_name": row.employee_id.name,
+            "employee_image": f"/web/image/hr.employee/{row.employee_id.id}/image_128",
+            "check_in_date": fields.Date.to_string(row.date),
+            "check_in": fields.Datetime.to_string(row.first_check_in) if row.first_check_in else None,
+            "check_out": fields.Datetime.to_string(row.last_check_out) if row.last_check_out else None,
+            "worked_hours": row.worked_hours,
+            "status": row.status,
+        }
 
-        time_off_employees = self._employees_on_time_off(date_from, date_to, employee_ids=employee_ids)
-        stats["time_off"] = len(time_off_employees)
+    def _get_dashboard_domain(self, date_from, date_to, search=None):
+        domain = [
+            ("employee_id.active", "=", True),
+            ("date", ">=", date_from),
+            ("date", "<=", date_to),
+        ]
+        if search:
+            domain.append(("employee_id.name", "ilike", search))
+        return domain
 
-        leave_days_map = {
-            employee.id: self._employee_leave_days(employee, date_from, min(date_to, today))
-            for employee in employees
-        }
+    def _get_dashboard_order(self, order=None):
+        """Translate a "<column> <asc|desc>" sort key from the client into a
+        whitelisted ORDER BY clause on the daily table."""
+        column, _sep, direction = (order or "employee asc").partition(" ")
+        field_name = self.SORT_FIELDS.get(column, "employee_id")
+        direction = "desc" if direction.strip().lower() == "desc" else "asc"
+        return f"{field_name} {direction}, date desc, id desc"
+
+    @api.model
+    def get_attendance_dashboard_stats(self, date_from, date_to, search=None):
+        date_from = fields.Date.from_string(date_from)
+        date_to = fields.Date.from_string(date_to)
+        stats = self._get_daily_stats(self._get_dashboard_domain(date_from, date_to, search))
+        stats["day_off"] = self._count_day_offs(date_from, date_to)
+        return stats
 
-        absent_end = min(date_to, today)
-        for work_date in self._daterange(date_from, absent_end):
-            for employee in employees:
-                bounds = self._get_calendar_bounds(employee, work_date)
-                if not bounds:
-                    continue
-
-                if work_date in leave_days_map.get(employee.id, set()):
-                    continue
-
-                day_start = datetime.combine(work_date, time.min)
-                day_end = datetime.combine(work_date, time.max)
-                has_attendance = any(
-                    att.employee_id.id == employee.id and att.check_in <= day_end and (att.check_out or day_end) >= day_start
-                    for att in attendances
-                )
-                if not has_attendance:
-                    stats["absent"] += 1
+    @api.model
+    def get_attendance_dashboard_data(self, date_from, date_to, search=None, offset=0, limit=None, order=None):
+        date_from = fields.Date.from_string(date_from)
+        date_to = fields.Date.from_string(date_to)
+        limit = limit or self.PAGE_LIMIT
 
+        domain = self._get_dashboard_domain(date_from, date_to, search)
+        domain.append(("attendance_id", "!=", False))
+        Daily = self.env["km.hr.attendance.daily"]
+        daily_rows = Daily.search(domain, offset=offset, limit=limit, order=self._get_dashboard_order(order))
         return {
-            "stats": stats,
-            "attendances": rows,
+            "attendances": [self._prepare_daily_row(row) for row in daily_rows],
+            "total": Daily.search_count(domain),
+            "offset": offset,
+            "limit": limit,
             "date_from": fields.Date.to_string(date_from),
             "date_to": fields.Date.to_string(date_to),
         }
 
+    def _get_history_stats(self, employee, date_from, date_to, today):
+        """Assemble the stats of a range from the stored monthly summaries of
+        the closed months it fully covers, plus a live read of the daily table
+        for the remaining partial or current months."""
+        current_month = today.replace(day=1)
+        closed_months = []
+        live_ranges = []
+        month_start = date_from.replace(day=1)
+        while month_start <= date_to:
+            month_end = month_start + relativedelta(months=1, days=-1)
+            if month_start >= date_from and month_end <= date_to and month_start < current_month:
+                closed_months.append(month_start)
+            else:
+                live_ranges.append((max(month_start, date_from), min(month_end, date_to)))
+            month_start += relativedelta(months=1)
+
+        stats = self._get_empty_stats()
+        if live_ranges:
+            domain = [("employee_id", "=", employee.id)] + expression.OR([
+                [("date", ">=", range_from), ("date", "<=", range_to)]
+                for range_from, range_to in live_ranges
+            ])
+            stats = self._get_daily_stats(domain)
+        summaries = self.env["km.hr.attendance.monthly"].sudo()._get_summaries(employee, closed_months)
+        for summary in summaries:
+            for key in summary.STAT_FIELDS:
+                stats[key] += summary[key]
+        if any(summaries.mapped("leave_days")):
+            stats["time_off"] = 1
+        return stats
+
     @api.model
     def get_employee_history_data(self, employee_id, date_from, date_to):
         date_from = fields.Date.from_string(date_from)
         date_to = fields.Date.from_string(date_to)
         employee = self.env["hr.employee"].browse(employee_id)
 
-        start_dt = datetime.combine(date_from, time.min)
-        end_dt = datetime.combine(date_to, time.max)
-
-        attendance_domain = [
-            ("employee_id", "=", employee.id),
-            ("check_in", "<=", end_dt),
-            "|",
-            ("check_out", ">=", start_dt),
-            ("check_out", "=", False),
-        ]
-        attendances = self.env["hr.attendance"].search(attendance_domain, order="check_in desc")
-
-        stats = {
-            "on_time": 0,
-            "late": 0,
-            "early": 0,
-            "no_clock_in": 0,
-            "no_clock_out": 0,
-            "absent": 0,
-            "day_off": 0,
-            "time_off": 0,
-            "next_workdays": 0,
-        }
-
-        rows = []
-        for att in attendances:
-            work_date = fields.Datetime.to_datetime(att.check_in).date() if att.check_in else fields.Date.today()
-            bounds = self._get_calendar_bounds(att.employee_id, work_date)
-            flags = self._classify_attendance(att, bounds)
-
-            stats["on_time"] += 1 if flags["on_time"] else 0
-            stats["late"] += 1 if flags["late"] else 0
-            stats["early"] += 1 if flags["early"] else 0
-            stats["no_clock_in"] += 1 if flags["no_clock_in"] else 0
-            stats["no_clock_out"] += 1 if flags["no_clock_out"] else 0
-            rows.append({
-                "id": att.id,
-                "check_in": fields.Datetime.to_string(att.check_in) if att.check_in else None,
-                "check_out": fields.Datetime.to_string(att.check_out) if att.check_out else None,
-                "worked_hours": att.worked_hours,
-                "status": "on_time" if flags["on_time"] else "late" if flags["late"] else "early" if flags["early"] else "no_clock_out" if flags["no_clock_out"] else "",
-            })
-
-        stats["day_off"] = self._count_day_offs(date_from, date_to)
-        time_off_employees = self._employees_on_time_off(date_from, date_to, employee_ids=[employee.id])
-        stats["time_off"] = len(time_off_employees)
-
         today = fields.Date.today()
-        absent_end = min(date_to, today)
-        time_off_days = self._employee_leave_days(employee, date_from, absent_end)
-        for work_date in self._daterange(date_from, absent_end):
-            bounds = self._get_calendar_bounds(employee, work_date)
-            if not bounds:
-                continue
-            if work_date in time_off_days:
-                continue
+        stats = self._get_history_stats(employee, date_from, date_to, today)
+        stats["day_off"] = self._count_day_offs(date_from, date_to)
+        stats["next_workdays"] = 0
 
-            day_start = datetime.combine(work_date, time.min)
-            day_end = datetime.combine(work_date, time.max)
-            has_attendance = any(
-                att.check_in <= day_end and (att.check_out or day_end) >= day_start
-                for att in attendances
-            )
-            if not has_attendance:
-                stats["absent"] += 1
+        daily_rows = self.env["km.hr.attendance.daily"].search([
+            ("employee_id", "=", employee.id),
+            ("date", ">=", date_from),
+            ("date", "<=", date_to),
+            ("attendance_id", "!=", False),
+        ], order="first_check_in desc")
 
         future_start = max(today, date_from)
-        time_off_future = self._employee_leave_days(employee, future_start, date_to)
+        time_off_days = self._get_leave_days_map([employee.id], future_start, date_to)[employee.id]
         for work_date in self._daterange(future_start, date_to):
             bounds = self._get_calendar_bounds(employee, work_date)
             if not bounds:
                 continue
-            if work_date in time_off_future:
+            if work_date in time_off_days:
                 continue
             stats["next_workdays"] += 1
 
         return {
             "employee": {"id": employee.id, "name": employee.name},
             "stats": stats,
-            "attendances": rows,
+            "attendances": [self._prepare_daily_row(row) for row in daily_rows],
             "date_from": fields.Date.to_string(date_from),
             "date_to": fields.Date.to_string(date_to),
         }
@@ -0,0 +1,89 @@
+from dateutil.relativedelta import relativedelta
+from psycopg2.extras import execute_values
+
+from odoo import api, fields, models
+
+
+class KmHrAttendanceMonthly(models.Model):
+    _name = "km.hr.attendance.monthly"
+    _description = "KM Monthly Attendance Summary"
+    _order = "month desc, employee_id"
+
+    employee_id = fields.Many2one(
+        "hr.employee", string="Employee", required=True, index=True, ondelete="cascade",
+    )
+    month = fields.Date(string="Month", required=True, index=True, help="First day of the summarized month")
+    on_time = fields.Integer(string="On Time")
+    late = fields.Integer(string="Late")
+    early = fields.Integer(string="Early Leave")
+    no_clock_out = fields.Integer(string="No Clock Out")
+    absent = fields.Integer(string="Absent")
+    leave_days = fields.Integer(string="Leave Days")
+
+    _sql_constraints = [
+        ("employee_month_uniq", "unique(employee_id, month)",
+         "Only one monthly attendance summary per employee and month is allowed."),
+    ]
+
+    STAT_FIELDS = ("on_time", "late", "early", "no_clock_out", "absent")
+
+    @api.model
+    def _invalidate(self, employee_days):
+        """Drop the summaries covering the given (employee_id, date) pairs so
+        they are rebuilt from the daily table on the next read."""
+        keys = {(employee_id, work_date.replace(day=1)) for employee_id, work_date in employee_days}
+        if not keys:
+            return
+        summaries = self.search([
+            ("employee_id", "in", list({employee_id for employee_id, _month in keys})),
+            ("month", "in", list({month for _employee_id, month in keys})),
+        ])
+        summaries.filtered(lambda summary: (summary.employee_id.id, summary.month) in keys).unlink()
+
+    @api.model
+    def _get_summaries(self, employee, months):
+        """Return the summaries of an employee for the given month starts,
+        building the missing ones with a single grouped read of the daily table.
+
+        The missing rows are inserted with ON CONFLICT DO NOTHING, so two
+        dashboard loads building the same month do not fail on the unique
+        constraint."""
+        summaries = self.search([("employee_id", "=", employee.id), ("month", "in", months)])
+        missing = set(months) - set(summaries.mapped("month"))
+        if not missing:
+            return summaries
+
+        values = {
+            month: {"employee_id": employee.id, "month": month, "leave_days": 0, **dict.fromkeys(self.STAT_FIELDS, 0)}
+            for month in missing
+        }
+        groups = self.env["km.hr.attendance.daily"]._read_group(
+            [
+                ("employee_id", "=", employee.id),
+                ("date", ">=", min(missing)),
+                ("date", "<", max(missing) + relativedelta(months=1)),
+            ],
+            ["date:month", "status", "is_late", "is_early", "is_leave"],
+            ["__count"],
+        )
+        for month, status, is_late, is_early, is_leave, count in groups:
+            month_values = values.get(month)
+            if month_values is None:
+                continue
+            if status in ("on_time", "no_clock_out", "absent"):
+                month_values[status] += count
+            month_values["late"] += count if is_late else 0
+            month_values["early"] += count if is_early else 0
+            month_values["leave_days"] += count if is_leave else 0
+
+        columns = ("employee_id", "month", "leave_days") + self.STAT_FIELDS
+        now = fields.Datetime.now()
+        execute_values(self.env.cr._obj, """
+            INSERT INTO km_hr_attendance_monthly ({columns}, create_uid, create_date, write_uid, write_date)
+            VALUES %s
+            ON CONFLICT (employee_id, month) DO NOTHING
+        """.format(columns=", ".join(columns)), [
+            tuple(month_values[column] for column in columns) + (self.env.uid, now, self.env.uid, now)
+            for month_values in values.values()
+        ])
+        return self.search([("employee_id", "=", employee.id), ("month", "in", months)])
@@ -0,0 +1,33 @@
+from odoo import api, models
+
+
+class HrAttendance(models.Model):
+    _inherit = "hr.attendance"
+
+    def _get_daily_keys(self):
+        dashboard = self.env["km.hr.attendance.dashboard"]
+        return {
+            (att.employee_id.id, dashboard._get_local_date(att.employee_id, att.check_in))
+            for att in self
+            if att.employee_id and att.check_in
+        }
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        records = super().create(vals_list)
+        self.env["km.hr.attendance.daily"].sudo()._refresh_days(records._get_daily_keys())
+        return records
+
+    def write(self, vals):
+        if not {"employee_id", "check_in", "check_out"} & set(vals):
+            return super().write(vals)
+        keys = self._get_daily_keys()
+        res = super().write(vals)
+        self.env["km.hr.attendance.daily"].sudo()._refresh_days(keys | self._get_daily_keys())
+        return res
+
+    def unlink(self):
+        keys = self._get_daily_keys()
+        res = super().unlink()
+        self.env["km.hr.attendance.daily"].sudo()._refresh_days(keys)
+        return res
@@ -0,0 +1,27 @@
+import logging
+
+import psycopg2
+
+from odoo import models
+from odoo.tools.sql import create_index, index_exists
+
+_logger = logging.getLogger(__name__)
+
+
+class HrEmployee(models.Model):
+    _inherit = "hr.employee"
+
+    def init(self):
+        """Back the dashboard name search (``name ilike``) with a pg_trgm GIN
+        index; skipped with a warning when the extension is not available."""
+        super().init()
+        indexname = "hr_employee_name_trgm_km_idx"
+        if index_exists(self.env.cr, indexname):
+            return
+        try:
+            with self.env.cr.savepoint():
+                self.env.cr.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        except psycopg2.Error:
+            _logger.warning("pg_trgm is not available, employee name search will not be indexed.")
+            return
+        create_index(self.env.cr, indexname, self._table, ["name gin_trgm_ops"], method="gin")
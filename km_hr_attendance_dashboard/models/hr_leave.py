@@ -0,0 +1,38 @@
+from odoo import api, models
+
+
+class HrLeave(models.Model):
+    _inherit = "hr.leave"
+
+    def _get_daily_keys(self):
+        dashboard = self.env["km.hr.attendance.dashboard"]
+        return {
+            (leave.employee_id.id, day)
+            for leave in self
+            if leave.employee_id and leave.request_date_from and leave.request_date_to
+            for day in dashboard._daterange(leave.request_date_from, leave.request_date_to)
+        }
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        records = super().create(vals_list)
+        validated = records.filtered(lambda leave: leave.state == "validate")
+        self.env["km.hr.attendance.daily"].sudo()._refresh_days(validated._get_daily_keys())
+        return records
+
+    def write(self, vals):
+        tracked = {"state", "employee_id", "request_date_from", "request_date_to", "date_from", "date_to"}
+        if not tracked & set(vals):
+            return super().write(vals)
+        was_validated = self.filtered(lambda leave: leave.state == "validate")
+        keys = was_validated._get_daily_keys()
+        res = super().write(vals)
+        keys |= self.filtered(lambda leave: leave.state == "validate")._get_daily_keys()
+        self.env["km.hr.attendance.daily"].sudo()._refresh_days(keys)
+        return res
+
+    def unlink(self):
+        keys = self.filtered(lambda leave: leave.state == "validate")._get_daily_keys()
+        res = super().unlink()
+        self.env["km.hr.attendance.daily"].sudo()._refresh_days(keys)
+        return res
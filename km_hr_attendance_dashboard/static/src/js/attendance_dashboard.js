@@ -1,8 +1,13 @@
 /** @odoo-module **/
 
-import { Component, onWillStart, useState } from "@odoo/owl";
+import { Component, onWillStart, onWillUnmount, useState } from "@odoo/owl";
 import { registry } from "@web/core/registry";
 import { useService } from "@web/core/utils/hooks";
+import { useDebounced } from "@web/core/utils/timing";
+
+const PAGE_LIMIT = 80;
+const SEARCH_DEBOUNCE_MS = 300;
+const BUS_NOTIFICATION = "km_attendance_dashboard/update";
 
 class AttendanceDashboard extends Component {
     static template = "km_hr_attendance_dashboard.AttendanceDashboard";
@@ -10,6 +15,7 @@ class AttendanceDashboard extends Component {
     setup() {
         this.orm = useService("orm");
         this.action = useService("action");
+        this.busService = useService("bus_service");
 
         const today = this._toDateInputValue(new Date());
         const saved = this._loadState();
@@ -17,6 +23,7 @@ class AttendanceDashboard extends Component {
 
         this.state = useState({
             loading: false,
+            statsLoading: false,
             rangeMode: urlState.rangeMode ?? saved.rangeMode ?? false,
             date: urlState.date || saved.date || today,
             dateFrom: urlState.dateFrom || saved.dateFrom || today,
@@ -24,13 +31,24 @@ class AttendanceDashboard extends Component {
             searchText: urlState.searchText ?? saved.searchText ?? "",
             stats: {},
             attendances: [],
+            offset: 0,
+            limit: PAGE_LIMIT,
+            total: 0,
             sortBy: saved.sortBy || "employee",
             sortDir: saved.sortDir || "asc",
         });
 
+        this.debouncedLoadData = useDebounced(() => this.loadData(), SEARCH_DEBOUNCE_MS);
+
         onWillStart(async () => {
             await this.loadData();
         });
+
+        this._onBusUpdate = this._onBusUpdate.bind(this);
+        this.busService.subscribe(BUS_NOTIFICATION, this._onBusUpdate);
+        onWillUnmount(() => {
+            this.busService.unsubscribe(BUS_NOTIFICATION, this._onBusUpdate);
+        });
     }
 
     _toDateInputValue(date) {
@@ -40,22 +58,55 @@ class AttendanceDashboard extends Component {
         return `${year}-${month}-${day}`;
     }
 
+    _getRange() {
+        return {
+            dateFrom: this.state.rangeMode ? this.state.dateFrom : this.state.date,
+            dateTo: this.state.rangeMode ? this.state.dateTo : this.state.date,
+        };
+    }
+
     async loadData() {
+        this.state.offset = 0;
+        await Promise.all([this.loadStats(), this.loadRows()]);
+        this._saveState();
+        this._updateUrl();
+    }
+
+    async loadStats() {
+        this.state.statsLoading = true;
+        try {
+            const { dateFrom, dateTo } = this._getRange();
+            const stats = await this.orm.call(
+                "km.hr.attendance.dashboard",
+                "get_attendance_dashboard_stats",
+                [dateFrom, dateTo, this.state.searchText]
+            );
+            this.state.stats = stats || {};
+        } catch (error) {
+            console.error("Error loading attendance dashboard stats:", error);
+        } finally {
+            this.state.statsLoading = false;
+        }
+    }
+
+    async loadRows() {
         this.state.loading = true;
         try {
-            const dateFrom = this.state.rangeMode ? this.state.dateFrom : this.state.date;
-            const dateTo = this.state.rangeMode ? this.state.dateTo : this.state.date;
+            const { dateFrom, dateTo } = this._getRange();
             const result = await this.orm.call(
                 "km.hr.attendance.dashboard",
                 "get_attendance_dashboard_data",
-                [dateFrom, dateTo, this.state.searchText]
+                [dateFrom, dateTo, this.state.searchText],
+                {
+                    offset: this.state.offset,
+                    limit: this.state.limit,
+                    order: `${this.state.sortBy} ${this.state.sortDir}`,
+                }
             );
-            this.state.stats = result.stats || {};
             this.state.attendances = result.attendances || [];
+            this.state.total = result.total || 0;
             this.state.dateFrom = result.date_from || dateFrom;
             this.state.dateTo = result.date_to || dateTo;
-            this._saveState();
-            this._updateUrl();
         } catch (error) {
             console.error("Error loading attendance dashboard:", error);
         } finally {
@@ -63,6 +114,66 @@ class AttendanceDashboard extends Component {
         }
     }
 
+    _onBusUpdate(payload) {
+        const { dateFrom, dateTo } = this._getRange();
+        if (payload.refresh) {
+            if (payload.date_from <= dateTo && payload.date_to >= dateFrom) {
+                this.loadStats();
+            }
+            return;
+        }
+        for (const delta of payload.deltas || []) {
+            if (delta.date >= dateFrom && delta.date <= dateTo) {
+                this._applyDelta(delta);
+            }
+        }
+    }
+
+    _applyDelta(delta) {
+        const search = this.state.searchText.toLowerCase();
+        if (search && !(delta.employee_name || "").toLowerCase().includes(search)) {
+            return;
+        }
+        for (const [key, diff] of Object.entries(delta.counters || {})) {
+            this.state.stats[key] = (this.state.stats[key] || 0) + diff;
+        }
+        const index = this.state.attendances.findIndex((row) => row.id === delta.id);
+        if (delta.row && index >= 0) {
+            this.state.attendances[index] = delta.row;
+        } else if (delta.row && this.state.offset === 0) {
+            this.state.attendances.unshift(delta.row);
+            this.state.total += 1;
+        } else if (!delta.row && index >= 0) {
+            this.state.attendances.splice(index, 1);
+            this.state.total -= 1;
+        }
+    }
+
+    get pagerLabel() {
+        if (!this.state.total) return "0";
+        const first = this.state.offset + 1;
+        const last = Math.min(this.state.offset + this.state.limit, this.state.total);
+        return `${first}-${last} / ${this.state.total}`;
+    }
+
+    get hasPrevPage() {
+        return this.state.offset > 0;
+    }
+
+    get hasNextPage() {
+        return this.state.offset + this.state.limit < this.state.total;
+    }
+
+    onPrevPage() {
+        this.state.offset = Math.max(0, this.state.offset - this.state.limit);
+        this.loadRows();
+    }
+
+    onNextPage() {
+        this.state.offset += this.state.limit;
+        this.loadRows();
+    }
+
     onToggleRangeMode() {
         this.state.rangeMode = !this.state.rangeMode;
         if (!this.state.rangeMode) {
@@ -95,7 +206,7 @@ class AttendanceDashboard extends Component {
 
     onSearchChange(ev) {
         this.state.searchText = ev.target.value.trim();
-        this.loadData();
+        this.debouncedLoadData();
     }
 
     _parseUtcDate(dateStr) {
@@ -149,42 +260,12 @@ class AttendanceDashboard extends Component {
             this.state.sortBy = column;
             this.state.sortDir = "asc";
         }
+        this.state.offset = 0;
+        this.loadRows();
         this._saveState();
         this._updateUrl();
     }
 
-    get sortedAttendances() {
-        const data = [...this.state.attendances];
-        const dir = this.state.sortDir === "asc" ? 1 : -1;
-        const by = this.state.sortBy;
-
-        return data.sort((a, b) => {
-            const valA = this._getSortValue(a, by);
-            const valB = this._getSortValue(b, by);
-            if (valA < valB) return -1 * dir;
-            if (valA > valB) return 1 * dir;
-            return 0;
-        });
-    }
-
-    _getSortValue(row, by) {
-        switch (by) {
-            case "date":
-                return row.check_in_date || "";
-            case "check_in":
-                return row.check_in || "";
-            case "check_out":
-                return row.check_out || "";
-            case "worked_hours":
-                return row.worked_hours || 0;
-            case "status":
-                return row.status || "";
-            case "employee":
-            default:
-                return (row.employee_name || "").toLowerCase();
-        }
-    }
-
     openAttendanceForm(attendanceId) {
         this.action.doAction({
             type: 'ir.actions.act_window',
@@ -204,8 +285,7 @@ class AttendanceDashboard extends Component {
     }
 
     _saveState() {
-        const dateFrom = this.state.rangeMode ? this.state.dateFrom : this.state.date;
-        const dateTo = this.state.rangeMode ? this.state.dateTo : this.state.date;
+        const { dateFrom, dateTo } = this._getRange();
         const payload = {
             rangeMode: this.state.rangeMode,
             date: this.state.date,
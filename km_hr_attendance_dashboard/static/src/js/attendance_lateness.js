@@ -0,0 +1,103 @@
+/** @odoo-module **/
+
+import { Component, onMounted, onWillStart, onWillUnmount, useRef, useState } from "@odoo/owl";
+import { loadBundle } from "@web/core/assets";
+import { registry } from "@web/core/registry";
+import { useService } from "@web/core/utils/hooks";
+
+class AttendanceLateness extends Component {
+    static template = "km_hr_attendance_dashboard.AttendanceLateness";
+
+    setup() {
+        this.orm = useService("orm");
+        this.canvasRef = useRef("chart");
+        this.chart = null;
+
+        const today = new Date();
+        const from = new Date(today.getFullYear(), today.getMonth() - 2, 1);
+
+        this.state = useState({
+            loading: false,
+            dateFrom: this._toDateInputValue(from),
+            dateTo: this._toDateInputValue(today),
+            metric: "p90_minutes",
+            rows: [],
+        });
+
+        onWillStart(async () => {
+            await loadBundle("web.chartjs_lib");
+            await this.loadData();
+        });
+        onMounted(() => this.renderChart());
+        onWillUnmount(() => this.chart?.destroy());
+    }
+
+    _toDateInputValue(date) {
+        const year = date.getFullYear();
+        const month = String(date.getMonth() + 1).padStart(2, "0");
+        const day = String(date.getDate()).padStart(2, "0");
+        return `${year}-${month}-${day}`;
+    }
+
+    async loadData() {
+        this.state.loading = true;
+        try {
+            this.state.rows = await this.orm.call(
+                "km.hr.attendance.analytics",
+                "get_lateness_statistics",
+                [this.state.dateFrom, this.state.dateTo]
+            );
+        } catch (error) {
+            console.error("Error loading lateness statistics:", error);
+        } finally {
+            this.state.loading = false;
+        }
+    }
+
+    async onFilterChange() {
+        await this.loadData();
+        this.renderChart();
+    }
+
+    onMetricChange(ev) {
+        this.state.metric = ev.target.value;
+        this.renderChart();
+    }
+
+    _getChartData() {
+        const weeks = [...new Set(this.state.rows.map((row) => row.week))].sort();
+        const byDepartment = {};
+        for (const row of this.state.rows) {
+            const label = row.department_name || "-";
+            byDepartment[label] = byDepartment[label] || {};
+            // Several schedules in one department/week: keep the worst value
+            const current = byDepartment[label][row.week] || 0;
+            byDepartment[label][row.week] = Math.max(current, row[this.state.metric]);
+        }
+        return {
+            labels: weeks,
+            datasets: Object.entries(byDepartment).map(([label, values]) => ({
+                label,
+                data: weeks.map((week) => values[week] ?? null),
+                spanGaps: true,
+            })),
+        };
+    }
+
+    renderChart() {
+        if (!this.canvasRef.el) return;
+        this.chart?.destroy();
+        this.chart = new Chart(this.canvasRef.el, {
+            type: "line",
+            data: this._getChartData(),
+            options: {
+                maintainAspectRatio: false,
+                scales: { y: { beginAtZero: true, title: { display: true, text: "Minutes late" } } },
+            },
+        });
+    }
+}
+
+registry.category("actions").add("km_attendance_lateness", AttendanceLateness);
+
+export default AttendanceLateness;
@@ -0,0 +1,48 @@
+from odoo import api, models, tools
+
+
+class AccountJournal(models.Model):
+    _inherit = 'account.journal'
+
+    @api.model
+    @tools.ormcache('journal_type', 'company_id', 'with_default', 'stamp')
+    def _get_book_account_ids(self, journal_type, company_id, with_default=False, stamp=None):
+        """ Return the ids of the payment accounts of the journals of a type
+        ('bank' or 'cash') of a company, and of their default accounts when
+        with_default is set. The result is cached for the stamp of the
+        journals of the company, see _get_book_stamp.
+        """
+        journals = self.sudo().search([('type', '=', journal_type), ('company_id', '=', company_id)])
+        accounts = journals.outbound_payment_method_line_ids.payment_account_id \
+            | journals.inbound_payment_method_line_ids.payment_account_id
+        if with_default:
+            accounts |= journals.default_account_id
+        return tuple(sorted(accounts.ids))
+
+    @api.model
+    def _get_book_stamp(self, company_id):
+        """ Return a stamp of the journals and payment method lines of a
+        company that changes whenever one of them is created, written or
+        deleted, so that the cached accounts are never stale without having
+        to clear the caches of the registry
+        """
+        self.env['account.journal'].flush_model()
+        self.env['account.payment.method.line'].flush_model()
+        self.env.cr.execute("""
+            SELECT COUNT(DISTINCT j.id), MAX(j.write_date), COUNT(l.id), MAX(l.write_date)
+            FROM account_journal j
+            LEFT JOIN account_payment_method_line l ON l.journal_id = j.id
+            WHERE j.company_id = %s
+        """, [company_id])
+        return self.env.cr.fetchone()
+
+    @api.model
+    def _get_book_accounts(self, journal_type, with_default=False):
+        """ Return the accounts of the bank or cash book of the allowed
+        companies
+        """
+        account_ids = []
+        for company in self.env.companies:
+            account_ids += self._get_book_account_ids(
+                journal_type, company.id, with_default, self._get_book_stamp(company.id))
+        return self.env['account.account'].browse(list(dict.fromkeys(account_ids)))
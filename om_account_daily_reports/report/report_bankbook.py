@@ -68,10 +68,14 @@ class ReportBankBook(models.AbstractModel):
             cr.execute(sql, params)
             for row in cr.dictfetchall():
                 move_lines[row.pop('account_id')].append(row)
+        initial_balances = {
+            account_id: lines[0]['balance'] if lines else 0.0
+            for account_id, lines in move_lines.items()
+        }
 
-        sql_sort = 'l.date, l.move_id'
+        sql_sort = 'l.date, l.move_id, l.id'
         if sortby == 'sort_journal_partner':
-            sql_sort = 'j.code, p.name, l.move_id'
+            sql_sort = 'j.code, p.name, l.move_id, l.id'
 
         # Prepare SQL query based on selected parameters from wizard
         tables, where_clause, where_params = MoveLine._query_get()
@@ -80,22 +84,15 @@ class ReportBankBook(models.AbstractModel):
             wheres.append(where_clause.strip())
         filters = " AND ".join(wheres).replace('account_move_line__move_id', 'm').replace('account_move_line', 'l')
 
-        if not accounts:
-            journals = self.env['account.journal'].search([('type', '=', 'bank')])
-            accounts = self.env['account.account']
-            for journal in journals:
-                for acc_out in journal.outbound_payment_method_line_ids:
-                    if acc_out.payment_account_id:
-                        accounts += acc_out.payment_account_id
-                for acc_in in journal.inbound_payment_method_line_ids:
-                    if acc_in.payment_account_id:
-                        accounts += acc_in.payment_account_id
-
+        # The running balance of every account is computed by the window in
+        # the same order as the lines are printed
         sql = ('''
-            SELECT l.id AS lid, l.account_id AS account_id, l.date AS ldate, j.code AS lcode, 
-                   l.currency_id, l.amount_currency, l.ref AS lref, l.name AS lname, 
-                   COALESCE(l.debit, 0) AS debit, COALESCE(l.credit, 0) AS credit, 
-                   COALESCE(SUM(l.debit), 0) - COALESCE(SUM(l.credit), 0) AS balance,
+            SELECT l.id AS lid, l.account_id AS account_id, l.date AS ldate, j.code AS lcode,
+                   l.currency_id, l.amount_currency, l.ref AS lref, l.name AS lname,
+                   COALESCE(l.debit, 0) AS debit, COALESCE(l.credit, 0) AS credit,
+                   SUM(COALESCE(l.debit, 0) - COALESCE(l.credit, 0)) OVER (
+                       PARTITION BY l.account_id ORDER BY ''' + sql_sort + '''
+                       ROWS BETWEEN UNBOUNDED PRECEDING AND CURRENT ROW) AS balance,
                    m.name AS move_name, c.symbol AS currency_code, p.name AS partner_name
             FROM account_move_line l
             JOIN account_move m ON (l.move_id = m.id)
@@ -103,9 +100,7 @@ class ReportBankBook(models.AbstractModel):
             LEFT JOIN res_partner p ON (l.partner_id = p.id)
             JOIN account_journal j ON (l.journal_id = j.id)
             JOIN account_account acc ON (l.account_id = acc.id)
-            WHERE l.account_id IN %s ''' + filters + ''' 
-            GROUP BY l.id, l.account_id, l.date, j.code, l.currency_id, l.amount_currency, 
-                     l.ref, l.name, m.name, c.symbol, p.name 
+            WHERE l.account_id IN %s ''' + filters + '''
             ORDER BY ''' + sql_sort
                )
 
@@ -113,11 +108,9 @@ class ReportBankBook(models.AbstractModel):
         cr.execute(sql, params)
 
         for row in cr.dictfetchall():
-            balance = 0
-            for line in move_lines.get(row['account_id']):
-                balance += line['debit'] - line['credit']
-            row['balance'] += balance
-            move_lines[row.pop('account_id')].append(row)
+            account_id = row.pop('account_id')
+            row['balance'] += initial_balances[account_id]
+            move_lines[account_id].append(row)
 
         # Calculate the debit, credit and balance for accounts
         account_res = []
@@ -158,16 +151,7 @@ class ReportBankBook(models.AbstractModel):
 
         accounts = self.env['account.account'].browse(data['form']['account_ids'])
         if not accounts:
-            journals = self.env['account.journal'].search([('type', '=', 'bank')])
-            accounts = self.env['account.account']
-            for journal in journals:
-                for acc_out in journal.outbound_payment_method_line_ids:
-                    if acc_out.payment_account_id:
-                        accounts += acc_out.payment_account_id
-                for acc_in in journal.inbound_payment_method_line_ids:
-                    if acc_in.payment_account_id:
-                        accounts += acc_in.payment_account_id
-
+            accounts = self.env['account.journal']._get_book_accounts('bank')
         record = self.with_context(data['form'].get('comparison_context', {}))._get_account_move_entry(
             accounts, init_balance, sortby, display_account
         )
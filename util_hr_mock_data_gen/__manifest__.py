@@ -2,7 +2,7 @@
     'name': 'HR Mock Data Generator',
     'version': '18.0.1.0.0',
     'category': 'Human Resources/Utilities',
-    'summary': 'Generate mock attendance data for testing',
+    'summary': 'Generate mock attendance data and benchmark datasets for testing',
     'description': """
         Generate fake attendance data with customizable parameters:
         - Select employees
@@ -10,6 +10,13 @@
         - Control late percentage
         - Control overtime percentage
         - Respect employee work schedules
+
+        Generate full synthetic datasets for performance benchmarking from a
+        JSON profile (data/profiles) and a seed: employees, contracts, leaves,
+        attendance, overtime, invoices, payments, journal entries, assets and
+        budgets. Sections of modules that are not installed are skipped.
+
+            odoo-bin mock_dataset -d <database> --profile small --seed 42
     """,
     'depends': [
         'hr',
@@ -0,0 +1 @@
+from . import mock_dataset
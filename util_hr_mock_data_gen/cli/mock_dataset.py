@@ -0,0 +1,50 @@
+import argparse
+import json
+import sys
+from pathlib import Path
+
+import odoo
+from odoo.cli import Command
+from odoo.tools import config
+
+
+class MockDataset(Command):
+    """Generate a synthetic benchmark dataset from a JSON profile"""
+    name = 'mock_dataset'
+
+    def run(self, cmdargs):
+        parser = argparse.ArgumentParser(
+            prog=f'{Path(sys.argv[0]).name} {self.name}',
+            description=self.__doc__,
+        )
+        parser.add_argument('-c', '--config', help='Odoo configuration file')
+        parser.add_argument('-d', '--database', help='Database to fill')
+        parser.add_argument('--profile', default='small',
+                            help='Name of a built-in profile or path to a JSON profile (default: small)')
+        parser.add_argument('--seed', type=int, help='Random seed, generated when omitted')
+        parser.add_argument('--company', type=int, help='ID of the company to generate the data for')
+        parser.add_argument('--dry-run', action='store_true',
+                            help='Roll back instead of committing after every batch')
+        args = parser.parse_args(cmdargs)
+
+        odoo_args = []
+        if args.config:
+            odoo_args += ['-c', args.config]
+        if args.database:
+            odoo_args += ['-d', args.database]
+        config.parse_config(odoo_args)
+        dbname = config['db_name']
+        if not dbname:
+            parser.error('a database is required, use -d or set db_name in the configuration file')
+
+        registry = odoo.modules.registry.Registry(dbname)
+        with registry.cursor() as cr:
+            env = odoo.api.Environment(cr, odoo.SUPERUSER_ID, {})
+            if args.company:
+                env = env(context=dict(env.context, allowed_company_ids=[args.company]))
+            result = env['util.dataset.generator'].generate_dataset(
+                args.profile, seed=args.seed, commit=not args.dry_run,
+            )
+            if args.dry_run:
+                cr.rollback()
+        print(json.dumps(result, indent=4))
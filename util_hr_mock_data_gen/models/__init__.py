@@ -1 +1,2 @@
 from . import attendance_generator
+from . import dataset_generator
@@ -20,20 +20,36 @@ class AttendanceGenerator(models.AbstractModel):
             'job': emp.job_id.name if emp.job_id else '',
         } for emp in employees]
 
-    def _is_holiday(self, date, employee=None):
-        """Check if date is a public holiday"""
-        domain = [
-            ('date_from', '<=', datetime.combine(date, time.max)),
-            ('date_to', '>=', datetime.combine(date, time.min)),
-        ]
-        if employee:
-            domain.append('|')
-            domain.append(('resource_id', '=', False))
-            domain.append(('resource_id', '=', employee.resource_id.id))
-        else:
-            domain.append(('resource_id', '=', False))
-        
-        return bool(self.env['resource.calendar.leaves'].search(domain, limit=1))
+    BATCH_SIZE = 1000
+
+    def _get_holiday_dates(self, date_from, date_to, employees):
+        """Preload public holidays and employee-specific leaves of the period
+
+        :return: set of (resource_id or False, date)
+        """
+        leaves = self.env['resource.calendar.leaves'].search([
+            ('date_from', '<=', datetime.combine(date_to, time.max)),
+            ('date_to', '>=', datetime.combine(date_from, time.min)),
+            '|',
+            ('resource_id', '=', False),
+            ('resource_id', 'in', employees.resource_id.ids),
+        ])
+        holidays = set()
+        for leave in leaves:
+            start = max(leave.date_from.date(), date_from)
+            end = min(leave.date_to.date(), date_to)
+            for day in self._daterange(start, end):
+                holidays.add((leave.resource_id.id or False, day))
+        return holidays
+
+    def _get_existing_attendance_dates(self, date_from, date_to, employees):
+        """Preload the (employee_id, date) pairs that already have an attendance"""
+        attendances = self.env['hr.attendance'].search_fetch([
+            ('employee_id', 'in', employees.ids),
+            ('check_in', '>=', datetime.combine(date_from, time.min)),
+            ('check_in', '<', datetime.combine(date_to + timedelta(days=1), time.min)),
+        ], ['employee_id', 'check_in'])
+        return {(att.employee_id.id, att.check_in.date()) for att in attendances}
 
     def _daterange(self, date_from, date_to):
         """Generate date range"""
@@ -42,6 +58,41 @@ class AttendanceGenerator(models.AbstractModel):
             yield current
             current += timedelta(days=1)
 
+    def _prepare_attendance_vals(self, rng, employee, work_date, params):
+        """Build the values of one mock attendance with the employee's random generator"""
+        randomize = params['randomize']
+        variance_minutes = params['variance_minutes']
+
+        # Determine if this day should be late / have overtime
+        is_late = randomize and (rng.randint(0, 100) < params['late_percentage'])
+        has_overtime = randomize and (rng.randint(0, 100) < params['overtime_percentage'])
+
+        # Generate check-in time
+        check_in_dt = datetime.combine(work_date, time(params['check_in_hour'], params['check_in_minute']))
+        if is_late:
+            # Add minutes to make late (5-60 minutes)
+            variance = rng.randint(5, 60)
+        else:
+            # Subtract minutes to make early (never late when not marked as late)
+            variance = rng.randint(-variance_minutes, -1) if randomize else 0
+        check_in_dt = check_in_dt + timedelta(minutes=variance)
+
+        # Generate check-out time
+        check_out_dt = datetime.combine(work_date, time(params['check_out_hour'], params['check_out_minute']))
+        if has_overtime:
+            overtime_minutes = rng.randint(30, 180)  # 0.5 to 3 hours
+            check_out_dt = check_out_dt + timedelta(minutes=overtime_minutes)
+
+        # Apply variance to checkout
+        checkout_variance = rng.randint(-variance_minutes, variance_minutes) if randomize else 0
+        check_out_dt = check_out_dt + timedelta(minutes=checkout_variance)
+
+        return {
+            'employee_id': employee.id,
+            'check_in': check_in_dt,
+            'check_out': check_out_dt,
+        }
+
     @api.model
     def generate_attendance(self, params):
         """Generate mock attendance data
@@ -59,19 +110,29 @@ class AttendanceGenerator(models.AbstractModel):
             - randomize: boolean to enable randomization
             - variance_minutes: variance in check-in/out times
             - delete_existing: boolean to delete existing attendance in period
+            - seed: random seed, the same seed and parameters always produce
+              the same data for an employee (a new one is picked if empty)
+
+        Holidays and existing attendances are preloaded once, every employee
+        gets its own random generator seeded from (seed, employee id) so the
+        result does not depend on how the client splits employees into calls,
+        and records are created in batches of BATCH_SIZE.
         """
         try:
             employee_ids = params.get('employee_ids', [])
             date_from = fields.Date.from_string(params.get('date_from'))
             date_to = fields.Date.from_string(params.get('date_to'))
-            check_in_hour = params.get('check_in_hour', 8)
-            check_in_minute = params.get('check_in_minute', 0)
-            check_out_hour = params.get('check_out_hour', 17)
-            check_out_minute = params.get('check_out_minute', 0)
-            late_percentage = params.get('late_percentage', 10)
-            overtime_percentage = params.get('overtime_percentage', 20)
-            randomize = params.get('randomize', True)
-            variance_minutes = params.get('variance_minutes', 30)
+            seed = params.get('seed') or random.randrange(1, 10 ** 9)
+            values_params = {
+                'check_in_hour': params.get('check_in_hour', 8),
+                'check_in_minute': params.get('check_in_minute', 0),
+                'check_out_hour': params.get('check_out_hour', 17),
+                'check_out_minute': params.get('check_out_minute', 0),
+                'late_percentage': params.get('late_percentage', 10),
+                'overtime_percentage': params.get('overtime_percentage', 20),
+                'randomize': params.get('randomize', True),
+                'variance_minutes': params.get('variance_minutes', 30),
+            }
             delete_existing = params.get('delete_existing', False)
             
             if not employee_ids:
@@ -90,76 +151,41 @@ class AttendanceGenerator(models.AbstractModel):
                     ('check_in', '<=', datetime.combine(date_to, time.max)),
                 ])
                 existing.unlink()
+
+            holidays = self._get_holiday_dates(date_from, date_to, employees)
+            existing_dates = self._get_existing_attendance_dates(date_from, date_to, employees)
             
             generated_count = 0
             skipped_count = 0
+            vals_list = []
             
             for employee in employees:
+                rng = random.Random(f'{seed}-{employee.id}')
+                resource_id = employee.resource_id.id
                 for work_date in self._daterange(date_from, date_to):
-                    # Skip weekends (Saturday=5, Sunday=6)
-                    if work_date.weekday() >= 5:
+                    # Skip weekends (Saturday=5, Sunday=6), holidays and days with attendance
+                    if (work_date.weekday() >= 5
+                            or (False, work_date) in holidays
+                            or (resource_id, work_date) in holidays
+                            or (employee.id, work_date) in existing_dates):
                         skipped_count += 1
                         continue
-                    
-                    # Skip holidays
-                    if self._is_holiday(work_date, employee):
-                        skipped_count += 1
-                        continue
-                    
-                    # Check if attendance already exists for this employee on this date
-                    existing_attendance = self.env['hr.attendance'].search([
-                        ('employee_id', '=', employee.id),
-                        ('check_in', '>=', datetime.combine(work_date, time.min)),
-                        ('check_in', '<', datetime.combine(work_date + timedelta(days=1), time.min)),
-                    ], limit=1)
-                    
-                    if existing_attendance:
-                        skipped_count += 1
-                        continue
-                    
-                    # Determine if this day should be late
-                    is_late = randomize and (random.randint(0, 100) < late_percentage)
-                    
-                    # Determine if this day should have overtime
-                    has_overtime = randomize and (random.randint(0, 100) < overtime_percentage)
-                    
-                    # Generate check-in time
-                    check_in_dt = datetime.combine(work_date, time(check_in_hour, check_in_minute))
-                    
-                    # Apply variance for check-in
-                    if is_late:
-                        # Add minutes to make late (5-60 minutes)
-                        variance = random.randint(5, 60)
-                    else:
-                        # Subtract minutes to make early (never late when not marked as late)
-                        variance = random.randint(-variance_minutes, -1) if randomize else 0
-                    
-                    check_in_dt = check_in_dt + timedelta(minutes=variance)
-                    
-                    # Generate check-out time
-                    check_out_dt = datetime.combine(work_date, time(check_out_hour, check_out_minute))
-                    
-                    # Add overtime if applicable
-                    if has_overtime:
-                        overtime_minutes = random.randint(30, 180)  # 0.5 to 3 hours
-                        check_out_dt = check_out_dt + timedelta(minutes=overtime_minutes)
-                    
-                    # Apply variance to checkout
-                    checkout_variance = random.randint(-variance_minutes, variance_minutes) if randomize else 0
-                    check_out_dt = check_out_dt + timedelta(minutes=checkout_variance)
-                    
-                    # Create attendance record
-                    self.env['hr.attendance'].create({
-                        'employee_id': employee.id,
-                        'check_in': check_in_dt,
-                        'check_out': check_out_dt,
-                    })
-                    generated_count += 1
+
+                    vals_list.append(self._prepare_attendance_vals(rng, employee, work_date, values_params))
+                    if len(vals_list) >= self.BATCH_SIZE:
+                        self.env['hr.attendance'].create(vals_list)
+                        generated_count += len(vals_list)
+                        vals_list = []
+
+            if vals_list:
+                self.env['hr.attendance'].create(vals_list)
+                generated_count += len(vals_list)
             
             return {
                 'success': True,
                 'generated': generated_count,
                 'skipped': skipped_count,
+                'seed': seed,
                 'message': f'Successfully generated {generated_count} attendance records ({skipped_count} days skipped)',
             }
         
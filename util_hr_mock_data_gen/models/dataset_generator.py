@@ -0,0 +1,522 @@
+import json
+import logging
+import os
+import random
+from datetime import datetime, time, timedelta
+
+from psycopg2.extras import execute_values
+
+from odoo import api, fields, models
+from odoo.exceptions import UserError
+from odoo.tools.misc import file_path, split_every
+
+_logger = logging.getLogger(__name__)
+
+FIRST_NAMES = [
+    'Adi', 'Agus', 'Andi', 'Ayu', 'Bambang', 'Budi', 'Citra', 'Dewi', 'Dian', 'Eka',
+    'Fajar', 'Fitri', 'Gilang', 'Hendra', 'Indah', 'Intan', 'Joko', 'Kartika', 'Lestari', 'Maya',
+    'Nanda', 'Nur', 'Putri', 'Rina', 'Rizki', 'Sari', 'Siti', 'Taufik', 'Wahyu', 'Yusuf',
+]
+LAST_NAMES = [
+    'Anggraini', 'Hidayat', 'Kurniawan', 'Lubis', 'Nasution', 'Pratama', 'Purnomo', 'Rahayu',
+    'Santoso', 'Saputra', 'Setiawan', 'Simanjuntak', 'Siregar', 'Sitompul', 'Susanto',
+    'Utami', 'Wibowo', 'Wijaya', 'Wulandari', 'Yulianti',
+]
+
+DEFAULT_PROFILE = {
+    'name': 'default',
+    'date_from': '2025-01-01',
+    'date_to': '2025-01-31',
+    'employees': {'count': 10, 'departments': 2},
+    'contracts': {'wage_min': 5000000, 'wage_max': 20000000},
+    'attendance': {'enabled': True, 'late_percentage': 10, 'overtime_percentage': 20},
+    'leaves': {'per_employee': 0, 'max_days': 3},
+    'overtime': {'per_employee': 0, 'max_hours': 4},
+    'partners': {'count': 10},
+    'invoices': {'count': 0, 'lines': 3, 'payment_ratio': 0.5},
+    'journal_entries': {'count': 0, 'lines': 2},
+    'assets': {'count': 0},
+    'budgets': {'count': 0, 'lines': 10},
+}
+
+
+class DatasetGenerator(models.AbstractModel):
+    _name = 'util.dataset.generator'
+    _description = 'Synthetic Dataset Generator'
+
+    BATCH_SIZE = 1000
+    SQL_BATCH_SIZE = 10000
+    MOCK_PREFIX = 'MOCK'
+
+    # ------------------------------------------------------------
+    # Profiles
+    # ------------------------------------------------------------
+
+    @api.model
+    def get_profiles(self):
+        """List the names of the built-in JSON profiles"""
+        profile_dir = file_path('util_hr_mock_data_gen/data/profiles')
+        return sorted(
+            os.path.splitext(name)[0]
+            for name in os.listdir(profile_dir)
+            if name.endswith('.json')
+        )
+
+    def _load_profile(self, profile):
+        """Resolve a profile given as a dict, a path to a JSON file or the name of
+        a built-in profile, and complete it with the default values"""
+        if isinstance(profile, str):
+            if os.path.isfile(profile):
+                path = profile
+            else:
+                try:
+                    path = file_path(f'util_hr_mock_data_gen/data/profiles/{profile}.json')
+                except FileNotFoundError:
+                    raise UserError(f'Unknown dataset profile "{profile}", available profiles: '
+                                    f'{", ".join(self.get_profiles())}')
+            with open(path, encoding='utf-8') as profile_file:
+                profile = json.load(profile_file)
+
+        values = {}
+        for key, default in DEFAULT_PROFILE.items():
+            if isinstance(default, dict):
+                values[key] = dict(default, **profile.get(key, {}))
+            else:
+                values[key] = profile.get(key, default)
+        values['date_from'] = fields.Date.from_string(values['date_from'])
+        values['date_to'] = fields.Date.from_string(values['date_to'])
+        if values['date_from'] > values['date_to']:
+            raise UserError('Start date must be before end date')
+        return values
+
+    def _random_date(self, rng, profile):
+        span = (profile['date_to'] - profile['date_from']).days
+        return profile['date_from'] + timedelta(days=rng.randint(0, span))
+
+    def _get_rng(self, seed, section):
+        """Every section gets its own generator so that disabling or resizing one
+        section does not change the data generated by the others"""
+        return random.Random(f'{seed}-{section}')
+
+    def _has_model(self, model_name):
+        return model_name in self.env
+
+    def _commit(self, commit):
+        if commit:
+            self.env.cr.commit()
+
+    # ------------------------------------------------------------
+    # HR
+    # ------------------------------------------------------------
+
+    def _generate_employees(self, rng, profile, commit):
+        """Create the departments and employees of the profile"""
+        company = self.env.company
+        departments = self.env['hr.department'].create([
+            {'name': f'{self.MOCK_PREFIX} Department {index + 1}', 'company_id': company.id}
+            for index in range(max(profile['employees']['departments'], 1))
+        ])
+        employees = self.env['hr.employee']
+        vals_list = [{
+            'name': f'{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)} {index + 1:05d}',
+            'department_id': rng.choice(departments).id,
+            'company_id': company.id,
+            'resource_calendar_id': company.resource_calendar_id.id,
+        } for index in range(profile['employees']['count'])]
+        for batch in split_every(self.BATCH_SIZE, vals_list, list):
+            employees |= employees.create(batch)
+            self._commit(commit)
+        return employees
+
+    def _generate_contracts(self, rng, profile, employees, commit):
+        """Create one running contract per employee, linked to the first payroll
+        structure when hr_payroll_community is installed"""
+        if not self._has_model('hr.contract'):
+            return 0
+        Contract = self.env['hr.contract']
+        structure = self._has_model('hr.payroll.structure') and self.env['hr.payroll.structure'].search([], limit=1)
+        wage_min = profile['contracts']['wage_min']
+        wage_max = profile['contracts']['wage_max']
+        count = 0
+        for batch in split_every(self.BATCH_SIZE, employees):
+            vals_list = []
+            for employee in batch:
+                vals = {
+                    'name': f'{self.MOCK_PREFIX} Contract {employee.name}',
+                    'employee_id': employee.id,
+                    'wage': round(rng.uniform(wage_min, wage_max), -3),
+                    'date_start': profile['date_from'] - timedelta(days=rng.randint(30, 1000)),
+                    'resource_calendar_id': employee.resource_calendar_id.id,
+                    'state': 'open',
+                }
+                if structure and 'struct_id' in Contract._fields:
+                    vals['struct_id'] = structure.id
+                vals_list.append(vals)
+            count += len(Contract.create(vals_list))
+            self._commit(commit)
+        return count
+
+    def _generate_leaves(self, rng, profile, employees, commit):
+        """Create validated leaves on distinct working days for every employee"""
+        per_employee = profile['leaves']['per_employee']
+        if not per_employee or not self._has_model('hr.leave'):
+            return 0
+        leave_type = self.env['hr.leave.type'].search([('requires_allocation', '=', 'no')], limit=1)
+        if not leave_type:
+            _logger.warning('No leave type without allocation found, skipping leaves')
+            return 0
+        Leave = self.env['hr.leave'].sudo().with_context(
+            leave_fast_create=True, tracking_disable=True, mail_create_nolog=True, mail_notrack=True,
+        )
+        max_days = max(profile['leaves']['max_days'], 1)
+        count = 0
+        for batch in split_every(max(self.BATCH_SIZE // per_employee, 1), employees):
+            vals_list = []
+            for employee in batch:
+                taken = set()
+                for _index in range(per_employee):
+                    date_from = self._random_date(rng, profile)
+                    while date_from.weekday() >= 5:
+                        date_from += timedelta(days=1)
+                    date_to = date_from + timedelta(days=rng.randint(0, max_days - 1))
+                    days = {date_from + timedelta(days=offset) for offset in range((date_to - date_from).days + 1)}
+                    if days & taken or date_to > profile['date_to']:
+                        continue
+                    taken |= days
+                    vals_list.append({
+                        'name': f'{self.MOCK_PREFIX} Leave',
+                        'employee_id': employee.id,
+                        'holiday_status_id': leave_type.id,
+                        'request_date_from': date_from,
+                        'request_date_to': date_to,
+                    })
+            leaves = Leave.create(vals_list)
+            leaves.action_validate()
+            count += len(leaves)
+            self._commit(commit)
+        return count
+
+    def _generate_attendance(self, seed, profile, employees, commit):
+        """Delegate to the attendance generator with the profile parameters"""
+        params = profile['attendance']
+        if not params.get('enabled') or not employees:
+            return 0
+        generated = 0
+        for batch in split_every(self.BATCH_SIZE, employees.ids, list):
+            result = self.env['util.attendance.generator'].generate_attendance({
+                'employee_ids': batch,
+                'date_from': fields.Date.to_string(profile['date_from']),
+                'date_to': fields.Date.to_string(min(profile['date_to'], fields.Date.today())),
+                'late_percentage': params.get('late_percentage', 10),
+                'overtime_percentage': params.get('overtime_percentage', 20),
+                'seed': seed,
+            })
+            if not result['success']:
+                raise UserError(result['message'])
+            generated += result['generated']
+            self._commit(commit)
+        return generated
+
+    def _generate_overtime(self, rng, profile, employees, commit):
+        """Create approved overtime requests on distinct evenings"""
+        per_employee = profile['overtime']['per_employee']
+        if not per_employee or not self._has_model('hr.overtime'):
+            return 0
+        Overtime = self.env['hr.overtime'].with_context(tracking_disable=True, mail_create_nolog=True)
+        max_hours = max(profile['overtime']['max_hours'], 1)
+        count = 0
+        for batch in split_every(self.BATCH_SIZE, employees):
+            for employee in batch:
+                days = {self._random_date(rng, profile) for _index in range(per_employee)}
+                for work_date in sorted(days):
+                    start = datetime.combine(work_date, time(18, 0))
+                    hours = rng.randint(1, max_hours)
+                    # hr.overtime overrides create() for a single record
+                    Overtime.create({
+                        'employee_id': employee.id,
+                        'date_from': start,
+                        'date_to': start + timedelta(hours=hours),
+                        'duration_type': 'hours',
+                        'duration_value': hours,
+                        'type': 'cash',
+                        'state': 'approved',
+                    })
+                    count += 1
+            self._commit(commit)
+        return count
+
+    # ------------------------------------------------------------
+    # Accounting
+    # ------------------------------------------------------------
+
+    def _get_accounts(self, account_types):
+        return self.env['account.account'].search([
+            *self.env['account.account']._check_company_domain(self.env.company),
+            ('account_type', 'in', account_types),
+            ('deprecated', '=', False),
+        ])
+
+    def _get_journal(self, journal_type):
+        journal = self.env['account.journal'].search([
+            *self.env['account.journal']._check_company_domain(self.env.company),
+            ('type', '=', journal_type),
+        ], limit=1)
+        if not journal:
+            raise UserError(f'No {journal_type} journal found, please install a chart of accounts first')
+        return journal
+
+    def _generate_partners(self, profile, commit):
+        partners = self.env['res.partner']
+        vals_list = [
+            {'name': f'{self.MOCK_PREFIX} Partner {index + 1:05d}', 'is_company': True}
+            for index in range(profile['partners']['count'])
+        ]
+        for batch in split_every(self.BATCH_SIZE, vals_list, list):
+            partners |= partners.create(batch)
+            self._commit(commit)
+        return partners
+
+    def _generate_invoices(self, rng, profile, partners, commit):
+        """Create and post customer invoices, then register payments for a share
+        of them so that receivable lines get reconciled"""
+        params = profile['invoices']
+        if not params['count'] or not partners or not self._has_model('account.move'):
+            return 0, 0
+        journal = self._get_journal('sale')
+        Move = self.env['account.move'].with_context(tracking_disable=True, mail_create_nolog=True)
+        invoice_count = 0
+        payment_count = 0
+        for batch in split_every(self.BATCH_SIZE // 10, range(params['count']), list):
+            vals_list = [{
+                'move_type': 'out_invoice',
+                'journal_id': journal.id,
+                'partner_id': rng.choice(partners).id,
+                'invoice_date': self._random_date(rng, profile),
+                'invoice_line_ids': [
+                    fields.Command.create({
+                        'name': f'{self.MOCK_PREFIX} Service {line + 1}',
+                        'quantity': rng.randint(1, 10),
+                        'price_unit': round(rng.uniform(100000, 5000000), -3),
+                        'tax_ids': [fields.Command.clear()],
+                    })
+                    for line in range(max(params['lines'], 1))
+                ],
+            } for _index in batch]
+            invoices = Move.create(vals_list)
+            invoices.action_post()
+            invoice_count += len(invoices)
+
+            to_pay = invoices.filtered(lambda _invoice: rng.random() < params['payment_ratio'])
+            if to_pay:
+                payments = self.env['account.payment.register'].with_context(
+                    active_model='account.move', active_ids=to_pay.ids,
+                ).create({
+                    'payment_date': max(to_pay.mapped('invoice_date')),
+                    'group_payment': False,
+                })._create_payments()
+                payment_count += len(payments)
+            self._commit(commit)
+        return invoice_count, payment_count
+
+    def _insert_journal_entries(self, rng, profile, commit):
+        """Insert posted miscellaneous entries with raw SQL
+
+        The ORM is far too slow for tens of millions of lines, so moves and
+        their balanced lines are written with multi-row INSERTs, filling the
+        stored columns the reports rely on directly. The daily balances and
+        the ledger version of the accounting reports, when installed, are
+        refreshed after every batch as the ORM hooks would have.
+        """
+        params = profile['journal_entries']
+        if not params['count'] or not self._has_model('account.move'):
+            return 0
+        company = self.env.company
+        journal = self._get_journal('general')
+        accounts = self._get_accounts([
+            'asset_current', 'asset_fixed', 'liability_current', 'income', 'income_other',
+            'expense', 'expense_direct_cost', 'expense_depreciation', 'asset_cash',
+        ]).ids
+        if not accounts:
+            raise UserError('No accounts found, please install a chart of accounts first')
+        currency_id = company.currency_id.id
+        line_count = max(params['lines'], 2)
+        cr = self.env.cr
+        self.env.flush_all()
+        cr.execute(
+            "SELECT COALESCE(MAX(sequence_number), 0) FROM account_move WHERE journal_id = %s AND sequence_prefix = %s",
+            [journal.id, f'{self.MOCK_PREFIX}/'],
+        )
+        sequence = cr.fetchone()[0]
+        now = fields.Datetime.now()
+        uid = self.env.uid
+        inserted = 0
+        for batch in split_every(max(self.SQL_BATCH_SIZE // line_count, 1), range(params['count']), list):
+            move_rows = []
+            for _index in batch:
+                sequence += 1
+                move_rows.append((
+                    f'{self.MOCK_PREFIX}/{sequence:09d}', f'{self.MOCK_PREFIX}/', sequence,
+                    self._random_date(rng, profile), 'posted', 'entry', 'no',
+                    journal.id, company.id, currency_id, uid, now, uid, now,
+                ))
+            moves = execute_values(cr._obj, """
+                INSERT INTO account_move (
+                    name, sequence_prefix, sequence_number, date, state, move_type, auto_post,
+                    journal_id, company_id, currency_id, create_uid, create_date, write_uid, write_date
+                ) VALUES %s RETURNING id, name, date
+            """, move_rows, page_size=len(move_rows), fetch=True)
+
+            line_rows = []
+            daily_keys = set()
+            for move_id, move_name, move_date in moves:
+                amounts = [round(rng.uniform(10000, 10000000), -2) for _line in range(line_count - 1)]
+                amounts.append(-sum(amounts))
+                for amount in amounts:
+                    account_id = rng.choice(accounts)
+                    daily_keys.add((account_id, move_date))
+                    line_rows.append((
+                        move_id, move_name, move_date, 'posted', journal.id, company.id,
+                        currency_id, currency_id, account_id, 'product', move_name,
+                        max(amount, 0.0), max(-amount, 0.0), amount, amount, 0.0, 0.0, False,
+                        uid, now, uid, now,
+                    ))
+            execute_values(cr._obj, """
+                INSERT INTO account_move_line (
+                    move_id, move_name, date, parent_state, journal_id, company_id,
+                    company_currency_id, currency_id, account_id, display_type, name,
+                    debit, credit, balance, amount_currency, amount_residual, amount_residual_currency, reconciled,
+                    create_uid, create_date, write_uid, write_date
+                ) VALUES %s
+            """, line_rows, page_size=len(line_rows))
+            self._refresh_ledger(company, daily_keys)
+            inserted += len(line_rows)
+            self._commit(commit)
+            _logger.info('Inserted %s mock journal items', inserted)
+        self.env['account.move'].invalidate_model()
+        self.env['account.move.line'].invalidate_model()
+        return inserted
+
+    def _refresh_ledger(self, company, account_days):
+        """Update the daily balances and bump the ledger version of the
+        accounting reports for journal items inserted with raw SQL"""
+        if self._has_model('account.move.line.daily'):
+            self.env['account.move.line.daily'].sudo()._refresh(account_days)
+        if self._has_model('account.ledger.version'):
+            self.env['account.ledger.version'].sudo()._bump(
+                {(company.id, date) for _account_id, date in account_days})
+
+    def _get_asset_category(self):
+        Category = self.env['account.asset.category']
+        category = Category.search([
+            ('company_id', '=', self.env.company.id),
+            ('type', '=', 'purchase'),
+        ], limit=1)
+        if category:
+            return category
+        asset_account = self._get_accounts(['asset_fixed'])[:1]
+        expense_account = (self._get_accounts(['expense_depreciation']) or self._get_accounts(['expense']))[:1]
+        if not asset_account or not expense_account:
+            raise UserError('No fixed asset or depreciation expense account found')
+        return Category.create({
+            'name': f'{self.MOCK_PREFIX} Equipment',
+            'account_asset_id': asset_account.id,
+            'account_depreciation_id': asset_account.id,
+            'account_depreciation_expense_id': expense_account.id,
+            'journal_id': self._get_journal('general').id,
+            'method_number': 36,
+            'method_period': 1,
+        })
+
+    def _generate_assets(self, rng, profile, commit):
+        """Create running assets with their depreciation boards"""
+        count = profile['assets']['count']
+        if not count or not self._has_model('account.asset.asset'):
+            return 0
+        category = self._get_asset_category()
+        Asset = self.env['account.asset.asset'].with_context(tracking_disable=True, mail_create_nolog=True)
+        created = 0
+        for batch in split_every(self.BATCH_SIZE // 10, range(count), list):
+            assets = Asset.create([{
+                'name': f'{self.MOCK_PREFIX} Asset {index + 1:05d}',
+                'category_id': category.id,
+                'value': round(rng.uniform(1000000, 500000000), -3),
+                'date': self._random_date(rng, profile),
+            } for index in batch])
+            assets.validate()
+            created += len(assets)
+            self._commit(commit)
+        return created
+
+    def _generate_budgets(self, rng, profile, commit):
+        """Create confirmed budgets spread over the profile period, each with
+        lines on budgetary positions built from the expense accounts"""
+        params = profile['budgets']
+        if not params['count'] or not self._has_model('crossovered.budget'):
+            return 0
+        expense_accounts = self._get_accounts(['expense', 'expense_direct_cost'])
+        if not expense_accounts:
+            return 0
+        positions = self.env['account.budget.post'].create([
+            {'name': f'{self.MOCK_PREFIX} {account.name}', 'account_ids': [fields.Command.set(account.ids)]}
+            for account in expense_accounts[:10]
+        ])
+        Budget = self.env['crossovered.budget'].with_context(tracking_disable=True, mail_create_nolog=True)
+        budgets = Budget.create([{
+            'name': f'{self.MOCK_PREFIX} Budget {index + 1}',
+            'date_from': profile['date_from'],
+            'date_to': profile['date_to'],
+            'crossovered_budget_line': [
+                fields.Command.create({
+                    'general_budget_id': rng.choice(positions).id,
+                    'date_from': profile['date_from'],
+                    'date_to': profile['date_to'],
+                    'planned_amount': -round(rng.uniform(10000000, 1000000000), -3),
+                })
+                for _line in range(params['lines'])
+            ],
+        } for index in range(params['count'])])
+        budgets.action_budget_confirm()
+        self._commit(commit)
+        return len(budgets)
+
+    # ------------------------------------------------------------
+    # Entry point
+    # ------------------------------------------------------------
+
+    @api.model
+    def generate_dataset(self, profile='small', seed=None, commit=False):
+        """Generate a full synthetic dataset for benchmarking
+
+        :param profile: name of a built-in profile (see get_profiles), path to a
+            JSON file or dict with the same structure
+        :param seed: random seed, the same seed and profile always produce the
+            same data on the same database (a new one is picked if empty)
+        :param commit: commit after every batch, used by the command line so
+            that large profiles do not run in a single transaction
+
+        Sections whose module is not installed (payroll, overtime, assets,
+        budgets) are skipped.
+        """
+        profile = self._load_profile(profile)
+        seed = seed or random.randrange(1, 10 ** 9)
+        _logger.info('Generating dataset "%s" with seed %s', profile['name'], seed)
+
+        result = {'profile': profile['name'], 'seed': seed}
+        employees = self._generate_employees(self._get_rng(seed, 'employees'), profile, commit)
+        result['employees'] = len(employees)
+        result['contracts'] = self._generate_contracts(self._get_rng(seed, 'contracts'), profile, employees, commit)
+        # leaves first so that the attendance generator skips leave days
+        result['leaves'] = self._generate_leaves(self._get_rng(seed, 'leaves'), profile, employees, commit)
+        result['attendances'] = self._generate_attendance(seed, profile, employees, commit)
+        result['overtime'] = self._generate_overtime(self._get_rng(seed, 'overtime'), profile, employees, commit)
+
+        partners = self._generate_partners(profile, commit)
+        result['partners'] = len(partners)
+        result['invoices'], result['payments'] = self._generate_invoices(
+            self._get_rng(seed, 'invoices'), profile, partners, commit,
+        )
+        result['journal_items'] = self._insert_journal_entries(self._get_rng(seed, 'journal_entries'), profile, commit)
+        result['assets'] = self._generate_assets(self._get_rng(seed, 'assets'), profile, commit)
+        result['budgets'] = self._generate_budgets(self._get_rng(seed, 'budgets'), profile, commit)
+        _logger.info('Generated dataset: %s', result)
+        return result
@@ -4,6 +4,9 @@ import { Component, useState, onWillStart } from "@odoo/owl";
 import { registry } from "@web/core/registry";
 import { useService } from "@web/core/utils/hooks";
 
+// Employees sent per RPC, each call is committed on its own
+const EMPLOYEE_CHUNK_SIZE = 25;
+
 class AttendanceGenerator extends Component {
     static template = "util_hr_mock_data_gen.AttendanceGenerator";
 
@@ -29,6 +32,8 @@ class AttendanceGenerator extends Component {
             varianceMinutes: 30,
             randomize: true,
             deleteExisting: false,
+            seed: "",
+            progress: { done: 0, total: 0 },
             selectAll: false,
         });
 
@@ -144,38 +149,58 @@ class AttendanceGenerator extends Component {
             // Parse check-out time
             const [checkOutHour, checkOutMinute] = this.state.checkOutTime.split(':').map(Number);
 
-            const params = {
-                employee_ids: Array.from(this.state.selectedEmployees),
-                date_from: this.state.dateFrom,
-                date_to: this.state.dateTo,
-                check_in_hour: checkInHour,
-                check_in_minute: checkInMinute,
-                check_out_hour: checkOutHour,
-                check_out_minute: checkOutMinute,
-                late_percentage: this.state.latePercentage,
-                overtime_percentage: this.state.overtimePercentage,
-                variance_minutes: this.state.varianceMinutes,
-                randomize: this.state.randomize,
-                delete_existing: this.state.deleteExisting,
-            };
-
-            const result = await this.orm.call(
-                "util.attendance.generator",
-                "generate_attendance",
-                [params]
-            );
+            // Share one seed across all chunks so the dataset can be reproduced
+            const seed = parseInt(this.state.seed, 10) || Math.floor(Math.random() * 1e9) + 1;
+            this.state.seed = String(seed);
+
+            const employeeIds = Array.from(this.state.selectedEmployees);
+            this.state.progress = { done: 0, total: employeeIds.length };
+            let generated = 0;
+            let skipped = 0;
+
+            for (let i = 0; i < employeeIds.length; i += EMPLOYEE_CHUNK_SIZE) {
+                const chunk = employeeIds.slice(i, i + EMPLOYEE_CHUNK_SIZE);
+                const params = {
+                    employee_ids: chunk,
+                    date_from: this.state.dateFrom,
+                    date_to: this.state.dateTo,
+                    check_in_hour: checkInHour,
+                    check_in_minute: checkInMinute,
+                    check_out_hour: checkOutHour,
+                    check_out_minute: checkOutMinute,
+                    late_percentage: this.state.latePercentage,
+                    overtime_percentage: this.state.overtimePercentage,
+                    variance_minutes: this.state.varianceMinutes,
+                    randomize: this.state.randomize,
+                    delete_existing: this.state.deleteExisting,
+                    seed,
+                };
+
+                const result = await this.orm.call(
+                    "util.attendance.generator",
+                    "generate_attendance",
+                    [params]
+                );
+
+                if (!result.success) {
+                    this.notification.add(result.message, {
+                        type: "danger",
+                        title: "Error",
+                    });
+                    return;
+                }
+                generated += result.generated;
+                skipped += result.skipped;
+                this.state.progress.done += chunk.length;
+            }
 
-            if (result.success) {
-                this.notification.add(result.message, {
+            this.notification.add(
+                `Successfully generated ${generated} attendance records (${skipped} days skipped, seed ${seed})`,
+                {
                     type: "success",
                     title: "Success",
-                });
-            } else {
-                this.notification.add(result.message, {
-                    type: "danger",
-                    title: "Error",
-                });
-            }
+                }
+            );
         } catch (error) {
             this.notification.add("Error: " + error.message, {
                 type: "danger",
@@ -184,6 +209,11 @@ class AttendanceGenerator extends Component {
             this.state.generating = false;
         }
     }
+
+    get progressPercent() {
+        const { done, total } = this.state.progress;
+        return total ? Math.round((done / total) * 100) : 0;
+    }
 }
 
 registry.category("actions").add("util_attendance_generator", AttendanceGenerator);